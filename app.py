@@ -10,23 +10,42 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import asyncio
+import atexit
+import logging
+import os
 import threading
-import json
 from datetime import datetime, timedelta, timezone
 from collections import deque
 import time
 
 # Import local modules
 from config import (
-    SYMBOLS, SYMBOL_DISPLAY, TIMEFRAMES, DEFAULT_TIMEFRAME,
+    SYMBOLS, SYMBOL_DISPLAY, TIMEFRAMES, DEFAULT_TIMEFRAME, INFORMATION_BARS,
     ROLLING_WINDOW, MIN_WINDOW, MAX_WINDOW,
     ZSCORE_UPPER_THRESHOLD, ZSCORE_LOWER_THRESHOLD,
-    COLORS, REFRESH_RATE_MS, CHART_HEIGHT
+    COLORS, REFRESH_RATE_MS, CHART_HEIGHT,
+    COMBINED_STREAMS, MAX_STREAMS_PER_CONNECTION,
+    TICK_BATCH_SIZE, TICK_BATCH_INTERVAL,
+    INGEST_QUEUE_SIZE, INGEST_OVERFLOW_POLICY, BINANCE_WS_BASE,
+    BAR_GRACE_PERIOD, BAR_FINALIZE_INTERVAL, BAR_MAX_IDLE_ADVANCE, BAR_FILL_POLICY,
+    BAR_ALLOWED_LATENESS, BAR_REVISION_DEPTH,
+    NDJSON_CHUNK_SIZE, NDJSON_LOADER_WORKERS,
+    MAX_TICK_HISTORY, MAX_BAR_HISTORY, MEMORY_BUDGET_MB, COMPRESSED_TICK_HISTORY,
+    ENABLE_SQLITE, SQLITE_DB_PATH,
+    ENABLE_ARCHIVE, ARCHIVE_DIR, ARCHIVE_FLUSH_INTERVAL,
+    ENABLE_SNAPSHOT, SNAPSHOT_PATH, SNAPSHOT_INTERVAL
 )
-from src.ingestion.data_normalizer import Tick, normalize_tick, normalize_from_ndjson
-from src.processing.resampler import TimeSeriesResampler
-from src.processing.ohlcv import OHLCVBar
+from src.ingestion.data_normalizer import IST, Tick, normalize_tick
+from src.ingestion.ndjson_loader import iter_ndjson_chunks
+from src.processing.resampler import FillPolicy
+from src.processing.cascade import CascadingResampler
+from src.processing.information_bars import BarType, InformationBarResampler
+from src.processing.batch_resampler import BatchResampler
 from src.storage.memory_store import MemoryStore
+from src.storage.sqlite_store import SQLiteStore
+from src.storage.parquet_archive import ParquetArchive
+from src.storage.snapshot import capture_snapshot, restore_snapshot, write_snapshot
+from src.storage.locks import InstrumentedLock
 from src.analytics.statistics import calculate_statistics, PriceStatistics
 from src.analytics.hedge_ratio import calculate_hedge_ratio, HedgeRatioResult
 from src.analytics.spread import calculate_spread, calculate_spread_statistics
@@ -35,6 +54,8 @@ from src.analytics.stationarity import adf_test, ADFResult
 from src.analytics.correlation import rolling_correlation
 from src.alerts.rule_engine import AlertEngine, Alert, AlertSeverity
 
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # PAGE CONFIG
 # =============================================================================
@@ -599,34 +620,139 @@ class GlobalState:
     """Thread-safe global state for WebSocket data."""
     
     def __init__(self):
-        self.store = MemoryStore()
+        self.backend = None
+        if ENABLE_SQLITE:
+            self.backend = SQLiteStore(SQLITE_DB_PATH)
+            self.backend.start()
+        self.store = MemoryStore(
+            max_ticks=MAX_TICK_HISTORY,
+            max_bars=MAX_BAR_HISTORY,
+            backend=self.backend,
+            memory_budget=MEMORY_BUDGET_MB * 1024 * 1024 if MEMORY_BUDGET_MB else None,
+            compressed_ticks=COMPRESSED_TICK_HISTORY,
+        )
         self.alert_engine = AlertEngine()
-        self.resamplers = {}
+        self.cascade = self._new_cascade()
+        self.info_resamplers = self._new_information_resamplers()
         self.tick_count = 0
         self.last_update = None
         self.is_running = False
         self.ws_client = None
-        self._data_lock = threading.Lock()
+        self.ingest_queue = None
+        self._data_lock = InstrumentedLock()
+        
+        # Warm start: the snapshot already holds the newest bars, so the
+        # backend is only consulted when there is none
+        restored = ENABLE_SNAPSHOT and self.restore_snapshot()
+        if self.backend is not None and not restored:
+            self.store.load_bars_from_backend()
+        if ENABLE_SNAPSHOT:
+            threading.Thread(target=self._snapshot_loop, daemon=True, name="State-Snapshot").start()
+            atexit.register(self.save_snapshot)
+            
+        self.archive = None
+        if ENABLE_ARCHIVE:
+            self.archive = ParquetArchive(ARCHIVE_DIR)
+            self.archive.start(self.store, ARCHIVE_FLUSH_INTERVAL)
+            
+        threading.Thread(target=self._finalize_loop, daemon=True, name="Bar-Finalizer").start()
+        
+    def save_snapshot(self) -> None:
+        """Write a warm-start snapshot (state is copied under the lock, written outside it)."""
+        with self._data_lock:
+            arrays = capture_snapshot(
+                self.store, self.info_resamplers, self.alert_engine,
+                extra={"tick_count": self.tick_count, "last_update": self.last_update},
+                cascade=self.cascade,
+            )
+        write_snapshot(SNAPSHOT_PATH, arrays)
+        
+    def restore_snapshot(self) -> bool:
+        """Restore the last snapshot, if any. Returns True if one was loaded."""
+        try:
+            with self._data_lock:
+                extra = restore_snapshot(
+                    SNAPSHOT_PATH, self.store, self.info_resamplers, self.alert_engine, cascade=self.cascade
+                )
+                if extra is None:
+                    return False
+                self.tick_count = extra.get("tick_count", 0)
+                self.last_update = extra.get("last_update")
+                return True
+        except Exception as e:
+            logger.warning(f"Snapshot restore failed: {e}")
+            return False
+        
+    def _snapshot_loop(self) -> None:
+        while True:
+            time.sleep(SNAPSHOT_INTERVAL)
+            try:
+                self.save_snapshot()
+            except Exception as e:
+                logger.warning(f"Snapshot write failed: {e}")
         
-    def add_tick(self, tick: Tick, timeframe: str):
-        """Thread-safe tick processing."""
+    def _finalize_loop(self) -> None:
+        """
+        Close live bars at their interval boundary (plus grace) even without new trades.
+        
+        Driven by each symbol's event time rather than the wall clock, so a
+        replayed capture is not cut off at the current date.
+        """
+        while True:
+            time.sleep(BAR_FINALIZE_INTERVAL)
+            if not self.is_running:
+                continue
+            with self._data_lock:
+                self.cascade.finalize_watermark(BAR_MAX_IDLE_ADVANCE)
+        
+    def _new_cascade(self) -> CascadingResampler:
+        """Create the resampler that builds every configured timeframe from one tick stream."""
+        cascade = CascadingResampler(
+            list(TIMEFRAMES.values()),
+            grace_period=BAR_GRACE_PERIOD,
+            fill_policy=FillPolicy(BAR_FILL_POLICY),
+            allowed_lateness=BAR_ALLOWED_LATENESS,
+            revision_depth=BAR_REVISION_DEPTH,
+        )
+        # Bars completed by ticks or by the finalizer go straight to the store,
+        # and bars amended by late ticks replace their stored versions
+        cascade.on_bar(lambda bar, tf: self.store.add_bar(bar, tf))
+        cascade.on_revision(lambda bar, tf: self.store.revise_bar(bar, tf))
+        return cascade
+        
+    def _new_information_resamplers(self) -> dict:
+        """Create tick/volume/dollar bar resamplers configured in INFORMATION_BARS, by key."""
+        resamplers = {}
+        for bar_type, threshold in INFORMATION_BARS:
+            resampler = InformationBarResampler(BarType(bar_type), threshold)
+            resampler.on_bar(lambda bar, key=resampler.timeframe: self.store.add_bar(bar, key))
+            resamplers[resampler.timeframe] = resampler
+        return resamplers
+        
+    def add_tick(self, tick: Tick):
+        """Thread-safe tick processing (updates bars of every timeframe)."""
         with self._data_lock:
             self.store.add_tick(tick)
             self.tick_count += 1
             self.last_update = datetime.now(timezone.utc)
             
-            # Get or create resampler for this timeframe
-            if timeframe not in self.resamplers:
-                self.resamplers[timeframe] = TimeSeriesResampler(timeframe)
-                
-                # Set up callback to store bars
-                def on_bar(bar: OHLCVBar, tf=timeframe):
-                    self.store.add_bar(bar, tf)
-                self.resamplers[timeframe].on_bar(on_bar)
-                
-            bar = self.resamplers[timeframe].add_tick(tick)
-            if bar:
-                self.store.add_bar(bar, timeframe)
+            self.cascade.add_tick(tick)
+            for resampler in self.info_resamplers.values():
+                resampler.add_tick(tick)
+    
+    def add_ticks(self, ticks: list):
+        """Thread-safe processing of a tick batch (locks taken once per batch)."""
+        if not ticks:
+            return
+        with self._data_lock:
+            self.store.add_ticks(ticks)
+            self.tick_count += len(ticks)
+            self.last_update = datetime.now(timezone.utc)
+            
+            self.cascade.add_ticks(ticks)
+            for resampler in self.info_resamplers.values():
+                for tick in ticks:
+                    resampler.add_tick(tick)
     
     def reset_all(self):
         """Reset all data and state - clears cache and starts fresh."""
@@ -635,11 +761,16 @@ class GlobalState:
             self.store.clear()
             # Reset alert engine
             self.alert_engine.clear_all()
-            # Reset resamplers
-            self.resamplers = {}
+            # Reset partial bars
+            self.cascade.clear()
+            for resampler in self.info_resamplers.values():
+                resampler.clear()
             # Reset counters
             self.tick_count = 0
             self.last_update = None
+            # Drop the warm-start snapshot so a restart does not bring the data back
+            if ENABLE_SNAPSHOT and os.path.exists(SNAPSHOT_PATH):
+                os.remove(SNAPSHOT_PATH)
 
 @st.cache_resource
 def get_global_state():
@@ -664,24 +795,8 @@ init_session_state()
 # =============================================================================
 # DATA LOADING FUNCTIONS
 # =============================================================================
-def load_ndjson_data(filepath: str) -> list:
-    """Load tick data from NDJSON file."""
-    ticks = []
-    try:
-        with open(filepath, "r") as f:
-            for line in f:
-                if line.strip():
-                    record = json.loads(line)
-                    tick = normalize_from_ndjson(record)
-                    if tick:
-                        ticks.append(tick)
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-    return ticks
-
-
 def load_demo_data(timeframe: str):
-    """Load demo data from NDJSON file."""
+    """Load demo data from NDJSON file, streaming it chunk by chunk."""
     if st.session_state.demo_data_loaded:
         return
     
@@ -692,31 +807,34 @@ def load_demo_data(timeframe: str):
     if not os.path.exists(filepath):
         st.error(f"Demo data file not found: {filepath}")
         return
-        
-    ticks = load_ndjson_data(filepath)
-    if not ticks:
-        st.error("No ticks loaded from demo data file")
-        return
     
-    # Create resamplers for all timeframes
-    resamplers = {
-        "1S": TimeSeriesResampler("1S"),
-        "1T": TimeSeriesResampler("1T"),
-        "5T": TimeSeriesResampler("5T"),
-    }
+    # Vectorized resampling: bars are built per chunk with grouped NumPy reductions
+    resamplers = {tf: BatchResampler(tf) for tf in TIMEFRAMES.values()}
     
     store = _global_state.store
+    loaded = 0
     
-    # Process all ticks
-    for tick in ticks:
-        store.add_tick(tick)
-        _global_state.tick_count += 1
+    # Process ticks chunk by chunk so the whole capture is never in memory
+    try:
+        for chunk in iter_ndjson_chunks(filepath, chunk_size=NDJSON_CHUNK_SIZE,
+                                        workers=NDJSON_LOADER_WORKERS):
+            store.add_tick_chunk(chunk)
+            _global_state.tick_count += len(chunk)
+            loaded += len(chunk)
+            
+            for tf, resampler in resamplers.items():
+                for symbol, columns in resampler.add_chunk(chunk).items():
+                    store.add_bar_columns(symbol, tf, columns)
+            if _global_state.info_resamplers:
+                for tick in chunk.iter_ticks():
+                    for info_resampler in _global_state.info_resamplers.values():
+                        info_resampler.add_tick(tick)
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
         
-        # Add to all resamplers
-        for tf, resampler in resamplers.items():
-            bar = resampler.add_tick(tick)
-            if bar:
-                store.add_bar(bar, tf)
+    if not loaded:
+        st.error("No ticks loaded from demo data file")
+        return
     
     # Force completion of current bars by getting them
     for tf, resampler in resamplers.items():
@@ -733,23 +851,38 @@ def load_demo_data(timeframe: str):
 # =============================================================================
 # WEBSOCKET CONNECTION
 # =============================================================================
-def start_websocket(symbols: list, timeframe: str):
-    """Start WebSocket connection in background thread."""
+def start_websocket(symbols: list):
+    """Start WebSocket connection in background thread (all timeframes are built)."""
     if _global_state.is_running:
         return
         
     try:
         from src.ingestion.websocket_client import SyncWebSocketClient
+        from src.ingestion.tick_queue import IngestionQueue, OverflowPolicy
         
-        client = SyncWebSocketClient()
+        client = SyncWebSocketClient(
+            base_url=BINANCE_WS_BASE,
+            combined_streams=COMBINED_STREAMS,
+            max_streams_per_connection=MAX_STREAMS_PER_CONNECTION,
+            batch_size=TICK_BATCH_SIZE,
+            batch_interval=TICK_BATCH_INTERVAL,
+        )
         
-        # Use global state in callback (thread-safe)
-        def on_tick(tick: Tick):
-            _global_state.add_tick(tick, timeframe)
+        # Socket thread only enqueues; a worker drains into global state
+        def consume(ticks: list):
+            _global_state.add_ticks(ticks)
             
-        client.on_tick(on_tick)
+        queue = IngestionQueue(
+            consumer=consume,
+            maxsize=INGEST_QUEUE_SIZE,
+            policy=OverflowPolicy(INGEST_OVERFLOW_POLICY),
+        )
+        queue.start()
+        
+        client.on_tick_batch(queue.put_many_async)
         client.start(symbols)
         _global_state.ws_client = client
+        _global_state.ingest_queue = queue
         _global_state.is_running = True
         
     except Exception as e:
@@ -761,6 +894,9 @@ def stop_websocket():
     if _global_state.ws_client:
         _global_state.ws_client.stop()
         _global_state.ws_client = None
+    if _global_state.ingest_queue:
+        _global_state.ingest_queue.stop()
+        _global_state.ingest_queue = None
     _global_state.is_running = False
 
 # =============================================================================
@@ -781,48 +917,27 @@ def compute_analytics(symbols: list, timeframe: str, window: int,
         "filtered": filter_start is not None,  # Flag to indicate if data is filtered
     }
     
-    # Get price data for each symbol
+    # Get price data for each symbol (the store binary-searches the date filter)
     for symbol in symbols:
-        prices = store.get_prices(symbol.upper(), timeframe)
+        prices = store.get_prices(symbol.upper(), timeframe, start=filter_start, end=filter_end)
         if not prices.empty:
-            # Apply date filter if specified
-            if filter_start is not None and filter_end is not None:
-                # Ensure index is datetime-like for filtering
-                if hasattr(prices.index, 'tz_localize'):
-                    try:
-                        mask = (prices.index >= pd.Timestamp(filter_start)) & (prices.index <= pd.Timestamp(filter_end))
-                        prices = prices[mask]
-                    except:
-                        pass  # If filtering fails, use all data
-            
-            if not prices.empty:
-                results["prices"][symbol.upper()] = prices
-                results["statistics"][symbol.upper()] = calculate_statistics(prices, symbol.upper())
+            results["prices"][symbol.upper()] = prices
+            results["statistics"][symbol.upper()] = calculate_statistics(prices, symbol.upper())
     
     # Need at least 2 symbols for pair analytics
     if len(results["prices"]) >= 2:
         symbol_list = list(results["prices"].keys())
         y_symbol, x_symbol = symbol_list[0], symbol_list[1]
-        y_prices = results["prices"][y_symbol]
-        x_prices = results["prices"][x_symbol]
-        
-        # Remove duplicate indices (can happen with fast data)
-        y_prices = y_prices[~y_prices.index.duplicated(keep='last')]
-        x_prices = x_prices[~x_prices.index.duplicated(keep='last')]
         
-        # Align indices using merge instead of direct DataFrame creation
-        try:
-            df = pd.DataFrame({"y": y_prices, "x": x_prices}).dropna()
-        except ValueError:
-            # Fallback: use inner join on common indices
-            common_idx = y_prices.index.intersection(x_prices.index)
-            if len(common_idx) > 0:
-                df = pd.DataFrame({
-                    "y": y_prices.loc[common_idx].values,
-                    "x": x_prices.loc[common_idx].values
-                }, index=common_idx)
-            else:
-                df = pd.DataFrame()
+        # Rows where both symbols have a bar, from the store's pre-aligned panel
+        df = store.get_multi_symbol_prices(
+            [y_symbol, x_symbol], timeframe, start=filter_start, end=filter_end, dropna=True
+        )
+        if df.shape[1] == 2:
+            df.columns = ["y", "x"]
+        else:
+            df = pd.DataFrame(columns=["y", "x"])
+        results["pair_prices"] = df
         
         if len(df) >= window:
             y = df["y"]
@@ -1202,16 +1317,14 @@ def create_rolling_hedge_ratio_chart(y_prices: pd.Series, x_prices: pd.Series,
     if y_prices is None or x_prices is None:
         return go.Figure()
     
-    # Align prices
-    y_clean = y_prices[~y_prices.index.duplicated(keep='last')]
-    x_clean = x_prices[~x_prices.index.duplicated(keep='last')]
-    common_idx = y_clean.index.intersection(x_clean.index)
+    # Inputs come pre-aligned from the store's price panel
+    common_idx = y_prices.index
     
     if len(common_idx) < window:
         return go.Figure()
     
-    y = y_clean.loc[common_idx]
-    x = x_clean.loc[common_idx]
+    y = y_prices
+    x = x_prices
     
     # Calculate rolling beta using rolling regression
     rolling_beta = []
@@ -1588,8 +1701,12 @@ with st.sidebar:
         horizontal=True
     )
     
-    # Calculate date range based on selection (use UTC to match bar timestamps)
-    now = datetime.now(timezone.utc)
+    # Calculate date range based on selection (naive IST to match bar timestamps).
+    # Demo captures are historical, so anchor relative filters to the data.
+    if st.session_state.demo_mode and _global_state.store.last_update is not None:
+        now = _global_state.store.last_update
+    else:
+        now = datetime.now(IST).replace(tzinfo=None)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     
     if date_filter_mode == "All Time":
@@ -1651,7 +1768,7 @@ with st.sidebar:
     with col1:
         start_disabled = _global_state.is_running
         if st.button("▶️ Start", use_container_width=True, disabled=start_disabled, key="start_btn"):
-            start_websocket(selected_symbols_lower, selected_timeframe)
+            start_websocket(selected_symbols_lower)
             st.rerun()
     with col2:
         stop_disabled = not _global_state.is_running
@@ -1678,7 +1795,7 @@ with st.sidebar:
                 # Fallback: manually clear components
                 _global_state.store.clear()
                 _global_state.alert_engine.clear_history()
-                _global_state.resamplers = {}
+                _global_state.cascade.clear()
                 _global_state.tick_count = 0
                 _global_state.last_update = None
         except Exception:
@@ -2148,10 +2265,10 @@ with adv_col3:
     </div>
     """, unsafe_allow_html=True)
     
-    if len(analytics.get("prices", {})) >= 2:
-        symbol_list = list(analytics["prices"].keys())
-        y_prices = analytics["prices"][symbol_list[0]]
-        x_prices = analytics["prices"][symbol_list[1]]
+    pair_prices = analytics.get("pair_prices")
+    if pair_prices is not None and not pair_prices.empty:
+        y_prices = pair_prices["y"]
+        x_prices = pair_prices["x"]
         
         hedge_chart = create_rolling_hedge_ratio_chart(y_prices, x_prices, min(rolling_window, 30), 250)
         if hedge_chart.data:
@@ -0,0 +1,63 @@
+"""
+Trade message decoding throughput: legacy normalize_tick vs fast path.
+
+Run with: python benchmarks/bench_decoder.py [n_messages]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ingestion.data_normalizer import decode_trade, normalize_tick, orjson
+
+
+def make_messages(n: int) -> list:
+    """Build raw combined-stream trade frames as bytes."""
+    messages = []
+    for i in range(n):
+        payload = {
+            "e": "trade",
+            "E": 1765791246419 + i,
+            "T": 1765791246419 + i,
+            "s": "BTCUSDT",
+            "t": 6500000000 + i,
+            "p": f"{89795.4 + (i % 50) * 0.1:.1f}",
+            "q": "0.003",
+            "X": "MARKET",
+            "m": bool(i % 2),
+        }
+        frame = {"stream": "btcusdt@trade", "data": payload}
+        messages.append(json.dumps(frame).encode())
+    return messages
+
+
+def legacy_decode(message: bytes):
+    data = json.loads(message)
+    return normalize_tick(data["data"])
+
+
+def run(label: str, decode, messages: list) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        decode(message)
+    elapsed = time.perf_counter() - start
+    rate = len(messages) / elapsed
+    print(f"{label:<32} {rate:>12,.0f} msg/s")
+    return rate
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    messages = make_messages(n)
+    backend = "orjson" if orjson is not None else "json (install orjson for more)"
+    print(f"{n:,} messages, JSON backend: {backend}")
+
+    before = run("normalize_tick (datetime)", legacy_decode, messages)
+    after = run("decode_trade (epoch ms)", decode_trade, messages)
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
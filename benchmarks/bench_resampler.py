@@ -0,0 +1,109 @@
+"""
+Per-tick resampling throughput: datetime bucketing vs integer-epoch path.
+
+Run with: python benchmarks/bench_resampler.py [n_ticks] [n_symbols]
+"""
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ingestion.data_normalizer import Tick
+from src.processing.cascade import CascadingResampler
+from src.processing.resampler import TimeSeriesResampler
+
+
+@dataclass
+class LegacyBarBuilder:
+    """Dict-backed builder as used before the integer-epoch rework."""
+    symbol: str
+    bar_start: Optional[datetime] = None
+    open: float = 0.0
+    high: float = 0.0
+    low: float = float("inf")
+    close: float = 0.0
+    volume: float = 0.0
+    vwap_numerator: float = 0.0
+    trade_count: int = 0
+
+    def add_tick(self, tick: Tick) -> None:
+        if self.bar_start is None:
+            self.bar_start = tick.timestamp
+            self.open = tick.price
+            self.high = tick.price
+            self.low = tick.price
+        self.high = max(self.high, tick.price)
+        self.low = min(self.low, tick.price)
+        self.close = tick.price
+        self.volume += tick.quantity
+        self.vwap_numerator += tick.price * tick.quantity
+        self.trade_count += 1
+
+
+class LegacyResampler:
+    """Per-tick datetime flooring, as used before the integer-epoch rework."""
+
+    def __init__(self, timeframe: str):
+        self._interval_seconds = TimeSeriesResampler.TIMEFRAME_SECONDS[timeframe]
+        self._builders: Dict[str, LegacyBarBuilder] = {}
+        self._current_bar_time: Dict[str, datetime] = {}
+
+    def _get_bar_timestamp(self, tick_time: datetime) -> datetime:
+        epoch = datetime(1970, 1, 1)
+        total_seconds = (tick_time - epoch).total_seconds()
+        bar_seconds = (total_seconds // self._interval_seconds) * self._interval_seconds
+        return epoch + timedelta(seconds=bar_seconds)
+
+    def add_tick(self, tick: Tick) -> None:
+        symbol = tick.symbol
+        bar_time = self._get_bar_timestamp(tick.timestamp)
+        if symbol not in self._builders:
+            self._builders[symbol] = LegacyBarBuilder(symbol=symbol)
+            self._current_bar_time[symbol] = bar_time
+        if bar_time > self._current_bar_time[symbol]:
+            self._builders[symbol] = LegacyBarBuilder(symbol=symbol)
+            self._current_bar_time[symbol] = bar_time
+        self._builders[symbol].add_tick(tick)
+
+
+def make_ticks(n: int, n_symbols: int) -> list:
+    """Ticks as produced by the live decoder (epoch ms set, datetime lazy)."""
+    symbols = [f"SYM{i}USDT" for i in range(n_symbols)]
+    start = 1765791246419
+    return [
+        Tick(symbols[i % n_symbols], None, 89795.4 + (i % 50) * 0.1, 0.003, ts_ms=start + i * 7)
+        for i in range(n)
+    ]
+
+
+def run(label: str, add_tick, n: int, n_symbols: int) -> float:
+    # Fresh ticks per run so no run benefits from cached lazy timestamps
+    ticks = make_ticks(n, n_symbols)
+    start = time.perf_counter()
+    for tick in ticks:
+        add_tick(tick)
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed
+    print(f"{label:<36} {rate:>12,.0f} ticks/s {rate / n_symbols:>12,.0f} ticks/s/symbol")
+    return rate
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    n_symbols = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print(f"{n:,} ticks across {n_symbols} symbols")
+
+    before = run("legacy datetime bucketing (1T)", LegacyResampler("1T").add_tick, n, n_symbols)
+    after = run("TimeSeriesResampler (1T)", TimeSeriesResampler("1T").add_tick, n, n_symbols)
+    run("TimeSeriesResampler (1T, 2s lateness)",
+        TimeSeriesResampler("1T", allowed_lateness=2.0, revision_depth=3).add_tick, n, n_symbols)
+    run("CascadingResampler (1S..1H)", CascadingResampler().add_tick, n, n_symbols)
+    print(f"speedup (1T): {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
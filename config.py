@@ -1,7 +1,7 @@
 """
 Configuration constants for GemsCap Quantitative Analytics System
 """
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 # =============================================================================
 # SYMBOLS & DATA
@@ -23,6 +23,11 @@ TIMEFRAMES: Dict[str, str] = {
 
 DEFAULT_TIMEFRAME: str = "1m"
 
+# Information-driven bars built alongside the time bars, as (type, threshold)
+# with type "tick" (trades), "volume" (quantity) or "dollar" (notional).
+# Stored under keys like "tick_500" or "dollar_1000000".
+INFORMATION_BARS: List[Tuple[str, float]] = []
+
 # =============================================================================
 # ANALYTICS
 # =============================================================================
@@ -40,20 +45,50 @@ ADF_SIGNIFICANCE: float = 0.05
 # =============================================================================
 # STORAGE
 # =============================================================================
-MAX_TICK_HISTORY: int = 100000  # Maximum ticks to retain per symbol
+MAX_TICK_HISTORY: int = 1000000  # Maximum ticks to retain per symbol (~29 bytes each)
 MAX_BAR_HISTORY: int = 10000    # Maximum bars to retain per symbol/timeframe
+MEMORY_BUDGET_MB: int = 1024    # Global tick, compressed tick, bar and panel memory budget (0 = per-series limits only)
+COMPRESSED_TICK_HISTORY: int = 10000000  # Older ticks per symbol kept delta-compressed (~5 bytes each, 0 = off)
+
+# NDJSON capture loading
+NDJSON_CHUNK_SIZE: int = 100000  # Ticks per columnar chunk
+NDJSON_LOADER_WORKERS: int = 4   # Processes for large files (1 = sequential)
 
 # SQLite (optional)
 SQLITE_DB_PATH: str = "gemscap_data.db"
 ENABLE_SQLITE: bool = False
 
+# Parquet archive (optional, requires pyarrow)
+ARCHIVE_DIR: str = "archive"
+ENABLE_ARCHIVE: bool = False
+ARCHIVE_FLUSH_INTERVAL: float = 60.0  # Seconds between archive flushes
+
+# Warm-start snapshot of store, partial bars and alert cooldowns
+SNAPSHOT_PATH: str = "gemscap_state.npz"
+ENABLE_SNAPSHOT: bool = False
+SNAPSHOT_INTERVAL: float = 30.0  # Seconds between snapshot writes (also written at exit)
+
 # =============================================================================
 # WEBSOCKET
 # =============================================================================
-BINANCE_WS_BASE: str = "wss://fstream.binance.com/ws"
+BINANCE_WS_BASE: str = "wss://fstream.binance.com"  # Use "ws://localhost:8765" for the replay server
 RECONNECT_DELAY: float = 1.0  # Initial delay in seconds
 MAX_RECONNECT_DELAY: float = 30.0  # Maximum delay
 RECONNECT_MULTIPLIER: float = 2.0  # Exponential backoff multiplier
+COMBINED_STREAMS: bool = True  # Multiplex symbols over /stream?streams=... connections
+MAX_STREAMS_PER_CONNECTION: int = 200  # Binance Futures combined-stream limit
+TICK_BATCH_SIZE: int = 500  # Max ticks delivered per batch callback
+TICK_BATCH_INTERVAL: float = 0.1  # Max seconds a tick waits in the batch buffer
+INGEST_QUEUE_SIZE: int = 50000  # Ticks buffered between socket and GlobalState
+INGEST_OVERFLOW_POLICY: str = "drop_oldest"  # "drop_oldest", "coalesce" or "block" (socket reads wait)
+
+# Live bar finalization
+BAR_GRACE_PERIOD: float = 1.0  # Seconds after an interval ends before its bar is closed
+BAR_FINALIZE_INTERVAL: float = 0.25  # Seconds between finalizer passes
+BAR_MAX_IDLE_ADVANCE: float = 300.0  # Max seconds a quiet symbol's bars keep closing past its last tick
+BAR_FILL_POLICY: str = "skip"  # Empty intervals: "skip", "forward" (previous close) or "nan"
+BAR_ALLOWED_LATENESS: float = 1.0  # Seconds of tick time finest bars wait for out-of-order ticks
+BAR_REVISION_DEPTH: int = 5  # Emitted bars per symbol/timeframe that later late ticks may still amend
 
 # =============================================================================
 # UI
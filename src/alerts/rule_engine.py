@@ -306,6 +306,16 @@ class AlertEngine:
             return alerts[:n]
         return alerts
         
+    def get_cooldowns(self) -> Dict[str, datetime]:
+        """Get the last trigger time per cooldown key."""
+        with self._lock:
+            return dict(self._last_triggered)
+            
+    def restore_cooldowns(self, cooldowns: Dict[str, datetime]) -> None:
+        """Restore cooldown state (e.g. from a warm-start snapshot)."""
+        with self._lock:
+            self._last_triggered.update(cooldowns)
+            
     def clear_history(self) -> None:
         """Clear alert history."""
         with self._lock:
@@ -1,5 +1,17 @@
 # Ingestion layer package
 from .websocket_client import BinanceWebSocketClient
-from .data_normalizer import Tick, normalize_tick
+from .data_normalizer import Tick, normalize_tick, normalize_tick_fast, decode_trade
+from .tick_queue import IngestionQueue, OverflowPolicy
+from .ndjson_loader import TickChunk, iter_ndjson_chunks
 
-__all__ = ["BinanceWebSocketClient", "Tick", "normalize_tick"]
+__all__ = [
+    "BinanceWebSocketClient",
+    "Tick",
+    "normalize_tick",
+    "normalize_tick_fast",
+    "decode_trade",
+    "IngestionQueue",
+    "OverflowPolicy",
+    "TickChunk",
+    "iter_ndjson_chunks",
+]
@@ -1,23 +1,100 @@
 """
 Data normalizer for Binance WebSocket tick data
 """
+import json
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
 
 # IST timezone (UTC+5:30)
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# Naive IST datetime of the Unix epoch, for integer <-> datetime conversion
+_IST_EPOCH = datetime(1970, 1, 1) + IST.utcoffset(None)
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def json_loads(message: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when installed, falling back to the stdlib."""
+    return _loads(message)
+
+
+def epoch_ms_to_ist(ts_ms: int) -> datetime:
+    """Convert UTC epoch milliseconds to a naive IST datetime."""
+    return _IST_EPOCH + timedelta(milliseconds=ts_ms)
+
+
+def ist_to_epoch_ms(timestamp: datetime) -> int:
+    """Convert a naive IST datetime to UTC epoch milliseconds."""
+    return (timestamp - _IST_EPOCH) // _ONE_MS
 
-@dataclass
+
+@dataclass(init=False)
 class Tick:
-    """Normalized tick data structure"""
+    """
+    Normalized tick data structure.
+    
+    The trade time can be supplied either as a naive IST ``timestamp`` or
+    as integer UTC epoch milliseconds ``ts_ms``; the other representation
+    is derived lazily on first access, so the fast decoding path never
+    builds a datetime unless something displays it. Both are properties
+    over private attributes, so ``__init__`` is written out rather than
+    generated.
+    """
     symbol: str
-    timestamp: datetime
+    timestamp: Optional[datetime]
     price: float
     quantity: float
     trade_id: Optional[int] = None
     is_buyer_maker: Optional[bool] = None
+    ts_ms: Optional[int] = None
+    
+    def __init__(
+        self,
+        symbol: str,
+        timestamp: Optional[datetime],
+        price: float,
+        quantity: float,
+        trade_id: Optional[int] = None,
+        is_buyer_maker: Optional[bool] = None,
+        ts_ms: Optional[int] = None,
+    ):
+        self.symbol = symbol
+        self._timestamp = timestamp
+        self.price = price
+        self.quantity = quantity
+        self.trade_id = trade_id
+        self.is_buyer_maker = is_buyer_maker
+        self._ts_ms = ts_ms
+    
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        """Trade time as a naive IST datetime."""
+        if self._timestamp is None and self._ts_ms is not None:
+            self._timestamp = epoch_ms_to_ist(self._ts_ms)
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: Optional[datetime]) -> None:
+        self._timestamp = value
+        
+    @property
+    def ts_ms(self) -> Optional[int]:
+        """Trade time as UTC epoch milliseconds."""
+        if self._ts_ms is None and self._timestamp is not None:
+            self._ts_ms = ist_to_epoch_ms(self._timestamp)
+        return self._ts_ms
+    
+    @ts_ms.setter
+    def ts_ms(self, value: Optional[int]) -> None:
+        self._ts_ms = value
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert tick to dictionary for DataFrame creation"""
@@ -84,6 +161,7 @@ def normalize_tick(raw_message: Dict[str, Any]) -> Optional[Tick]:
             quantity=quantity,
             trade_id=trade_id,
             is_buyer_maker=is_buyer_maker,
+            ts_ms=int(trade_time_ms),
         )
         
     except (KeyError, ValueError, TypeError) as e:
@@ -91,6 +169,66 @@ def normalize_tick(raw_message: Dict[str, Any]) -> Optional[Tick]:
         return None
 
 
+def normalize_tick_fast(raw_message: Dict[str, Any]) -> Optional[Tick]:
+    """
+    Normalize a Binance trade message without building a datetime.
+    
+    Produces the same Tick as normalize_tick, but keeps the trade time as
+    integer UTC epoch milliseconds (``ts_ms``); ``Tick.timestamp`` is only
+    materialized if something reads it.
+    
+    Args:
+        raw_message: Parsed trade message (see normalize_tick)
+        
+    Returns:
+        Normalized Tick object or None if invalid message
+    """
+    try:
+        if raw_message.get("e") != "trade":
+            return None
+        
+        trade_time_ms = raw_message.get("T") or raw_message.get("E")
+        if trade_time_ms is None:
+            return None
+            
+        symbol = raw_message.get("s", "").upper()
+        price = float(raw_message.get("p", 0))
+        if not symbol or price <= 0:
+            return None
+            
+        return Tick(
+            symbol,
+            None,
+            price,
+            float(raw_message.get("q", 0)),
+            raw_message.get("t"),
+            raw_message.get("m"),
+            int(trade_time_ms),
+        )
+        
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def decode_trade(message: Union[str, bytes]) -> Optional[Tick]:
+    """
+    Decode a raw trade frame (plain or combined-stream) straight to a Tick.
+    
+    Args:
+        message: Raw WebSocket frame as text or bytes
+        
+    Returns:
+        Normalized Tick object or None if invalid message
+    """
+    try:
+        data = _loads(message)
+    except ValueError:
+        return None
+    if "data" in data:
+        data = data["data"]
+    return normalize_tick_fast(data)
+
+
 def normalize_from_ndjson(record: Dict[str, Any]) -> Optional[Tick]:
     """
     Normalize tick from NDJSON format (as saved by the browser collector).
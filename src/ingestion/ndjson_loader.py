@@ -0,0 +1,175 @@
+"""
+Streaming, chunked and parallel loader for NDJSON tick captures
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .data_normalizer import Tick, json_loads
+
+
+@dataclass
+class TickChunk:
+    """
+    Columnar block of ticks parsed from an NDJSON capture.
+
+    ``symbol_codes`` index into ``symbols``; codes are local to the chunk.
+    """
+    ts_ms: np.ndarray         # int64 UTC epoch milliseconds
+    price: np.ndarray         # float64
+    quantity: np.ndarray      # float64
+    symbol_codes: np.ndarray  # int32
+    symbols: List[str]
+
+    def __len__(self) -> int:
+        return len(self.ts_ms)
+
+    def iter_ticks(self) -> Iterator[Tick]:
+        """Yield Tick objects (timestamps stay lazy) for the streaming path."""
+        symbols = self.symbols
+        for code, ts_ms, price, quantity in zip(
+            self.symbol_codes.tolist(),
+            self.ts_ms.tolist(),
+            self.price.tolist(),
+            self.quantity.tolist(),
+        ):
+            yield Tick(symbols[code], None, price, quantity, ts_ms=ts_ms)
+
+    def to_ticks(self) -> List[Tick]:
+        """Materialize the chunk as a list of Tick objects."""
+        return list(self.iter_ticks())
+
+
+class _ChunkBuilder:
+    """Accumulates parsed records into column lists."""
+
+    def __init__(self):
+        self.ts_ms: List[int] = []
+        self.price: List[float] = []
+        self.quantity: List[float] = []
+        self.codes: List[int] = []
+        self.symbol_index: Dict[str, int] = {}
+
+    def add_line(self, line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            record = json_loads(line)
+            ts = record["ts"]
+            symbol = record["symbol"].upper()
+            price = float(record["price"])
+            quantity = float(record.get("size", record.get("quantity", 0)))
+            if ts.endswith("Z"):
+                ts = ts[:-1]
+            else:
+                # Non-UTC offsets: normalize to a naive UTC ISO string
+                parsed = datetime.fromisoformat(ts)
+                if parsed.tzinfo is not None:
+                    ts = parsed.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+            ts_ms = int(np.datetime64(ts, "ms").astype(np.int64))
+        except (KeyError, ValueError, TypeError, AttributeError):
+            return
+
+        code = self.symbol_index.get(symbol)
+        if code is None:
+            code = self.symbol_index[symbol] = len(self.symbol_index)
+
+        self.ts_ms.append(ts_ms)
+        self.price.append(price)
+        self.quantity.append(quantity)
+        self.codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.ts_ms)
+
+    def build(self) -> TickChunk:
+        return TickChunk(
+            ts_ms=np.array(self.ts_ms, dtype=np.int64),
+            price=np.array(self.price, dtype=np.float64),
+            quantity=np.array(self.quantity, dtype=np.float64),
+            symbol_codes=np.array(self.codes, dtype=np.int32),
+            symbols=list(self.symbol_index),
+        )
+
+
+def _parse_range(args: Tuple[str, int, int]) -> TickChunk:
+    """Parse the lines that start within [start, end) of a file (pool worker)."""
+    filepath, start, end = args
+    builder = _ChunkBuilder()
+    with open(filepath, "rb") as f:
+        if start > 0:
+            # Skip the line straddling `start`; the previous range owns it
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            builder.add_line(line)
+    return builder.build()
+
+
+def _iter_sequential(filepath: str, chunk_size: int) -> Iterator[TickChunk]:
+    builder = _ChunkBuilder()
+    with open(filepath, "rb") as f:
+        for line in f:
+            builder.add_line(line)
+            if len(builder) >= chunk_size:
+                yield builder.build()
+                builder = _ChunkBuilder()
+    if len(builder):
+        yield builder.build()
+
+
+def _iter_parallel(filepath: str, workers: int, chunk_bytes: int) -> Iterator[TickChunk]:
+    size = os.path.getsize(filepath)
+    ranges = [(filepath, start, min(start + chunk_bytes, size))
+              for start in range(0, size, chunk_bytes)]
+
+    # Keep a bounded window of ranges in flight so memory stays flat
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < workers * 2:
+                pending.append(pool.submit(_parse_range, ranges[next_range]))
+                next_range += 1
+            chunk = pending.popleft().result()
+            if len(chunk):
+                yield chunk
+
+
+def iter_ndjson_chunks(
+    filepath: str,
+    chunk_size: int = 100_000,
+    workers: Optional[int] = 1,
+    chunk_bytes: int = 32 * 1024 * 1024,
+) -> Iterator[TickChunk]:
+    """
+    Stream an NDJSON capture as columnar TickChunks in file order.
+
+    Format (as saved by the browser collector):
+    {"symbol":"BTCUSDT","ts":"2025-12-15T09:34:06.419Z","price":89795.4,"size":0.003}
+
+    Args:
+        filepath: Path to the NDJSON file
+        chunk_size: Ticks per chunk when reading sequentially
+        workers: Processes for parallel parsing; None uses all CPUs and
+            1 reads sequentially in this process
+        chunk_bytes: Byte span parsed per task in parallel mode (each
+            span yields one chunk)
+
+    Yields:
+        TickChunk objects; invalid lines are skipped
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and os.path.getsize(filepath) > chunk_bytes:
+        yield from _iter_parallel(filepath, workers, chunk_bytes)
+    else:
+        yield from _iter_sequential(filepath, chunk_size)
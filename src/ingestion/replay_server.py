@@ -0,0 +1,213 @@
+"""
+Local fake Binance WebSocket server replaying NDJSON tick captures
+
+Serves the same endpoints the client uses (``/ws/<symbol>@trade`` and
+``/stream?streams=a@trade/b@trade``) so ingestion throughput and
+reconnect behavior can be measured offline.
+
+Run with:
+    python -m src.ingestion.replay_server ticks.ndjson --speed 10 --port 8765
+
+and point the client at it:
+    BinanceWebSocketClient(base_url="ws://localhost:8765")
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import websockets
+    from websockets.exceptions import ConnectionClosed
+except ImportError:
+    websockets = None
+
+from .data_normalizer import normalize_from_ndjson
+
+logger = logging.getLogger(__name__)
+
+
+def parse_subscription(path: str) -> Tuple[Set[str], bool]:
+    """
+    Parse requested symbols from a Binance-style stream path.
+
+    Args:
+        path: Request path, e.g. "/ws/btcusdt@trade" or
+            "/stream?streams=btcusdt@trade/ethusdt@trade"
+
+    Returns:
+        (upper-case symbols, whether frames use the combined-stream wrapper)
+    """
+    parts = urlsplit(path)
+    if parts.path.rstrip("/").endswith("/stream"):
+        streams = parse_qs(parts.query).get("streams", [""])[0]
+        names = [s for s in streams.split("/") if s]
+        combined = True
+    else:
+        names = [parts.path.rsplit("/", 1)[-1]]
+        combined = False
+    symbols = {name.split("@", 1)[0].upper() for name in names if name}
+    return symbols, combined
+
+
+class ReplayServer:
+    """
+    WebSocket server that replays an NDJSON capture as Binance trade frames.
+
+    Every connection gets its own replay from the start of the file,
+    filtered to the symbols in its subscription.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        host: str = "localhost",
+        port: int = 8765,
+        speed: Optional[float] = 1.0,
+        loop: bool = False,
+    ):
+        """
+        Initialize replay server.
+
+        Args:
+            filepath: NDJSON capture (format read by normalize_from_ndjson)
+            host: Interface to bind
+            port: Port to bind
+            speed: Pacing multiplier; 1.0 is real time, 10.0 is ten times
+                faster, None or 0 replays as fast as possible
+            loop: Restart the capture when it ends instead of closing
+        """
+        self._filepath = filepath
+        self._host = host
+        self._port = port
+        self._speed = speed if speed and speed > 0 else None
+        self._loop = loop
+        self._server = None
+
+        # Stats
+        self._frames_sent = 0
+        self._connections = 0
+
+    async def start(self) -> None:
+        """Start listening."""
+        if websockets is None:
+            raise ImportError("websockets package is required. Install with: pip install websockets")
+        self._server = await websockets.serve(self._handle, self._host, self._port)
+        logger.info(f"Replaying {self._filepath} on ws://{self._host}:{self._port}")
+
+    async def stop(self) -> None:
+        """Stop listening and close open connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Start the server and block until cancelled."""
+        await self.start()
+        try:
+            await asyncio.Future()
+        finally:
+            await self.stop()
+
+    async def _handle(self, ws, path: Optional[str] = None) -> None:
+        """Serve one client connection."""
+        if path is None:
+            path = getattr(ws, "path", None) or ws.request.path
+        symbols, combined = parse_subscription(path)
+        self._connections += 1
+        logger.info(f"Client subscribed to {sorted(symbols)} ({'combined' if combined else 'raw'})")
+
+        try:
+            while True:
+                await self._replay(ws, symbols, combined)
+                if not self._loop:
+                    break
+        except ConnectionClosed:
+            pass
+        finally:
+            self._connections -= 1
+
+    async def _replay(self, ws, symbols: Set[str], combined: bool) -> None:
+        """Send one pass over the capture file."""
+        first_ms: Optional[int] = None
+        start = time.monotonic()
+        trade_id = 0
+
+        with open(self._filepath, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    tick = normalize_from_ndjson(json.loads(line))
+                except ValueError:
+                    continue
+                if tick is None or tick.symbol not in symbols:
+                    continue
+
+                ts_ms = tick.ts_ms
+                if self._speed is not None:
+                    if first_ms is None:
+                        first_ms = ts_ms
+                    due = start + (ts_ms - first_ms) / 1000.0 / self._speed
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif trade_id % 1000 == 0:
+                    # Yield so other connections progress in unpaced mode
+                    await asyncio.sleep(0)
+
+                trade_id += 1
+                payload: Dict[str, Any] = {
+                    "e": "trade",
+                    "E": ts_ms,
+                    "T": ts_ms,
+                    "s": tick.symbol,
+                    "t": trade_id,
+                    "p": repr(tick.price),
+                    "q": repr(tick.quantity),
+                }
+                if combined:
+                    payload = {"stream": f"{tick.symbol.lower()}@trade", "data": payload}
+                await ws.send(json.dumps(payload))
+                self._frames_sent += 1
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to BinanceWebSocketClient."""
+        return f"ws://{self._host}:{self._port}"
+
+    @property
+    def frames_sent(self) -> int:
+        """Get total trade frames sent across connections."""
+        return self._frames_sent
+
+    @property
+    def connection_count(self) -> int:
+        """Get number of open client connections."""
+        return self._connections
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay an NDJSON capture as a fake Binance trade stream")
+    parser.add_argument("filepath", help="NDJSON capture file")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Pacing multiplier; 0 replays as fast as possible")
+    parser.add_argument("--loop", action="store_true", help="Restart the capture when it ends")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = ReplayServer(args.filepath, args.host, args.port, args.speed, args.loop)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
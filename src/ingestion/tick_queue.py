@@ -0,0 +1,211 @@
+"""
+Bounded ingestion queue decoupling WebSocket reads from tick consumers
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Any, List, Optional, Tuple
+
+from .data_normalizer import Tick
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"              # Producer waits until the worker frees space
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued tick
+    COALESCE = "coalesce"        # Keep only the latest queued tick per symbol
+
+
+class IngestionQueue:
+    """
+    Bounded tick queue drained by a dedicated worker thread.
+
+    The WebSocket event loop only enqueues; the worker hands batches of
+    ticks to the consumer (e.g. GlobalState.add_ticks), so slow storage or
+    resampling never stalls socket reads. Event-loop producers should use
+    ``put_many_async``: under the block policy it waits for space without
+    blocking the loop thread.
+
+    Usage:
+        queue = IngestionQueue(consumer=state.add_ticks, maxsize=50000)
+        queue.start()
+        client.on_tick_batch(queue.put_many_async)
+    """
+
+    def __init__(
+        self,
+        consumer: Callable[[List[Tick]], None],
+        maxsize: int = 50000,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        max_batch: int = 1000,
+    ):
+        """
+        Initialize ingestion queue.
+
+        Args:
+            consumer: Called from the worker thread with a list of ticks
+            maxsize: Maximum ticks held in the queue
+            policy: What to do when the queue is full
+            max_batch: Maximum ticks handed to the consumer per call
+        """
+        self._consumer = consumer
+        self._maxsize = max(1, maxsize)
+        self._policy = OverflowPolicy(policy)
+        self._max_batch = max(1, max_batch)
+
+        # (enqueue monotonic time, tick)
+        self._queue: Deque[Tuple[float, Tick]] = deque()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters
+        self._enqueued = 0
+        self._dequeued = 0
+        self._dropped = 0
+        self._high_watermark = 0
+        self._batches = 0
+        self._last_drain_latency = 0.0
+        self._max_drain_latency = 0.0
+        self._total_drain_latency = 0.0
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="Ingestion-Worker"
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the worker after draining what is already queued."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def put(self, tick: Tick) -> None:
+        """Enqueue a single tick."""
+        self.put_many([tick])
+
+    def put_many(self, ticks: List[Tick]) -> None:
+        """Enqueue ticks, applying the overflow policy when full."""
+        if not ticks:
+            return
+        now = time.monotonic()
+        with self._cond:
+            for tick in ticks:
+                if len(self._queue) >= self._maxsize:
+                    self._make_room()
+                self._queue.append((now, tick))
+                self._enqueued += 1
+            if len(self._queue) > self._high_watermark:
+                self._high_watermark = len(self._queue)
+            self._cond.notify()
+
+    async def put_many_async(self, ticks: List[Tick], poll: float = 0.01) -> None:
+        """
+        Enqueue ticks from an asyncio event loop.
+        
+        Under the block policy, waits for free slots with ``asyncio.sleep``
+        (checking every `poll` seconds) instead of blocking the loop thread,
+        so other sockets and keepalive pings are still served while the
+        worker catches up. Other policies never wait.
+        """
+        if self._policy != OverflowPolicy.BLOCK:
+            self.put_many(ticks)
+            return
+        start = 0
+        while start < len(ticks):
+            room = self._maxsize - len(self._queue)
+            if room <= 0:
+                if self._running:
+                    await asyncio.sleep(poll)
+                    continue
+                room = len(ticks) - start  # Worker is gone; put_many drops instead
+            self.put_many(ticks[start:start + room])
+            start += room
+
+    def _make_room(self) -> None:
+        """Free at least one slot according to the policy (caller holds the lock)."""
+        if self._policy == OverflowPolicy.BLOCK:
+            while len(self._queue) >= self._maxsize and self._running:
+                self._cond.notify()
+                self._cond.wait(timeout=0.1)
+            if len(self._queue) < self._maxsize:
+                return
+            # Worker is gone; fall back to dropping so the producer never hangs
+
+        if self._policy == OverflowPolicy.COALESCE:
+            latest: Dict[str, Tuple[float, Tick]] = {}
+            for item in self._queue:
+                latest[item[1].symbol] = item
+            if len(latest) < len(self._queue):
+                self._dropped += len(self._queue) - len(latest)
+                self._queue = deque(sorted(latest.values(), key=lambda item: item[0]))
+                return
+
+        self._queue.popleft()
+        self._dropped += 1
+
+    def _run(self) -> None:
+        """Worker loop: drain batches and hand them to the consumer."""
+        while True:
+            with self._cond:
+                while not self._queue and self._running:
+                    self._cond.wait(timeout=0.5)
+                if not self._queue and not self._running:
+                    return
+                count = min(len(self._queue), self._max_batch)
+                items = [self._queue.popleft() for _ in range(count)]
+                self._cond.notify_all()
+
+            try:
+                self._consumer([tick for _, tick in items])
+            except Exception as e:
+                logger.error(f"Ingestion consumer error: {e}")
+
+            latency = time.monotonic() - items[0][0]
+            with self._cond:
+                self._dequeued += count
+                self._batches += 1
+                self._last_drain_latency = latency
+                self._total_drain_latency += latency
+                self._max_drain_latency = max(self._max_drain_latency, latency)
+
+    @property
+    def depth(self) -> int:
+        """Get number of ticks currently queued."""
+        return len(self._queue)
+
+    @property
+    def dropped(self) -> int:
+        """Get number of ticks discarded by the overflow policy."""
+        return self._dropped
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Get queue counters (latencies in milliseconds)."""
+        with self._cond:
+            avg = self._total_drain_latency / self._batches if self._batches else 0.0
+            return {
+                "policy": self._policy.value,
+                "depth": len(self._queue),
+                "maxsize": self._maxsize,
+                "high_watermark": self._high_watermark,
+                "enqueued": self._enqueued,
+                "dequeued": self._dequeued,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "last_drain_latency_ms": self._last_drain_latency * 1000,
+                "avg_drain_latency_ms": avg * 1000,
+                "max_drain_latency_ms": self._max_drain_latency * 1000,
+            }
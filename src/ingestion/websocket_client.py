@@ -2,9 +2,8 @@
 WebSocket client for Binance Futures real-time trade data
 """
 import asyncio
-import json
 import logging
-from typing import Callable, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 from datetime import datetime
 
 try:
@@ -13,7 +12,7 @@ try:
 except ImportError:
     websockets = None
 
-from .data_normalizer import Tick, normalize_tick
+from .data_normalizer import Tick, epoch_ms_to_ist, json_loads, normalize_tick, normalize_tick_fast
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,16 +26,28 @@ class BinanceWebSocketClient:
     Usage:
         client = BinanceWebSocketClient()
         client.on_tick(my_callback)
+        client.on_tick_batch(my_batch_callback)
         await client.connect(["btcusdt", "ethusdt"])
     """
     
-    BASE_URL = "wss://fstream.binance.com/ws"
+    DEFAULT_BASE_URL = "wss://fstream.binance.com"
+    BASE_URL = f"{DEFAULT_BASE_URL}/ws"
+    COMBINED_URL = f"{DEFAULT_BASE_URL}/stream"
+    
+    # Binance Futures accepts up to 200 streams on a single connection
+    MAX_STREAMS_PER_CONNECTION = 200
     
     def __init__(
         self,
         reconnect_delay: float = 1.0,
         max_reconnect_delay: float = 30.0,
         reconnect_multiplier: float = 2.0,
+        combined_streams: bool = True,
+        max_streams_per_connection: Optional[int] = None,
+        batch_size: int = 500,
+        batch_interval: float = 0.1,
+        fast_decode: bool = True,
+        base_url: Optional[str] = None,
     ):
         """
         Initialize WebSocket client.
@@ -45,9 +56,21 @@ class BinanceWebSocketClient:
             reconnect_delay: Initial delay before reconnection
             max_reconnect_delay: Maximum delay between reconnection attempts
             reconnect_multiplier: Multiplier for exponential backoff
+            combined_streams: Multiplex many symbols per connection using the
+                combined-stream endpoint instead of one socket per symbol
+            max_streams_per_connection: Streams per combined connection
+                (defaults to MAX_STREAMS_PER_CONNECTION)
+            batch_size: Flush batch callbacks once this many ticks are buffered
+            batch_interval: Flush batch callbacks at least this often (seconds)
+            fast_decode: Decode trades with normalize_tick_fast, keeping
+                integer epoch-ms timestamps instead of building datetimes
+            base_url: Server root, e.g. "ws://localhost:8765" for the local
+                replay server; "/ws" and "/stream" are appended
+                (defaults to DEFAULT_BASE_URL)
         """
         self._callbacks: List[Callable[[Tick], None]] = []
-        self._websockets: dict = {}
+        self._batch_callbacks: List[Callable[[List[Tick]], None]] = []
+        self._websockets: dict = {}  # connection name -> websocket
         self._running = False
         self._tasks: Set[asyncio.Task] = set()
         
@@ -56,10 +79,31 @@ class BinanceWebSocketClient:
         self._max_reconnect_delay = max_reconnect_delay
         self._reconnect_multiplier = reconnect_multiplier
         
+        # Endpoints
+        if base_url is None:
+            self._raw_url, self._combined_url = self.BASE_URL, self.COMBINED_URL
+        else:
+            base_url = base_url.rstrip("/")
+            self._raw_url, self._combined_url = f"{base_url}/ws", f"{base_url}/stream"
+        
+        # Connection layout
+        self._combined_streams = combined_streams
+        self._max_streams_per_connection = max(
+            1, max_streams_per_connection or self.MAX_STREAMS_PER_CONNECTION
+        )
+        
+        # Micro-batching
+        self._batch_size = max(1, batch_size)
+        self._batch_interval = batch_interval
+        self._batch_buffer: List[Tick] = []
+        
+        self._normalize = normalize_tick_fast if fast_decode else normalize_tick
+        
         # Stats
         self._tick_count = 0
-        self._last_tick_time: Optional[datetime] = None
+        self._last_tick_ms: Optional[int] = None
         self._connected_symbols: Set[str] = set()
+        self._stream_tick_counts: Dict[str, int] = {}
         
     def on_tick(self, callback: Callable[[Tick], None]) -> None:
         """
@@ -70,10 +114,25 @@ class BinanceWebSocketClient:
         """
         self._callbacks.append(callback)
         
-    def remove_callback(self, callback: Callable[[Tick], None]) -> None:
+    def on_tick_batch(self, callback: Callable[[List[Tick]], None]) -> None:
+        """
+        Register a callback to be called with batches of ticks.
+        
+        Ticks are buffered and delivered as a list once batch_size ticks
+        have arrived or batch_interval seconds have passed, whichever is
+        first, so per-call overhead downstream is paid once per batch.
+        
+        Args:
+            callback: Function that accepts a list of Tick objects
+        """
+        self._batch_callbacks.append(callback)
+        
+    def remove_callback(self, callback: Callable) -> None:
         """Remove a previously registered callback."""
         if callback in self._callbacks:
             self._callbacks.remove(callback)
+        if callback in self._batch_callbacks:
+            self._batch_callbacks.remove(callback)
             
     async def connect(self, symbols: List[str]) -> None:
         """
@@ -86,28 +145,56 @@ class BinanceWebSocketClient:
             raise ImportError("websockets package is required. Install with: pip install websockets")
             
         self._running = True
+        symbols_lower = [symbol.lower() for symbol in symbols]
         
-        # Create a task for each symbol
-        for symbol in symbols:
-            symbol_lower = symbol.lower()
-            task = asyncio.create_task(self._connect_symbol(symbol_lower))
-            self._tasks.add(task)
-            task.add_done_callback(self._tasks.discard)
+        if self._combined_streams:
+            # One task per group of symbols sharing a combined-stream socket
+            for index, group in enumerate(self._group_symbols(symbols_lower)):
+                self._spawn(self._connect_combined(group, index))
+        else:
+            # Create a task for each symbol
+            for symbol in symbols_lower:
+                self._spawn(self._connect_symbol(symbol))
+                
+        self._spawn(self._flush_loop())
             
         # Wait for all connections to be established
         await asyncio.sleep(0.5)
         
+    def _spawn(self, coro) -> None:
+        """Schedule a connection coroutine and track its task."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        
+    def _group_symbols(self, symbols: List[str]) -> List[List[str]]:
+        """Split symbols into groups that fit the per-connection stream limit."""
+        unique = list(dict.fromkeys(symbols))
+        size = self._max_streams_per_connection
+        return [unique[i:i + size] for i in range(0, len(unique), size)]
+        
     async def _connect_symbol(self, symbol: str) -> None:
         """Connect to WebSocket for a single symbol with reconnection logic."""
-        url = f"{self.BASE_URL}/{symbol}@trade"
+        url = f"{self._raw_url}/{symbol}@trade"
+        await self._run_connection(symbol, url, [symbol])
+        
+    async def _connect_combined(self, symbols: List[str], index: int) -> None:
+        """Connect to a combined stream carrying several symbols."""
+        streams = "/".join(f"{symbol}@trade" for symbol in symbols)
+        url = f"{self._combined_url}?streams={streams}"
+        await self._run_connection(f"combined-{index}", url, symbols)
+        
+    async def _run_connection(self, name: str, url: str, symbols: List[str]) -> None:
+        """Run a single socket with exponential-backoff reconnection."""
         delay = self._reconnect_delay
+        upper_symbols = [symbol.upper() for symbol in symbols]
         
         while self._running:
             try:
                 async with websockets.connect(url) as ws:
-                    self._websockets[symbol] = ws
-                    self._connected_symbols.add(symbol.upper())
-                    logger.info(f"Connected to {symbol.upper()}")
+                    self._websockets[name] = ws
+                    self._connected_symbols.update(upper_symbols)
+                    logger.info(f"Connected to {', '.join(upper_symbols)}")
                     delay = self._reconnect_delay  # Reset delay on successful connection
                     
                     async for message in ws:
@@ -116,31 +203,60 @@ class BinanceWebSocketClient:
                         await self._handle_message(message)
                         
             except ConnectionClosed as e:
-                logger.warning(f"Connection closed for {symbol}: {e}")
+                logger.warning(f"Connection closed for {name}: {e}")
             except WebSocketException as e:
-                logger.error(f"WebSocket error for {symbol}: {e}")
+                logger.error(f"WebSocket error for {name}: {e}")
             except Exception as e:
-                logger.error(f"Unexpected error for {symbol}: {e}")
+                logger.error(f"Unexpected error for {name}: {e}")
             finally:
-                self._connected_symbols.discard(symbol.upper())
-                if symbol in self._websockets:
-                    del self._websockets[symbol]
+                self._connected_symbols.difference_update(upper_symbols)
+                if name in self._websockets:
+                    del self._websockets[name]
                     
             # Reconnection logic with exponential backoff
             if self._running:
-                logger.info(f"Reconnecting to {symbol} in {delay:.1f}s...")
+                logger.info(f"Reconnecting to {name} in {delay:.1f}s...")
                 await asyncio.sleep(delay)
                 delay = min(delay * self._reconnect_multiplier, self._max_reconnect_delay)
                 
+    async def _flush_loop(self) -> None:
+        """Periodically deliver buffered ticks to batch callbacks."""
+        while self._running:
+            await asyncio.sleep(self._batch_interval)
+            await self._flush_batch()
+            
+    async def _flush_batch(self) -> None:
+        """Deliver buffered ticks to all batch callbacks."""
+        if not self._batch_buffer:
+            return
+        batch, self._batch_buffer = self._batch_buffer, []
+        
+        for callback in self._batch_callbacks:
+            try:
+                result = callback(batch)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Batch callback error: {e}")
+                
     async def _handle_message(self, message: str) -> None:
         """Parse message and dispatch to callbacks."""
         try:
-            data = json.loads(message)
-            tick = normalize_tick(data)
+            data = json_loads(message)
+            
+            # Combined streams wrap the event: {"stream": "btcusdt@trade", "data": {...}}
+            stream = data.get("stream")
+            if stream is not None:
+                data = data.get("data") or {}
+                self._stream_tick_counts[stream] = self._stream_tick_counts.get(stream, 0) + 1
+                if "s" not in data:
+                    data["s"] = stream.split("@", 1)[0].upper()
+                    
+            tick = self._normalize(data)
             
             if tick:
                 self._tick_count += 1
-                self._last_tick_time = tick.timestamp
+                self._last_tick_ms = tick.ts_ms
                 
                 # Call all registered callbacks
                 for callback in self._callbacks:
@@ -152,20 +268,28 @@ class BinanceWebSocketClient:
                     except Exception as e:
                         logger.error(f"Callback error: {e}")
                         
-        except json.JSONDecodeError as e:
+                if self._batch_callbacks:
+                    self._batch_buffer.append(tick)
+                    if len(self._batch_buffer) >= self._batch_size:
+                        await self._flush_batch()
+                        
+        except ValueError as e:
             logger.error(f"JSON decode error: {e}")
             
     async def disconnect(self) -> None:
         """Disconnect from all WebSocket connections."""
         self._running = False
         
+        # Deliver anything still buffered
+        await self._flush_batch()
+        
         # Close all WebSocket connections
-        for symbol, ws in list(self._websockets.items()):
+        for name, ws in list(self._websockets.items()):
             try:
                 await ws.close()
-                logger.info(f"Disconnected from {symbol.upper()}")
+                logger.info(f"Disconnected from {name}")
             except Exception as e:
-                logger.error(f"Error closing {symbol}: {e}")
+                logger.error(f"Error closing {name}: {e}")
                 
         # Cancel all tasks
         for task in self._tasks:
@@ -189,10 +313,22 @@ class BinanceWebSocketClient:
         """Get total number of ticks received."""
         return self._tick_count
     
+    @property
+    def connection_count(self) -> int:
+        """Get number of open WebSocket connections."""
+        return len(self._websockets)
+    
+    @property
+    def stream_tick_counts(self) -> Dict[str, int]:
+        """Get ticks received per combined stream name."""
+        return dict(self._stream_tick_counts)
+    
     @property
     def last_tick_time(self) -> Optional[datetime]:
         """Get timestamp of last received tick."""
-        return self._last_tick_time
+        if self._last_tick_ms is None:
+            return None
+        return epoch_ms_to_ist(self._last_tick_ms)
 
 
 class SyncWebSocketClient:
@@ -201,8 +337,12 @@ class SyncWebSocketClient:
     Useful for integration with Streamlit's synchronous execution model.
     """
     
-    def __init__(self):
-        self._client = BinanceWebSocketClient()
+    def __init__(self, **client_kwargs):
+        """
+        Args:
+            **client_kwargs: Passed through to BinanceWebSocketClient
+        """
+        self._client = BinanceWebSocketClient(**client_kwargs)
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._thread = None
         self._started = False
@@ -211,6 +351,10 @@ class SyncWebSocketClient:
         """Register a tick callback."""
         self._client.on_tick(callback)
         
+    def on_tick_batch(self, callback: Callable[[List[Tick]], None]) -> None:
+        """Register a batched tick callback."""
+        self._client.on_tick_batch(callback)
+        
     def start(self, symbols: List[str]) -> None:
         """Start WebSocket connection in background thread."""
         if self._started:
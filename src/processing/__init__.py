@@ -1,5 +1,10 @@
 # Processing layer package
-from .resampler import TimeSeriesResampler
+from .resampler import FillPolicy, TimeSeriesResampler
 from .ohlcv import OHLCVBar
+from .cascade import CascadingResampler
+from .batch_resampler import BatchResampler
+from .timeframe import Timeframe, parse_timeframe
+from .information_bars import BarType, InformationBarResampler
 
-__all__ = ["TimeSeriesResampler", "OHLCVBar"]
+__all__ = ["TimeSeriesResampler", "FillPolicy", "OHLCVBar", "CascadingResampler", "BatchResampler",
+           "Timeframe", "parse_timeframe", "BarType", "InformationBarResampler"]
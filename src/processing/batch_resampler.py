@@ -0,0 +1,215 @@
+"""
+Vectorized batch resampling of columnar ticks into OHLCV bars
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..ingestion.data_normalizer import epoch_ms_to_ist
+from ..ingestion.ndjson_loader import TickChunk
+from .ohlcv import BarBuilder, OHLCVBar
+from .timeframe import IST_OFFSET_MS, bucket_time, parse_timeframe
+
+
+@dataclass
+class _OpenBar:
+    """Partial last bar of a symbol, carried into the next batch."""
+    bucket: int  # Bar start, local ms
+    builder: BarBuilder
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return {
+        "timestamp": np.empty(0, dtype="datetime64[ns]"),
+        "open": np.empty(0), "high": np.empty(0), "low": np.empty(0), "close": np.empty(0),
+        "volume": np.empty(0), "vwap": np.empty(0),
+        "trade_count": np.empty(0, dtype=np.int64),
+        "buy_volume": np.empty(0), "sell_volume": np.empty(0),
+        "signed_trade_count": np.empty(0, dtype=np.int64),
+        "order_flow_imbalance": np.empty(0),
+    }
+
+
+class BatchResampler:
+    """
+    Vectorized counterpart of TimeSeriesResampler for columnar tick batches.
+
+    Ticks get integer bucket ids from their epoch timestamps and each bar
+    is computed with grouped NumPy reductions (``reduceat`` for high/low,
+    ``bincount`` for volume and the VWAP numerator). ``bincount`` adds
+    weights one by one in input order, exactly like BarBuilder, so bars
+    are bit-identical to the streaming resampler's for in-order ticks. A
+    tick older than the open bar joins that bar (TimeSeriesResampler
+    instead buffers, amends or drops late ticks).
+
+    The last bar of each symbol stays open across batches and completes
+    when a later batch moves past it.
+    """
+
+    def __init__(self, timeframe: str = "1T"):
+        """
+        Initialize batch resampler.
+
+        Args:
+            timeframe: Timeframe string (1S, 30S, 1T, 5T, 4H, 1D, ...; see
+                parse_timeframe)
+
+        Raises:
+            ValueError: If the timeframe cannot be parsed
+        """
+        self.timeframe = timeframe
+        self._timeframe = parse_timeframe(timeframe)
+        self._open: Dict[str, _OpenBar] = {}
+
+    def add_arrays(
+        self,
+        symbol: str,
+        ts_ms: np.ndarray,
+        price: np.ndarray,
+        quantity: np.ndarray,
+        side: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Add ticks of one symbol in arrival order.
+
+        Args:
+            symbol: Symbol the ticks belong to
+            ts_ms: UTC epoch milliseconds
+            price: Trade prices
+            quantity: Trade quantities
+            side: 1 buyer is maker, 0 seller is maker, -1 unknown (as in
+                the tick ring buffer; None if no side is known)
+
+        Returns:
+            Completed bars as columns (BarBuffer layout)
+        """
+        n = len(ts_ms)
+        if n == 0:
+            return _empty_columns()
+        ts_ms = np.asarray(ts_ms, dtype=np.int64)
+        price = np.asarray(price, dtype=np.float64)
+        quantity = np.asarray(quantity, dtype=np.float64)
+
+        buckets = np.maximum.accumulate(self._timeframe.floor_array(ts_ms + IST_OFFSET_MS))
+
+        # Rows to reduce: the carried partial bar (if any), then one per tick
+        carry = self._open.get(symbol)
+        opens = highs = lows = price
+        volumes, numerators = quantity, price * quantity
+        counts = np.ones(n, dtype=np.int64)
+        if side is None:
+            buys = sells = np.zeros(n)
+            signs = np.zeros(n, dtype=np.int64)
+        else:
+            side = np.asarray(side)
+            buys = np.where(side == 0, quantity, 0.0)
+            sells = np.where(side == 1, quantity, 0.0)
+            signs = (side == 0).astype(np.int64) - (side == 1)
+        if carry is not None:
+            buckets = np.maximum(buckets, carry.bucket)
+            b = carry.builder
+            buckets = np.r_[carry.bucket, buckets]
+            opens = np.r_[b.open, price]
+            highs = np.r_[b.high, price]
+            lows = np.r_[b.low, price]
+            volumes = np.r_[b.volume, quantity]
+            numerators = np.r_[b.vwap_numerator, numerators]
+            counts = np.r_[b.trade_count, counts]
+            buys = np.r_[b.buy_volume, buys]
+            sells = np.r_[b.sell_volume, sells]
+            signs = np.r_[b.signed_trade_count, signs]
+            price = np.r_[b.close, price]
+        rows = len(buckets)
+
+        new_bar = np.empty(rows, dtype=bool)
+        new_bar[0] = True
+        np.not_equal(buckets[1:], buckets[:-1], out=new_bar[1:])
+        starts = np.flatnonzero(new_bar)
+        ends = np.r_[starts[1:], rows] - 1
+        group = np.cumsum(new_bar) - 1
+        bars = len(starts)
+
+        volume = np.bincount(group, weights=volumes, minlength=bars)
+        numerator = np.bincount(group, weights=numerators, minlength=bars)
+        close = price[ends]
+        vwap = close.copy()
+        np.divide(numerator, volume, out=vwap, where=volume > 0)
+        buy_volume = np.bincount(group, weights=buys, minlength=bars)
+        sell_volume = np.bincount(group, weights=sells, minlength=bars)
+        sided = buy_volume + sell_volume
+        imbalance = np.zeros(bars)
+        np.divide(buy_volume - sell_volume, sided, out=imbalance, where=sided > 0)
+        columns = {
+            "timestamp": buckets[starts].astype("datetime64[ms]").astype("datetime64[ns]"),
+            "open": opens[starts],
+            "high": np.maximum.reduceat(highs, starts),
+            "low": np.minimum.reduceat(lows, starts),
+            "close": close,
+            "volume": volume,
+            "vwap": vwap,
+            "trade_count": np.add.reduceat(counts, starts),
+            "buy_volume": buy_volume,
+            "sell_volume": sell_volume,
+            "signed_trade_count": np.add.reduceat(signs, starts),
+            "order_flow_imbalance": imbalance,
+        }
+
+        # Keep the last bar open for the next batch
+        last = bars - 1
+        first = int(starts[last])
+        if carry is not None and first == 0:
+            bar_start = carry.builder.bar_start
+            first_ts = carry.builder.first_ts
+            last_ts = max(carry.builder.last_ts, int(ts_ms.max()))
+        else:
+            first_ts = int(ts_ms[first - rows + n])
+            bar_start = epoch_ms_to_ist(first_ts)
+            last_ts = int(ts_ms[first - rows + n:].max())
+        self._open[symbol] = _OpenBar(
+            bucket=int(buckets[first]),
+            builder=BarBuilder(
+                symbol=symbol,
+                bar_start=bar_start,
+                open=float(columns["open"][last]),
+                high=float(columns["high"][last]),
+                low=float(columns["low"][last]),
+                close=float(close[last]),
+                volume=float(volume[last]),
+                vwap_numerator=float(numerator[last]),
+                trade_count=int(columns["trade_count"][last]),
+                buy_volume=float(buy_volume[last]),
+                sell_volume=float(sell_volume[last]),
+                signed_trade_count=int(columns["signed_trade_count"][last]),
+                first_ts=first_ts,
+                last_ts=last_ts,
+            ),
+        )
+        return {name: column[:last] for name, column in columns.items()}
+
+    def add_chunk(self, chunk: TickChunk) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Add a columnar chunk of ticks.
+
+        Returns:
+            symbol -> completed bar columns (symbols without completed bars omitted)
+        """
+        completed = {}
+        for code, symbol in enumerate(chunk.symbols):
+            mask = chunk.symbol_codes == code
+            columns = self.add_arrays(symbol, chunk.ts_ms[mask], chunk.price[mask], chunk.quantity[mask])
+            if len(columns["timestamp"]):
+                completed[symbol] = columns
+        return completed
+
+    def get_current_bar(self, symbol: str) -> Optional[OHLCVBar]:
+        """Get the current (incomplete) bar for a symbol."""
+        carry = self._open.get(symbol)
+        if carry is None:
+            return None
+        return carry.builder.build(bucket_time(carry.bucket))
+
+    @property
+    def symbols(self) -> List[str]:
+        """Get list of symbols with data."""
+        return list(self._open.keys())
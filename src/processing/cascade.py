@@ -0,0 +1,486 @@
+"""
+Single-pass cascading resampler for several nested timeframes
+"""
+import time
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from ..ingestion.data_normalizer import Tick
+from .ohlcv import BarBuilder, OHLCVBar
+from .resampler import FillPolicy, TimeSeriesResampler
+from .timeframe import IST_OFFSET_MS, bucket_time, parse_timeframe, to_local_ms
+
+
+class CascadingResampler:
+    """
+    Builds bars for several timeframes in one pass over the ticks.
+
+    Ticks only touch the finest timeframe. When a fine bar completes, its
+    builder is merged into the next coarser timeframe (OHLC, volume, VWAP
+    numerator and trade count), and that timeframe is checked for
+    completion only then. Coarser timeframes therefore add work per fine
+    bar, not per tick.
+
+    Any timeframe accepted by parse_timeframe can be used, as long as each
+    one's bucket boundaries are also boundaries of the next finer one (e.g.
+    1S -> 1T -> 5T -> 15T -> 1H, or 30S -> 7T -> 1D). Bars match those of independent
+    TimeSeriesResamplers; volume and VWAP sums may differ in the last
+    floating-point digit because they are added in a different order.
+
+    ``finalize(now)`` closes bars at their boundary plus the grace period
+    and ``fill_policy`` handles empty intervals, as in TimeSeriesResampler.
+    ``finalize_watermark`` does the same from each symbol's own event time,
+    so replayed captures (whose tick times are far behind the wall clock)
+    are closed by their ticks rather than by the current time.
+
+    Out-of-order ticks follow TimeSeriesResampler's ``allowed_lateness``
+    and ``revision_depth`` rules at the finest timeframe: finest bars are
+    held in a reorder buffer until the watermark passes them, and only
+    then merged into coarser timeframes. A tick for an emitted finest bar
+    amends it if it is one of the last ``revision_depth`` bars with trades,
+    together with the coarser bars containing it (open ones in place,
+    emitted ones if still among their timeframe's last ``revision_depth``);
+    amended bars go to ``on_revision`` callbacks. Other late ticks are
+    dropped and counted in ``late_ticks_dropped``. Open and close follow
+    trade time at every level, since builders (and their merges) compare
+    trade timestamps.
+
+    Usage:
+        cascade = CascadingResampler(["1S", "1T", "5T"])
+        cascade.on_bar(lambda bar, timeframe: store.add_bar(bar, timeframe))
+        cascade.on_revision(lambda bar, timeframe: store.revise_bar(bar, timeframe))
+        cascade.add_ticks(ticks)
+    """
+
+    def __init__(
+        self,
+        timeframes: Optional[List[str]] = None,
+        grace_period: float = 0.0,
+        fill_policy: FillPolicy = FillPolicy.SKIP,
+        allowed_lateness: float = 0.0,
+        revision_depth: int = 0,
+    ):
+        """
+        Initialize cascading resampler.
+
+        Args:
+            timeframes: Timeframe strings to build (default: all of
+                TimeSeriesResampler.TIMEFRAME_SECONDS)
+            grace_period: Seconds after an interval ends before finalize()
+                closes it
+            fill_policy: What to emit for intervals without trades
+            allowed_lateness: Seconds of tick time a finest bar is held past
+                its interval end for out-of-order ticks
+            revision_depth: Number of emitted bars per symbol and timeframe
+                that late ticks may still amend (0 drops every too-late tick)
+
+        Raises:
+            ValueError: If a timeframe is invalid or does not nest
+        """
+        if timeframes is None:
+            timeframes = list(TimeSeriesResampler.TIMEFRAME_SECONDS)
+        specs = sorted(
+            (parse_timeframe(tf) for tf in dict.fromkeys(timeframes)),
+            key=lambda spec: spec.interval_ms,
+        )
+        for finer, coarser in zip(specs, specs[1:]):
+            if not finer.nests_in(coarser):
+                raise ValueError(f"{coarser.name} bars do not nest {finer.name} bars")
+
+        levels = [spec.name for spec in specs]
+        self.timeframes: List[str] = levels
+        self._specs = specs
+        self._level = {tf: i for i, tf in enumerate(levels)}
+        self._grace_ms = int(grace_period * 1000)
+        self.fill_policy = fill_policy
+        self._lateness_ms = int(allowed_lateness * 1000)
+        self.revision_depth = revision_depth
+
+        # Per level: symbol -> current bucket start (local ms) / builder
+        self._buckets: List[Dict[str, int]] = [{} for _ in levels]
+        self._builders: List[Dict[str, BarBuilder]] = [{} for _ in levels]
+
+        # symbol -> start / end of the current finest bucket (checked on every tick)
+        self._starts: Dict[str, int] = {}
+        self._ends: Dict[str, int] = {}
+
+        # Finest-level reorder buffer: bars past their interval awaiting the
+        # watermark, oldest first, and the start of the first interval not yet emitted
+        self._held: Dict[str, List[Tuple[int, BarBuilder]]] = {}
+        self._frontier: Dict[str, int] = {}
+
+        # Per level: symbol -> last emitted bars with trades, amendable by late ticks
+        self._recent: List[Dict[str, Deque[Tuple[int, BarBuilder]]]] = [{} for _ in levels]
+
+        # Late-tick accounting
+        self.late_ticks_dropped = 0
+        self.revisions = 0
+
+        # Close of the last completed finest bar per symbol (for FillPolicy.FORWARD)
+        self._last_close: Dict[str, float] = {}
+        
+        # symbol -> (local ms of the tick that opened the current finest bar,
+        # time.monotonic() when it was added); set per bar, not per tick
+        self._clock: Dict[str, Tuple[int, float]] = {}
+
+        self._callbacks: List[Callable[[OHLCVBar, str], None]] = []
+        self._revision_callbacks: List[Callable[[OHLCVBar, str], None]] = []
+
+    def on_bar(self, callback: Callable[[OHLCVBar, str], None]) -> None:
+        """Register a callback for completed bars, called with (bar, timeframe)."""
+        self._callbacks.append(callback)
+
+    def on_revision(self, callback: Callable[[OHLCVBar, str], None]) -> None:
+        """Register a callback for emitted bars amended by late ticks, called with (bar, timeframe)."""
+        self._revision_callbacks.append(callback)
+
+    def _start(self, symbol: str, local_ms: int) -> None:
+        for level, spec in enumerate(self._specs):
+            self._buckets[level][symbol] = spec.floor(local_ms)
+            self._builders[level][symbol] = BarBuilder(symbol=symbol)
+        bucket = self._buckets[0][symbol]
+        self._starts[symbol] = bucket
+        self._ends[symbol] = self._specs[0].next(bucket)
+        self._frontier[symbol] = bucket
+        self._held[symbol] = []
+        if self.revision_depth:
+            for recent in self._recent:
+                recent[symbol] = deque(maxlen=self.revision_depth)
+
+    def _emit(self, completed: List[Tuple[str, OHLCVBar]], timeframe: str, bar: OHLCVBar) -> None:
+        completed.append((timeframe, bar))
+        for callback in self._callbacks:
+            try:
+                callback(bar, timeframe)
+            except Exception:
+                pass
+
+    def _fill(
+        self,
+        completed: List[Tuple[str, OHLCVBar]],
+        symbol: str,
+        level: int,
+        start_ms: int,
+        stop_ms: int,
+    ) -> None:
+        """Emit fill bars for the empty buckets in [start_ms, stop_ms) of one level."""
+        if self.fill_policy is FillPolicy.SKIP or start_ms >= stop_ms:
+            return
+        if self.fill_policy is FillPolicy.FORWARD:
+            price = self._last_close.get(symbol)
+            if price is None:
+                return  # Nothing to carry forward yet
+        else:
+            price = float("nan")
+        timeframe = self.timeframes[level]
+        spec = self._specs[level]
+        bucket = start_ms
+        while bucket < stop_ms:
+            self._emit(completed, timeframe, OHLCVBar(
+                symbol=symbol, timestamp=bucket_time(bucket),
+                open=price, high=price, low=price, close=price,
+                volume=0.0, vwap=price, trade_count=0,
+            ))
+            bucket = spec.next(bucket)
+
+    def _roll(self, symbol: str, bucket: int) -> None:
+        """Move the current finest bar into the reorder buffer and open finest `bucket`."""
+        builder = self._builders[0][symbol]
+        if builder.trade_count:
+            self._held[symbol].append((self._buckets[0][symbol], builder))
+            self._builders[0][symbol] = BarBuilder(symbol=symbol)
+        self._buckets[0][symbol] = bucket
+        self._starts[symbol] = bucket
+        self._ends[symbol] = self._specs[0].next(bucket)
+
+    def _close_coarse(self, completed: List[Tuple[str, OHLCVBar]], symbol: str, local_ms: int) -> None:
+        """Close every coarser level whose bucket ends before `local_ms`."""
+        last_level = len(self.timeframes) - 1
+        for level in range(1, last_level + 1):
+            spec = self._specs[level]
+            bucket = spec.floor(local_ms)
+            current = self._buckets[level][symbol]
+            if bucket <= current:
+                break  # Coarser buckets cannot have changed either
+            builder = self._builders[level][symbol]
+            bar = builder.build(bucket_time(current))
+            if level < last_level:
+                self._builders[level + 1][symbol].merge(builder)
+            self._builders[level][symbol] = BarBuilder(symbol=symbol)
+            self._buckets[level][symbol] = bucket
+            if bar:
+                self._emit(completed, self.timeframes[level], bar)
+                recent = self._recent[level].get(symbol)
+                if recent is not None:
+                    recent.append((current, builder))
+                self._fill(completed, symbol, level, spec.next(current), bucket)
+            else:
+                self._fill(completed, symbol, level, current, bucket)
+
+    def _release(self, completed: List[Tuple[str, OHLCVBar]], symbol: str, limit: int) -> None:
+        """Emit the held and fill finest bars before `limit` and close the coarser bars they complete."""
+        limit = min(limit, self._buckets[0][symbol])
+        frontier = self._frontier[symbol]
+        if frontier >= limit:
+            return
+        held = self._held[symbol]
+        recent = self._recent[0].get(symbol)
+        timeframe = self.timeframes[0]
+        spec = self._specs[0]
+        coarser = self._builders[1] if len(self.timeframes) > 1 else None
+        reached = frontier  # Coarser levels already contain this bucket
+        while held and held[0][0] < limit:
+            bucket, builder = held.pop(0)
+            if bucket != reached:
+                self._fill(completed, symbol, 0, frontier, bucket)
+                self._close_coarse(completed, symbol, bucket)
+            bar = builder.build(bucket_time(bucket))
+            self._last_close[symbol] = bar.close
+            self._emit(completed, timeframe, bar)
+            if coarser is not None:
+                coarser[symbol].merge(builder)
+            if recent is not None:
+                recent.append((bucket, builder))
+            frontier = spec.next(bucket)
+        self._fill(completed, symbol, 0, frontier, limit)
+        self._frontier[symbol] = limit
+        self._close_coarse(completed, symbol, limit)
+
+    def _close_through(self, completed: List[Tuple[str, OHLCVBar]], symbol: str, cutoff_ms: int) -> None:
+        """Close the bars of a symbol (held ones included) whose interval ended by `cutoff_ms`."""
+        open_bucket = self._specs[0].floor(cutoff_ms)
+        if self._frontier[symbol] >= open_bucket:
+            return
+        if self._buckets[0][symbol] < open_bucket:
+            self._roll(symbol, open_bucket)
+        self._release(completed, symbol, open_bucket)
+
+    def _add_late(self, tick: Tick, local_ms: int) -> None:
+        """Apply a tick for an interval before the symbol's current finest one."""
+        symbol = tick.symbol
+        bucket = self._specs[0].floor(local_ms)
+        if bucket >= self._frontier[symbol]:
+            # Not emitted yet: add to (or open) the held bar
+            held = self._held[symbol]
+            position = 0
+            for position, (held_bucket, builder) in enumerate(held):
+                if held_bucket == bucket:
+                    builder.amend(tick)
+                    return
+                if held_bucket > bucket:
+                    break
+            else:
+                position = len(held)
+            builder = BarBuilder(symbol=symbol)
+            builder.add_tick(tick)
+            held.insert(position, (bucket, builder))
+            return
+
+        for level, spec in enumerate(self._specs):
+            bucket = spec.floor(local_ms)
+            if level and bucket == self._buckets[level][symbol]:
+                # Open coarser bar; the levels above get the tick when it is merged
+                self._builders[level][symbol].amend(tick)
+                return
+            for recent_bucket, builder in self._recent[level].get(symbol, ()):
+                if recent_bucket == bucket:
+                    builder.amend(tick)
+                    self._revise(self.timeframes[level], builder.build(bucket_time(bucket)))
+                    break
+            else:
+                if level == 0:
+                    self.late_ticks_dropped += 1
+                return
+
+    def _revise(self, timeframe: str, bar: OHLCVBar) -> None:
+        """Notify revision callbacks of an emitted bar amended by a late tick."""
+        self.revisions += 1
+        for callback in self._revision_callbacks:
+            try:
+                callback(bar, timeframe)
+            except Exception:
+                pass
+
+    def add_tick(self, tick: Tick) -> List[Tuple[str, OHLCVBar]]:
+        """
+        Add a tick and return bars completed by it.
+
+        Ticks for an earlier finest interval than the current one take the
+        late-tick path (see the class docstring) and complete no bars.
+
+        Args:
+            tick: Tick to add
+
+        Returns:
+            (timeframe, bar) pairs in the order they were emitted
+        """
+        symbol = tick.symbol
+        local_ms = tick.ts_ms + IST_OFFSET_MS
+        end = self._ends.get(symbol)
+        completed = []
+        if end is None:
+            self._start(symbol, local_ms)
+            self._clock[symbol] = (local_ms, time.monotonic())
+        elif local_ms >= end:
+            finest = self._specs[0]
+            bucket = finest.floor(local_ms)
+            self._roll(symbol, bucket)
+            if self._lateness_ms:
+                bucket = finest.floor(local_ms - self._lateness_ms)
+            self._release(completed, symbol, bucket)
+            self._clock[symbol] = (local_ms, time.monotonic())
+        elif local_ms < self._starts[symbol]:
+            self._add_late(tick, local_ms)
+            return completed
+        self._builders[0][symbol].add_tick(tick)
+        return completed
+
+    def finalize(self, now: datetime) -> List[Tuple[str, OHLCVBar]]:
+        """
+        Close every bar whose interval ended at least `grace_period` before `now`.
+
+        This also releases finest bars held for ``allowed_lateness`` once
+        the clock has passed them.
+
+        Args:
+            now: Current time (naive IST) or a watermark such as the latest tick time
+
+        Returns:
+            (timeframe, bar) pairs emitted, including fill bars
+        """
+        cutoff_ms = to_local_ms(now) - self._grace_ms
+        completed = []
+        for symbol in list(self._ends):
+            self._close_through(completed, symbol, cutoff_ms)
+        return completed
+
+    def finalize_watermark(self, max_advance: float) -> List[Tuple[str, OHLCVBar]]:
+        """
+        Close bars against each symbol's event-time watermark.
+        
+        A symbol's watermark is the event time of the tick that opened its
+        current finest bar plus the wall time since that tick was added,
+        advanced by at most `max_advance` seconds. Bars whose interval ended
+        at least `grace_period` before the watermark are closed. Symbols
+        without a tick since start or set_state are skipped.
+        
+        Args:
+            max_advance: Longest wall-clock span (seconds) a quiet symbol's
+                bars keep being closed past its last bar-opening tick
+        
+        Returns:
+            (timeframe, bar) pairs emitted, including fill bars
+        """
+        now = time.monotonic()
+        cap_ms = int(max_advance * 1000)
+        completed = []
+        for symbol, (event_ms, added) in list(self._clock.items()):
+            cutoff_ms = event_ms + min(int((now - added) * 1000), cap_ms) - self._grace_ms
+            self._close_through(completed, symbol, cutoff_ms)
+        return completed
+        
+    def add_ticks(self, ticks: List[Tick]) -> List[Tuple[str, OHLCVBar]]:
+        """Add ticks in order and return all bars they completed."""
+        completed = []
+        for tick in ticks:
+            bars = self.add_tick(tick)
+            if bars:
+                completed.extend(bars)
+        return completed
+
+    def get_current_bar(self, symbol: str, timeframe: str) -> Optional[OHLCVBar]:
+        """Get the current (incomplete) bar of a symbol for one timeframe."""
+        level = self._level[timeframe]
+        if symbol not in self._builders[level]:
+            return None
+        # The bar containing the current finest bucket; coarser levels may
+        # still hold the previous one while finest bars are held back
+        spec = self._specs[level]
+        bucket = spec.floor(self._buckets[0][symbol])
+        pieces = [(self._buckets[finer][symbol], self._builders[finer][symbol]) for finer in range(level, 0, -1)]
+        pieces.extend(self._held[symbol])
+        pieces.append((self._buckets[0][symbol], self._builders[0][symbol]))
+        merged = BarBuilder(symbol=symbol)
+        for start, builder in pieces:
+            if spec.floor(start) == bucket:
+                merged.merge(builder)
+        return merged.build(bucket_time(bucket))
+
+    def current_bars(self) -> List[Tuple[str, OHLCVBar]]:
+        """Current (incomplete) bars of every symbol and timeframe."""
+        bars = []
+        for timeframe in self.timeframes:
+            for symbol in self.symbols:
+                bar = self.get_current_bar(symbol, timeframe)
+                if bar:
+                    bars.append((timeframe, bar))
+        return bars
+
+    def get_state(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Export partial bars (for warm-start snapshots).
+
+        Returns:
+            timeframe -> symbol -> {"bar_time", "builder"}, the same
+            per-timeframe layout as TimeSeriesResampler.get_state; finest
+            entries with held bars also carry them under "held"
+        """
+        state = {
+            timeframe: {
+                symbol: {
+                    "bar_time": bucket_time(self._buckets[level][symbol]),
+                    "builder": asdict(builder),
+                }
+                for symbol, builder in self._builders[level].items()
+            }
+            for level, timeframe in enumerate(self.timeframes)
+        }
+        for symbol, held in self._held.items():
+            if held:
+                state[self.timeframes[0]][symbol]["held"] = [
+                    {"bar_time": bucket_time(bucket), "builder": asdict(builder)}
+                    for bucket, builder in held
+                ]
+        return state
+
+    def set_state(self, state: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        """Restore partial bars exported by get_state (unknown timeframes are ignored)."""
+        for timeframe, symbols in state.items():
+            level = self._level.get(timeframe)
+            if level is None:
+                continue
+            for symbol, entry in symbols.items():
+                bucket = to_local_ms(entry["bar_time"])
+                self._buckets[level][symbol] = bucket
+                self._builders[level][symbol] = BarBuilder(**entry["builder"])
+                if level == 0:
+                    held = [
+                        (to_local_ms(item["bar_time"]), BarBuilder(**item["builder"]))
+                        for item in entry.get("held", ())
+                    ]
+                    self._held[symbol] = held
+                    self._frontier[symbol] = held[0][0] if held else bucket
+                    self._starts[symbol] = bucket
+                    self._ends[symbol] = self._specs[0].next(bucket)
+                if self.revision_depth:
+                    self._recent[level].setdefault(symbol, deque(maxlen=self.revision_depth))
+
+    def clear(self) -> None:
+        """Drop all partial bars."""
+        for level in range(len(self.timeframes)):
+            self._buckets[level].clear()
+            self._builders[level].clear()
+            self._recent[level].clear()
+        self._starts.clear()
+        self._ends.clear()
+        self._held.clear()
+        self._frontier.clear()
+        self._last_close.clear()
+        self._clock.clear()
+
+    @property
+    def symbols(self) -> List[str]:
+        """Get list of symbols with data."""
+        return list(self._builders[0].keys())
@@ -0,0 +1,141 @@
+"""
+Information-driven bars: tick, volume and dollar bars
+"""
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional
+
+from ..ingestion.data_normalizer import Tick
+from .ohlcv import BarBuilder, OHLCVBar
+
+
+class BarType(Enum):
+    TICK = "tick"      # Close after `threshold` trades
+    VOLUME = "volume"  # Close once traded quantity reaches `threshold`
+    DOLLAR = "dollar"  # Close once traded notional (price * quantity) reaches `threshold`
+
+
+# BarBuilder field measured against the threshold
+_BAR_SIZE = {
+    BarType.TICK: attrgetter("trade_count"),
+    BarType.VOLUME: attrgetter("volume"),
+    BarType.DOLLAR: attrgetter("vwap_numerator"),
+}
+
+# Offset between bars of one symbol closed at the same trade time
+_TIE_STEP = timedelta(microseconds=1)
+
+
+class InformationBarResampler:
+    """
+    Builds bars that close after a fixed amount of activity instead of time.
+
+    A bar closes on the tick that brings its trade count, volume or
+    notional to the threshold (ticks are not split across bars), so busy
+    periods produce many bars and quiet ones few. Bars are timestamped
+    with their closing trade and stored under ``timeframe`` (e.g.
+    "tick_500", "volume_10", "dollar_1000000"). Bars of a symbol closed
+    at the same (or an earlier) trade time are stamped one microsecond
+    after the previous bar, so timestamps are unique and increasing.
+
+    Mirrors the TimeSeriesResampler interface (add_tick, on_bar,
+    get_current_bar, get_state/set_state).
+    """
+
+    def __init__(self, bar_type: BarType, threshold: float):
+        """
+        Initialize information bar resampler.
+
+        Args:
+            bar_type: What is counted towards the threshold
+            threshold: Trades, quantity or notional per bar
+
+        Raises:
+            ValueError: If the threshold is not positive
+        """
+        if threshold <= 0:
+            raise ValueError(f"Bar threshold must be positive, got {threshold}")
+        self.bar_type = bar_type
+        self.threshold = threshold
+        size = int(threshold) if float(threshold).is_integer() else threshold
+        self.timeframe = f"{bar_type.value}_{size}"
+        self._size = _BAR_SIZE[bar_type]
+        self._builders: Dict[str, BarBuilder] = {}
+        self._last_time: Dict[str, datetime] = {}  # symbol -> last completed bar timestamp
+        self._callbacks: List[Callable[[OHLCVBar], None]] = []
+
+    def on_bar(self, callback: Callable[[OHLCVBar], None]) -> None:
+        """Register a callback for completed bars."""
+        self._callbacks.append(callback)
+
+    def add_tick(self, tick: Tick) -> Optional[OHLCVBar]:
+        """
+        Add a tick and return the bar it completed, if any.
+
+        Args:
+            tick: Tick to add
+
+        Returns:
+            Completed OHLCVBar if the threshold was reached, None otherwise
+        """
+        builder = self._builders.get(tick.symbol)
+        if builder is None:
+            builder = self._builders[tick.symbol] = BarBuilder(symbol=tick.symbol)
+        builder.add_tick(tick)
+        if self._size(builder) < self.threshold:
+            return None
+
+        timestamp = tick.timestamp
+        last = self._last_time.get(tick.symbol)
+        if last is not None and timestamp <= last:
+            timestamp = last + _TIE_STEP
+        self._last_time[tick.symbol] = timestamp
+        completed_bar = builder.build(timestamp)
+        builder.reset()
+        for callback in self._callbacks:
+            try:
+                callback(completed_bar)
+            except Exception:
+                pass
+        return completed_bar
+
+    def get_current_bar(self, symbol: str) -> Optional[OHLCVBar]:
+        """Get the current (incomplete) bar for a symbol."""
+        builder = self._builders.get(symbol.upper())
+        return builder.build(builder.bar_start) if builder is not None else None
+
+    def get_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Export the partial bar of each symbol (for warm-start snapshots).
+
+        Returns:
+            symbol -> {"bar_time": first trade time, "builder": BarBuilder
+            fields, "last_bar_time": timestamp of the last completed bar}
+        """
+        return {
+            symbol: {
+                "bar_time": builder.bar_start,
+                "builder": asdict(builder),
+                "last_bar_time": self._last_time.get(symbol),
+            }
+            for symbol, builder in self._builders.items()
+        }
+
+    def set_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        """Restore partial bars exported by get_state."""
+        for symbol, entry in state.items():
+            self._builders[symbol] = BarBuilder(**entry["builder"])
+            if entry.get("last_bar_time") is not None:
+                self._last_time[symbol] = entry["last_bar_time"]
+
+    def clear(self) -> None:
+        """Drop all partial bars."""
+        self._builders.clear()
+        self._last_time.clear()
+
+    @property
+    def symbols(self) -> List[str]:
+        """Get list of symbols with data."""
+        return list(self._builders.keys())
@@ -8,7 +8,7 @@ from typing import Dict, Any, List, Optional
 from ..ingestion.data_normalizer import Tick
 
 
-@dataclass
+@dataclass(slots=True)
 class OHLCVBar:
     """
     OHLCV (Open, High, Low, Close, Volume) bar representation.
@@ -22,6 +22,10 @@ class OHLCVBar:
     volume: float
     vwap: float = 0.0  # Volume-weighted average price
     trade_count: int = 0
+    buy_volume: float = 0.0    # Quantity bought by takers (is_buyer_maker False)
+    sell_volume: float = 0.0   # Quantity sold by takers (is_buyer_maker True)
+    signed_trade_count: int = 0  # Taker buys minus taker sells
+    order_flow_imbalance: float = 0.0  # (buy - sell) / (buy + sell) volume, 0 if neither
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert bar to dictionary for DataFrame creation."""
@@ -35,16 +39,29 @@ class OHLCVBar:
             "volume": self.volume,
             "vwap": self.vwap,
             "trade_count": self.trade_count,
+            "buy_volume": self.buy_volume,
+            "sell_volume": self.sell_volume,
+            "signed_trade_count": self.signed_trade_count,
+            "order_flow_imbalance": self.order_flow_imbalance,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BarBuilder:
     """
     Accumulates ticks and builds OHLCV bars.
+    
+    Slotted (no per-instance dict) since it is updated on every tick.
+    Ticks without a known side (``is_buyer_maker`` None) count towards
+    volume but not towards buy/sell volume.
+    
+    Open and close follow trade time rather than arrival order: the
+    builder keeps the epoch ms of its first and last trade, so ticks added
+    out of order (and partial bars merged out of order) still give the
+    bar of the sorted ticks. Ties go to arrival order.
     """
     symbol: str
-    bar_start: Optional[datetime] = None
+    bar_start: Optional[datetime] = None  # Time of the first trade
     open: float = 0.0
     high: float = 0.0
     low: float = float("inf")
@@ -52,21 +69,78 @@ class BarBuilder:
     volume: float = 0.0
     vwap_numerator: float = 0.0  # Sum of price * quantity
     trade_count: int = 0
+    buy_volume: float = 0.0
+    sell_volume: float = 0.0
+    signed_trade_count: int = 0
+    first_ts: int = 0  # UTC epoch ms of the open's trade
+    last_ts: int = 0   # UTC epoch ms of the close's trade
+    
+    def _add_side(self, tick: Tick, quantity: float) -> None:
+        if tick.is_buyer_maker:
+            self.sell_volume += quantity
+            self.signed_trade_count -= 1
+        elif tick.is_buyer_maker is not None:
+            self.buy_volume += quantity
+            self.signed_trade_count += 1
     
     def add_tick(self, tick: Tick) -> None:
-        """Add a tick to the current bar."""
-        if self.bar_start is None:
+        """Add a tick to the current bar (in any order within the bar)."""
+        price = tick.price
+        quantity = tick.quantity
+        ts = tick.ts_ms
+        if self.trade_count == 0:
             self.bar_start = tick.timestamp
-            self.open = tick.price
-            self.high = tick.price
-            self.low = tick.price
-            
-        self.high = max(self.high, tick.price)
-        self.low = min(self.low, tick.price)
-        self.close = tick.price
-        self.volume += tick.quantity
-        self.vwap_numerator += tick.price * tick.quantity
+            self.open = self.high = self.low = self.close = price
+            self.first_ts = self.last_ts = ts
+        else:
+            if price > self.high:
+                self.high = price
+            elif price < self.low:
+                self.low = price
+            if ts >= self.last_ts:
+                self.close = price
+                self.last_ts = ts
+            elif ts < self.first_ts:
+                self.bar_start = tick.timestamp
+                self.open = price
+                self.first_ts = ts
+        self.volume += quantity
+        self.vwap_numerator += price * quantity
         self.trade_count += 1
+        self._add_side(tick, quantity)
+        
+    def amend(self, tick: Tick) -> None:
+        """Add a tick that arrived after later ticks of this bar (same as add_tick)."""
+        self.add_tick(tick)
+        
+    def merge(self, other: "BarBuilder") -> None:
+        """Fold another partial bar of the same symbol into this one."""
+        if other.trade_count == 0:
+            return
+        if self.trade_count == 0:
+            self.bar_start = other.bar_start
+            self.open = other.open
+            self.high = other.high
+            self.low = other.low
+            self.close = other.close
+            self.first_ts = other.first_ts
+            self.last_ts = other.last_ts
+        else:
+            self.high = max(self.high, other.high)
+            self.low = min(self.low, other.low)
+            if other.first_ts < self.first_ts:
+                self.bar_start = other.bar_start
+                self.open = other.open
+                self.first_ts = other.first_ts
+            if other.last_ts >= self.last_ts:
+                self.close = other.close
+                self.last_ts = other.last_ts
+        self.volume += other.volume
+        self.vwap_numerator += other.vwap_numerator
+        self.trade_count += other.trade_count
+        self.buy_volume += other.buy_volume
+        self.sell_volume += other.sell_volume
+        self.signed_trade_count += other.signed_trade_count
         
     def build(self, bar_timestamp: datetime) -> Optional[OHLCVBar]:
         """
@@ -82,6 +156,8 @@ class BarBuilder:
             return None
             
         vwap = self.vwap_numerator / self.volume if self.volume > 0 else self.close
+        sided = self.buy_volume + self.sell_volume
+        imbalance = (self.buy_volume - self.sell_volume) / sided if sided > 0 else 0.0
         
         return OHLCVBar(
             symbol=self.symbol,
@@ -93,6 +169,10 @@ class BarBuilder:
             volume=self.volume,
             vwap=vwap,
             trade_count=self.trade_count,
+            buy_volume=self.buy_volume,
+            sell_volume=self.sell_volume,
+            signed_trade_count=self.signed_trade_count,
+            order_flow_imbalance=imbalance,
         )
         
     def reset(self) -> None:
@@ -105,3 +185,8 @@ class BarBuilder:
         self.volume = 0.0
         self.vwap_numerator = 0.0
         self.trade_count = 0
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.signed_trade_count = 0
+        self.first_ts = 0
+        self.last_ts = 0
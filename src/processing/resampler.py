@@ -1,14 +1,24 @@
 """
 Time-series resampler for converting ticks to OHLCV bars
 """
+from dataclasses import asdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
-from collections import defaultdict
+from typing import Any, Deque, Dict, List, Optional, Callable, Tuple
+from collections import defaultdict, deque
+from enum import Enum
 
+import numpy as np
 import pandas as pd
 
 from ..ingestion.data_normalizer import Tick
 from .ohlcv import OHLCVBar, BarBuilder
+from .timeframe import IST_OFFSET_MS, bucket_time, parse_timeframe, to_local_ms
+
+
+class FillPolicy(Enum):
+    SKIP = "skip"        # Emit nothing for intervals without trades
+    FORWARD = "forward"  # Flat bar at the previous close with zero volume
+    NAN = "nan"          # Bar with NaN prices and zero volume
 
 
 class TimeSeriesResampler:
@@ -16,8 +26,26 @@ class TimeSeriesResampler:
     Resamples tick data into OHLCV bars at specified intervals.
     
     Supports multiple timeframes and symbols simultaneously.
+    
+    A bar is completed by the first tick of a later interval, or by
+    ``finalize(now)`` once ``now`` is past the interval end plus the grace
+    period, so quiet symbols still close their bars on time when a clock
+    drives ``finalize``. Intervals without trades are handled according to
+    ``fill_policy``.
+    
+    Out-of-order ticks are handled against a per-symbol watermark (the
+    latest tick time minus ``allowed_lateness``). Bars whose interval ended
+    after the watermark stay in a small reorder buffer, and late ticks for
+    them are added before the bar is emitted. A tick for an interval that
+    was already emitted amends it if it is one of the last
+    ``revision_depth`` bars with trades (the amended bar goes to
+    ``on_revision`` callbacks); otherwise it is dropped and counted in
+    ``late_ticks_dropped``. Builders place ticks by trade time, so a bar
+    completed from shuffled ticks equals the bar of the sorted ticks.
+    In-order ticks never touch the buffer, so they cost nothing extra.
     """
     
+    # Built-in timeframes; any spec accepted by parse_timeframe also works
     TIMEFRAME_SECONDS = {
         "1S": 1,
         "1T": 60,      # 1 minute
@@ -26,44 +54,197 @@ class TimeSeriesResampler:
         "1H": 3600,    # 1 hour
     }
     
-    def __init__(self, timeframe: str = "1T"):
+    def __init__(
+        self,
+        timeframe: str = "1T",
+        grace_period: float = 0.0,
+        fill_policy: FillPolicy = FillPolicy.SKIP,
+        allowed_lateness: float = 0.0,
+        revision_depth: int = 0,
+    ):
         """
         Initialize resampler.
         
         Args:
-            timeframe: Pandas-style timeframe string (1S, 1T, 5T, etc.)
+            timeframe: Timeframe string (1S, 30S, 1T, 5T, 4H, 1D, ...; see
+                parse_timeframe)
+            grace_period: Seconds after an interval ends before finalize()
+                closes it (allowance for in-flight ticks)
+            fill_policy: What to emit for intervals without trades
+            allowed_lateness: Seconds of tick time a bar is held past its
+                interval end for out-of-order ticks
+            revision_depth: Number of emitted bars per symbol that late
+                ticks may still amend (0 drops every too-late tick)
+            
+        Raises:
+            ValueError: If the timeframe cannot be parsed
         """
         self.timeframe = timeframe
-        self._interval_seconds = self.TIMEFRAME_SECONDS.get(timeframe, 60)
+        self._timeframe = parse_timeframe(timeframe)
+        self._interval_ms = self._timeframe.interval_ms
+        self._origin_ms = self._timeframe.origin_ms
+        self._day_aligned = self._timeframe.day_aligned
+        self.grace_period = timedelta(seconds=grace_period)
+        self.fill_policy = fill_policy
+        self._lateness_ms = int(allowed_lateness * 1000)
+        self.revision_depth = revision_depth
         
         # Bar builders per symbol
         self._builders: Dict[str, BarBuilder] = {}
         
-        # Current bar timestamps per symbol
-        self._current_bar_time: Dict[str, datetime] = {}
+        # Current bar start per symbol (IST epoch milliseconds)
+        self._current_bucket: Dict[str, int] = {}
+        
+        # Reorder buffer: bars past their interval awaiting the watermark,
+        # oldest first, and the start of the first interval not yet emitted
+        self._held: Dict[str, List[Tuple[int, BarBuilder]]] = {}
+        self._frontier: Dict[str, int] = {}
+        
+        # Last emitted bars with trades per symbol, amendable by late ticks
+        self._recent: Dict[str, Deque[Tuple[int, BarBuilder]]] = {}
+        
+        # Late-tick accounting
+        self.late_ticks_dropped = 0
+        self.revisions = 0
         
         # Completed bars per symbol
         self._completed_bars: Dict[str, List[OHLCVBar]] = defaultdict(list)
         
-        # Callbacks for new bars
+        # Close of the last emitted bar per symbol (for FillPolicy.FORWARD)
+        self._last_close: Dict[str, float] = {}
+        
+        # Callbacks for new and amended bars
         self._callbacks: List[Callable[[OHLCVBar], None]] = []
+        self._revision_callbacks: List[Callable[[OHLCVBar], None]] = []
         
     def on_bar(self, callback: Callable[[OHLCVBar], None]) -> None:
         """Register a callback for completed bars."""
         self._callbacks.append(callback)
         
+    def on_revision(self, callback: Callable[[OHLCVBar], None]) -> None:
+        """Register a callback for emitted bars amended by late ticks."""
+        self._revision_callbacks.append(callback)
+        
     def _get_bar_timestamp(self, tick_time: datetime) -> datetime:
         """Calculate the bar timestamp for a given tick time."""
-        # Floor to interval boundary
-        epoch = datetime(1970, 1, 1)
-        total_seconds = (tick_time - epoch).total_seconds()
-        bar_seconds = (total_seconds // self._interval_seconds) * self._interval_seconds
-        return epoch + timedelta(seconds=bar_seconds)
+        return bucket_time(self._timeframe.floor(to_local_ms(tick_time)))
+    
+    def _emit(self, bar: OHLCVBar) -> None:
+        """Record a completed bar and notify callbacks."""
+        self._completed_bars[bar.symbol].append(bar)
+        if bar.trade_count:
+            self._last_close[bar.symbol] = bar.close
+        for callback in self._callbacks:
+            try:
+                callback(bar)
+            except Exception:
+                pass
+                
+    def _fill(self, symbol: str, start_ms: int, stop_ms: int) -> None:
+        """Emit fill bars for the empty intervals in [start_ms, stop_ms)."""
+        if self.fill_policy is FillPolicy.SKIP:
+            return
+        if self.fill_policy is FillPolicy.FORWARD:
+            price = self._last_close.get(symbol)
+            if price is None:
+                return  # Nothing to carry forward yet
+        else:
+            price = float("nan")
+        bucket = start_ms
+        while bucket < stop_ms:
+            self._emit(OHLCVBar(
+                symbol=symbol, timestamp=bucket_time(bucket),
+                open=price, high=price, low=price, close=price,
+                volume=0.0, vwap=price, trade_count=0,
+            ))
+            bucket = self._timeframe.next(bucket)
+            
+    def _start(self, symbol: str, bucket: int) -> None:
+        self._builders[symbol] = BarBuilder(symbol=symbol)
+        self._current_bucket[symbol] = bucket
+        self._frontier[symbol] = bucket
+        self._held[symbol] = []
+        if self.revision_depth:
+            self._recent[symbol] = deque(maxlen=self.revision_depth)
+    
+    def _roll(self, symbol: str, next_bucket: int) -> None:
+        """Move the current bar of a symbol into the reorder buffer and start `next_bucket`."""
+        builder = self._builders[symbol]
+        if builder.trade_count:
+            self._held[symbol].append((self._current_bucket[symbol], builder))
+            self._builders[symbol] = BarBuilder(symbol=symbol)
+        self._current_bucket[symbol] = next_bucket
+    
+    def _release(self, symbol: str, limit: int) -> Optional[OHLCVBar]:
+        """Emit the held bars and fill bars of a symbol for intervals before `limit`."""
+        limit = min(limit, self._current_bucket[symbol])
+        frontier = self._frontier[symbol]
+        if frontier >= limit:
+            return None
+        held = self._held[symbol]
+        recent = self._recent.get(symbol)
+        completed_bar = None
+        while held and held[0][0] < limit:
+            bucket, builder = held.pop(0)
+            self._fill(symbol, frontier, bucket)
+            completed_bar = builder.build(bucket_time(bucket))
+            self._emit(completed_bar)
+            if recent is not None:
+                recent.append((bucket, builder))
+            frontier = self._timeframe.next(bucket)
+        self._fill(symbol, frontier, limit)
+        self._frontier[symbol] = limit
+        return completed_bar
+    
+    def _add_late(self, tick: Tick, bucket: int) -> None:
+        """Apply a tick for an interval before the symbol's current one."""
+        symbol = tick.symbol
+        if bucket >= self._frontier[symbol]:
+            # Not emitted yet: add to (or open) the held bar
+            held = self._held[symbol]
+            position = 0
+            for position, (held_bucket, builder) in enumerate(held):
+                if held_bucket == bucket:
+                    builder.amend(tick)
+                    return
+                if held_bucket > bucket:
+                    break
+            else:
+                position = len(held)
+            builder = BarBuilder(symbol=symbol)
+            builder.add_tick(tick)
+            held.insert(position, (bucket, builder))
+            return
+        
+        for recent_bucket, builder in self._recent.get(symbol, ()):
+            if recent_bucket == bucket:
+                builder.amend(tick)
+                self._revise(builder.build(bucket_time(bucket)))
+                return
+        self.late_ticks_dropped += 1
+    
+    def _revise(self, bar: OHLCVBar) -> None:
+        """Replace an emitted bar with its amended version and notify callbacks."""
+        self.revisions += 1
+        bars = self._completed_bars[bar.symbol]
+        for i in range(len(bars) - 1, -1, -1):
+            if bars[i].timestamp == bar.timestamp:
+                bars[i] = bar
+                break
+        for callback in self._revision_callbacks:
+            try:
+                callback(bar)
+            except Exception:
+                pass
     
     def add_tick(self, tick: Tick) -> Optional[OHLCVBar]:
         """
         Add a tick and return completed bar if interval boundary crossed.
         
+        Buckets are computed from the tick's integer epoch milliseconds, so
+        no datetime is built per tick. Ticks for an earlier interval than
+        the current one take the late-tick path (see the class docstring).
+        
         Args:
             tick: Tick to add
             
@@ -71,38 +252,60 @@ class TimeSeriesResampler:
             Completed OHLCVBar if a bar was finished, None otherwise
         """
         symbol = tick.symbol
-        bar_time = self._get_bar_timestamp(tick.timestamp)
+        local_ms = tick.ts_ms + IST_OFFSET_MS
+        if self._day_aligned:
+            bucket = self._timeframe.floor(local_ms)
+        else:
+            bucket = local_ms - (local_ms - self._origin_ms) % self._interval_ms
         
         # Initialize builder if needed
-        if symbol not in self._builders:
-            self._builders[symbol] = BarBuilder(symbol=symbol)
-            self._current_bar_time[symbol] = bar_time
+        current = self._current_bucket.get(symbol)
+        if current is None:
+            self._start(symbol, bucket)
+            current = bucket
             
-        # Check if we've crossed into a new bar
+        # Check if we've crossed into a new bar (or the tick is late)
         completed_bar = None
-        if bar_time > self._current_bar_time.get(symbol, bar_time):
-            # Complete the previous bar
-            builder = self._builders[symbol]
-            completed_bar = builder.build(self._current_bar_time[symbol])
-            
-            if completed_bar:
-                self._completed_bars[symbol].append(completed_bar)
-                # Notify callbacks
-                for callback in self._callbacks:
-                    try:
-                        callback(completed_bar)
-                    except Exception:
-                        pass
-                        
-            # Reset for new bar
-            builder.reset()
-            self._current_bar_time[symbol] = bar_time
+        if bucket != current:
+            if bucket < current:
+                self._add_late(tick, bucket)
+                return None
+            self._roll(symbol, bucket)
+            completed_bar = self._release(symbol, self._timeframe.floor(local_ms - self._lateness_ms))
             
         # Add tick to current bar
         self._builders[symbol].add_tick(tick)
         
         return completed_bar
     
+    def finalize(self, now: datetime) -> List[OHLCVBar]:
+        """
+        Close every bar whose interval ended at least `grace_period` before `now`.
+        
+        Call it periodically from a clock (or with a watermark such as the
+        latest tick time) so bars are emitted at the boundary rather than
+        on the symbol's next trade. This also releases bars held for
+        ``allowed_lateness`` once the clock has passed them.
+        
+        Args:
+            now: Current time (naive IST)
+            
+        Returns:
+            Bars emitted, including fill bars
+        """
+        # First interval that may still receive ticks
+        open_bucket = self._timeframe.floor(to_local_ms(now - self.grace_period))
+        emitted: List[OHLCVBar] = []
+        for symbol, bucket in list(self._current_bucket.items()):
+            if self._frontier[symbol] >= open_bucket:
+                continue
+            if bucket < open_bucket:
+                self._roll(symbol, open_bucket)
+            count = len(self._completed_bars[symbol])
+            self._release(symbol, open_bucket)
+            emitted.extend(self._completed_bars[symbol][count:])
+        return emitted
+    
     def get_bars(self, symbol: str, n: Optional[int] = None) -> List[OHLCVBar]:
         """
         Get completed bars for a symbol.
@@ -133,7 +336,8 @@ class TimeSeriesResampler:
         bars = self.get_bars(symbol, n)
         if not bars:
             return pd.DataFrame(columns=[
-                "timestamp", "open", "high", "low", "close", "volume", "vwap", "trade_count"
+                "timestamp", "open", "high", "low", "close", "volume", "vwap", "trade_count",
+                "buy_volume", "sell_volume", "signed_trade_count", "order_flow_imbalance",
             ])
             
         data = [bar.to_dict() for bar in bars]
@@ -144,21 +348,52 @@ class TimeSeriesResampler:
     def get_current_bar(self, symbol: str) -> Optional[OHLCVBar]:
         """Get the current (incomplete) bar for a symbol."""
         symbol = symbol.upper()
-        if symbol in self._builders and symbol in self._current_bar_time:
-            return self._builders[symbol].build(self._current_bar_time[symbol])
+        if symbol in self._builders and symbol in self._current_bucket:
+            return self._builders[symbol].build(bucket_time(self._current_bucket[symbol]))
         return None
     
+    def get_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Export the partial bar of each symbol (for warm-start snapshots).
+        
+        Returns:
+            symbol -> {"bar_time": bar timestamp, "builder": BarBuilder fields}
+        """
+        return {
+            symbol: {
+                "bar_time": bucket_time(self._current_bucket[symbol]),
+                "builder": asdict(builder),
+            }
+            for symbol, builder in self._builders.items()
+            if symbol in self._current_bucket
+        }
+        
+    def set_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        """Restore partial bars exported by get_state."""
+        for symbol, entry in state.items():
+            self._start(symbol, to_local_ms(entry["bar_time"]))
+            self._builders[symbol] = BarBuilder(**entry["builder"])
+            
     def clear(self, symbol: Optional[str] = None) -> None:
         """Clear accumulated bars."""
         if symbol:
             symbol = symbol.upper()
             self._completed_bars[symbol] = []
+            self._last_close.pop(symbol, None)
             if symbol in self._builders:
                 self._builders[symbol].reset()
+                self._held[symbol].clear()
+            if symbol in self._recent:
+                self._recent[symbol].clear()
         else:
             self._completed_bars.clear()
+            self._last_close.clear()
             for builder in self._builders.values():
                 builder.reset()
+            for held in self._held.values():
+                held.clear()
+            for recent in self._recent.values():
+                recent.clear()
                 
     @property
     def symbols(self) -> List[str]:
@@ -183,15 +418,33 @@ def resample_ticks_to_bars(
         timeframe: Pandas-style timeframe string
         
     Returns:
-        Dictionary mapping symbol to DataFrame of bars
+        Dictionary mapping symbol to DataFrame of completed bars (the last,
+        still-open bar of each symbol is left out, as when streaming)
     """
-    resampler = TimeSeriesResampler(timeframe)
+    from .batch_resampler import BatchResampler
     
+    # Split into per-symbol columns, then resample each with grouped reductions
+    columns: Dict[str, tuple] = {}
     for tick in ticks:
-        resampler.add_tick(tick)
+        ts_ms, prices, quantities, sides = columns.setdefault(tick.symbol, ([], [], [], []))
+        ts_ms.append(tick.ts_ms)
+        prices.append(tick.price)
+        quantities.append(tick.quantity)
+        sides.append(-1 if tick.is_buyer_maker is None else int(tick.is_buyer_maker))
         
+    resampler = BatchResampler(timeframe)
     result = {}
-    for symbol in resampler.symbols:
-        result[symbol] = resampler.get_dataframe(symbol)
+    for symbol, (ts_ms, prices, quantities, sides) in columns.items():
+        bars = resampler.add_arrays(
+            symbol, np.array(ts_ms, dtype=np.int64), prices, quantities, np.array(sides, dtype=np.int8)
+        )
+        if not len(bars["timestamp"]):
+            result[symbol] = pd.DataFrame(columns=[
+                "timestamp", "open", "high", "low", "close", "volume", "vwap", "trade_count",
+                "buy_volume", "sell_volume", "signed_trade_count", "order_flow_imbalance",
+            ])
+            continue
+        index = pd.DatetimeIndex(bars.pop("timestamp").astype("datetime64[us]"), name="timestamp")
+        result[symbol] = pd.DataFrame({"symbol": symbol, **bars}, index=index)
         
     return result
@@ -0,0 +1,129 @@
+"""
+Timeframe specs ("30S", "5T", "4H", "1D", "1W") and bar bucketing
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Union
+
+import numpy as np
+
+from ..ingestion.data_normalizer import IST
+
+# Bars are floored on naive IST wall-clock time, in integer milliseconds
+# since 1970-01-01 00:00 ("local ms")
+IST_OFFSET_MS = int(IST.utcoffset(None) / timedelta(milliseconds=1))
+DAY_MS = 86_400_000
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MS = timedelta(milliseconds=1)
+_WEEK_ORIGIN_MS = 4 * DAY_MS  # 1970-01-05, a Monday
+
+# Unit aliases (case-insensitive) -> milliseconds
+_UNITS = {
+    "S": 1000,
+    "T": 60_000,
+    "M": 60_000,  # Minutes (no calendar months)
+    "MIN": 60_000,
+    "H": 3_600_000,
+    "D": DAY_MS,
+    "W": 7 * DAY_MS,
+}
+
+_SPEC = re.compile(r"^\s*(\d*)\s*([A-Za-z]+)\s*$")
+
+
+def to_local_ms(timestamp: datetime) -> int:
+    """Naive IST datetime -> local ms."""
+    return (timestamp - _EPOCH) // _ONE_MS
+
+
+def bucket_time(local_ms: int) -> datetime:
+    """Local ms -> naive IST datetime (e.g. a bar timestamp)."""
+    return _EPOCH + timedelta(milliseconds=local_ms)
+
+
+@dataclass(frozen=True)
+class Timeframe:
+    """
+    A bar interval with calendar-aligned boundaries.
+
+    Intervals that divide a day are aligned to IST midnight (e.g. 4H bars
+    start at 00:00, 04:00, ...). Intervals shorter than a day that do not
+    divide it (e.g. 7H, 7T) restart at every IST midnight, so the last bar
+    of a day is shorter. Day multiples count from 1970-01-01 and weeks
+    start on Monday.
+    """
+    name: str
+    interval_ms: int
+    origin_ms: int = 0  # A bucket boundary (local ms)
+
+    @property
+    def seconds(self) -> float:
+        return self.interval_ms / 1000
+
+    @property
+    def day_aligned(self) -> bool:
+        """True if buckets restart at each IST midnight."""
+        return self.interval_ms < DAY_MS and DAY_MS % self.interval_ms != 0
+
+    def floor(self, local_ms: int) -> int:
+        """Start of the bucket containing `local_ms`."""
+        if self.day_aligned:
+            day = local_ms - local_ms % DAY_MS
+            return day + (local_ms - day) // self.interval_ms * self.interval_ms
+        return local_ms - (local_ms - self.origin_ms) % self.interval_ms
+
+    def floor_array(self, local_ms: np.ndarray) -> np.ndarray:
+        """Vectorized floor."""
+        if self.day_aligned:
+            day = local_ms - local_ms % DAY_MS
+            return day + (local_ms - day) // self.interval_ms * self.interval_ms
+        return local_ms - (local_ms - self.origin_ms) % self.interval_ms
+
+    def next(self, bucket_ms: int) -> int:
+        """Start of the bucket after the one starting at `bucket_ms`."""
+        end = bucket_ms + self.interval_ms
+        if self.day_aligned:
+            return min(end, bucket_ms - bucket_ms % DAY_MS + DAY_MS)
+        return end
+
+    def nests_in(self, coarser: "Timeframe") -> bool:
+        """True if every bucket boundary of `coarser` is also one of this timeframe."""
+        if self.day_aligned and coarser.interval_ms % DAY_MS == 0:
+            return True  # Coarser boundaries are midnights
+        if coarser.interval_ms % self.interval_ms:
+            return False
+        if self.day_aligned:
+            return coarser.day_aligned
+        return (coarser.origin_ms - self.origin_ms) % self.interval_ms == 0
+
+
+def parse_timeframe(spec: Union[str, Timeframe]) -> Timeframe:
+    """
+    Parse a timeframe string.
+
+    Accepts a positive multiple of seconds (S), minutes (T, M or MIN),
+    hours (H), days (D) or weeks (W), case-insensitively; the count
+    defaults to 1. Examples: "1S", "30s", "5T", "15min", "4H", "1D", "1W".
+
+    Args:
+        spec: Timeframe string (a Timeframe is returned unchanged)
+
+    Returns:
+        Timeframe named after `spec`
+
+    Raises:
+        ValueError: If the spec is malformed or zero
+    """
+    if isinstance(spec, Timeframe):
+        return spec
+    match = _SPEC.match(spec)
+    unit = match.group(2).upper() if match else None
+    if unit not in _UNITS:
+        raise ValueError(f"Invalid timeframe: {spec!r}")
+    count = int(match.group(1) or 1)
+    if count <= 0:
+        raise ValueError(f"Invalid timeframe: {spec!r}")
+    origin = _WEEK_ORIGIN_MS if unit == "W" else 0
+    return Timeframe(name=spec, interval_ms=count * _UNITS[unit], origin_ms=origin)
@@ -1,4 +1,11 @@
 # Storage layer package
 from .memory_store import MemoryStore
+from .ring_buffer import TickRingBuffer
+from .bar_buffer import BarBuffer
+from .price_panel import PricePanel
+from .sqlite_store import SQLiteStore
+from .parquet_archive import ParquetArchive
+from .snapshot import capture_snapshot, restore_snapshot, write_snapshot
 
-__all__ = ["MemoryStore"]
+__all__ = ["MemoryStore", "TickRingBuffer", "BarBuffer", "PricePanel", "SQLiteStore", "ParquetArchive",
+           "capture_snapshot", "restore_snapshot", "write_snapshot"]
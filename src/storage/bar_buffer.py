@@ -0,0 +1,321 @@
+"""
+Columnar OHLCV bar buffer with zero-copy pandas reads
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..processing.ohlcv import OHLCVBar
+from .locks import InstrumentedLock
+
+
+# Column name -> dtype; timestamps are naive IST bar open times. Value
+# columns follow the field order of OHLCVBar.
+BAR_COLUMNS: Dict[str, np.dtype] = {
+    "timestamp": np.dtype("datetime64[ns]"),
+    "open": np.dtype(np.float64),
+    "high": np.dtype(np.float64),
+    "low": np.dtype(np.float64),
+    "close": np.dtype(np.float64),
+    "volume": np.dtype(np.float64),
+    "vwap": np.dtype(np.float64),
+    "trade_count": np.dtype(np.int64),
+    "buy_volume": np.dtype(np.float64),
+    "sell_volume": np.dtype(np.float64),
+    "signed_trade_count": np.dtype(np.int64),
+    "order_flow_imbalance": np.dtype(np.float64),
+}
+
+# Columns exposed in DataFrames (timestamp becomes the index)
+BAR_VALUE_COLUMNS: List[str] = [name for name in BAR_COLUMNS if name != "timestamp"]
+
+# Bytes per stored bar across all columns
+BAR_ROW_BYTES = sum(dtype.itemsize for dtype in BAR_COLUMNS.values())
+
+
+def empty_bar_columns() -> Dict[str, np.ndarray]:
+    """Zero-length bar columns."""
+    return {name: np.empty(0, dtype=dtype) for name, dtype in BAR_COLUMNS.items()}
+
+
+def concat_bar_columns(*parts: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Concatenate bar column dicts in order."""
+    return {name: np.concatenate([part[name] for part in parts]) for name in BAR_COLUMNS}
+
+
+def columns_to_prices(columns: Dict[str, np.ndarray], name: str) -> pd.Series:
+    """Wrap close prices from bar columns in a Series (no copy)."""
+    index = pd.DatetimeIndex(columns["timestamp"], copy=False, name="timestamp")
+    return pd.Series(columns["close"], index=index, name=name, copy=False)
+
+
+def columns_to_dataframe(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Wrap bar columns in a DataFrame indexed by timestamp (no copy)."""
+    index = pd.DatetimeIndex(columns["timestamp"], copy=False, name="timestamp")
+    return pd.DataFrame(
+        {name: columns[name] for name in BAR_VALUE_COLUMNS},
+        index=index,
+        copy=False,
+    )
+
+
+def columns_to_bars(columns: Dict[str, np.ndarray], symbol: str) -> List[OHLCVBar]:
+    """Materialize bar columns as OHLCVBar objects."""
+    timestamps = columns["timestamp"].astype("datetime64[us]").astype(datetime)
+    return [
+        OHLCVBar(symbol, timestamp, *values)
+        for timestamp, *values in zip(
+            timestamps,
+            *(columns[name].tolist() for name in BAR_VALUE_COLUMNS),
+        )
+    ]
+
+
+class BarBuffer:
+    """
+    Append-only struct-of-arrays store for the most recent bars of one
+    symbol/timeframe.
+
+    Bars are written into preallocated arrays with room for twice the
+    capacity. When the arrays fill up, the newest ``capacity`` bars move
+    into freshly allocated arrays. Filled slots are never written again
+    (``replace`` revises a bar in a copy), so read-only views handed out by
+    ``columns`` stay valid and unchanged.
+    Reads are zero-copy, and compaction is amortized O(1) per append.
+
+    Writers serialize on ``lock``. Each append publishes a new
+    ``(columns, start, end)`` snapshot with one attribute assignment.
+    Readers never take the lock; they read whichever snapshot is current.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize bar buffer.
+
+        Args:
+            capacity: Maximum bars retained
+        """
+        self._capacity = max(1, capacity)
+        self.lock = InstrumentedLock()
+        self.version = 0
+        # (columns, first retained bar, one past the last bar)
+        self._state: Tuple[Dict[str, np.ndarray], int, int] = (
+            self._allocate(min(2 * self._capacity, 1024)), 0, 0
+        )
+
+    @staticmethod
+    def _allocate(size: int) -> Dict[str, np.ndarray]:
+        return {name: np.empty(size, dtype=dtype) for name, dtype in BAR_COLUMNS.items()}
+
+    def _reserve(self) -> Tuple[Dict[str, np.ndarray], int, int]:
+        """Return a state with room for one more bar at `end` (caller holds the lock)."""
+        columns, start, end = self._state
+        allocated = len(columns["close"])
+        if end < allocated:
+            return columns, start, end
+        count = end - start
+        size = min(max(2 * allocated, 1024), 2 * self._capacity)
+        if count >= size:
+            size = 2 * self._capacity
+        fresh = self._allocate(size)
+        for name, column in columns.items():
+            fresh[name][:count] = column[start:end]
+        return fresh, 0, count
+
+    @staticmethod
+    def _write(columns: Dict[str, np.ndarray], i: int, bar: OHLCVBar) -> None:
+        columns["timestamp"][i] = np.datetime64(bar.timestamp, "ns")
+        columns["open"][i] = bar.open
+        columns["high"][i] = bar.high
+        columns["low"][i] = bar.low
+        columns["close"][i] = bar.close
+        columns["volume"][i] = bar.volume
+        columns["vwap"][i] = bar.vwap
+        columns["trade_count"][i] = bar.trade_count
+        columns["buy_volume"][i] = bar.buy_volume
+        columns["sell_volume"][i] = bar.sell_volume
+        columns["signed_trade_count"][i] = bar.signed_trade_count
+        columns["order_flow_imbalance"][i] = bar.order_flow_imbalance
+
+    def append(self, bar: OHLCVBar) -> None:
+        """Append a completed bar, evicting the oldest beyond capacity."""
+        with self.lock:
+            columns, start, end = self._reserve()
+            self._write(columns, end, bar)
+            end += 1
+            if end - start > self._capacity:
+                start += 1
+            # Publish: readers see either the old or the new snapshot
+            self._state = (columns, start, end)
+            self.version += 1
+
+    def replace(self, bar: OHLCVBar) -> bool:
+        """
+        Replace the retained bar with the same timestamp (e.g. a revised bar).
+
+        The retained bars are copied into fresh arrays first, so views
+        handed out earlier keep the old values.
+
+        Returns:
+            False if no retained bar has the bar's timestamp
+        """
+        ts = np.datetime64(bar.timestamp, "ns")
+        with self.lock:
+            columns, start, end = self._state
+            i = start + int(np.searchsorted(columns["timestamp"][start:end], ts))
+            if i == end or columns["timestamp"][i] != ts:
+                return False
+            fresh = self._allocate(len(columns["close"]))
+            for name, column in columns.items():
+                fresh[name][:end - start] = column[start:end]
+            self._write(fresh, i - start, bar)
+            self._state = (fresh, 0, end - start)
+            self.version += 1
+            return True
+
+    def extend(self, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Add bar columns in bulk (e.g. when restoring history).
+
+        Bars that overlap the stored ones (e.g. demo history loaded after a
+        snapshot restore) are merged in time order; where both have a bar
+        at the same timestamp, the added one replaces the stored one.
+        """
+        count = len(columns["timestamp"])
+        if count == 0:
+            return
+        with self.lock:
+            current, start, end = self._state
+            merged = {
+                name: np.concatenate((current[name][start:end], np.asarray(columns[name], dtype=dtype)))
+                for name, dtype in BAR_COLUMNS.items()
+            }
+            timestamps = merged["timestamp"]
+            if not (timestamps[1:] > timestamps[:-1]).all():
+                # Keep the last copy of each timestamp, in time order
+                order = np.argsort(timestamps, kind="stable")
+                ordered = timestamps[order]
+                order = order[np.r_[ordered[1:] != ordered[:-1], True]]
+                merged = {name: column[order] for name, column in merged.items()}
+            merged = {name: column[-self._capacity:] for name, column in merged.items()}
+            total = len(merged["timestamp"])
+            fresh = self._allocate(2 * self._capacity)
+            for name, column in merged.items():
+                fresh[name][:total] = column
+            self._state = (fresh, 0, total)
+            self.version += 1
+
+    def set_capacity(self, capacity: int) -> None:
+        """Change the retention limit, keeping the newest bars (shrinking frees memory)."""
+        capacity = max(1, capacity)
+        with self.lock:
+            if capacity == self._capacity:
+                return
+            columns, start, end = self._state
+            start = max(start, end - capacity)
+            count = end - start
+            fresh = self._allocate(min(max(2 * count, 1024), 2 * capacity))
+            for name, column in columns.items():
+                fresh[name][:count] = column[start:end]
+            self._capacity = capacity
+            self._state = (fresh, 0, count)
+            self.version += 1
+
+    @property
+    def first_timestamp(self) -> Optional[np.datetime64]:
+        """Timestamp of the oldest retained bar."""
+        columns, start, end = self._state
+        if start == end:
+            return None
+        return columns["timestamp"][start]
+
+    @staticmethod
+    def _bounds(
+        state: Tuple[Dict[str, np.ndarray], int, int],
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[int, int]:
+        """Binary-search the sorted timestamp column for a slice of rows."""
+        columns, lo, hi = state
+        if start is not None or end is not None:
+            timestamps = columns["timestamp"][lo:hi]
+            if end is not None:
+                hi = lo + int(np.searchsorted(timestamps, np.datetime64(end, "ns"), side="right"))
+            if start is not None:
+                lo = lo + int(np.searchsorted(timestamps, np.datetime64(start, "ns"), side="left"))
+        if n is not None:
+            lo = max(lo, hi - max(n, 0))
+        return lo, max(lo, hi)
+
+    def columns(
+        self,
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get bars as read-only column views in time order.
+
+        Args:
+            n: Number of most recent bars in the range (None for all)
+            start: Earliest bar timestamp to include (naive IST)
+            end: Latest bar timestamp to include (naive IST)
+        """
+        state = self._state
+        lo, hi = self._bounds(state, n, start, end)
+        result = {}
+        for name, column in state[0].items():
+            view = column[lo:hi]
+            view.flags.writeable = False
+            result[name] = view
+        return result
+
+    def index(self, n: Optional[int] = None) -> pd.DatetimeIndex:
+        """Bar timestamps as a DatetimeIndex sharing the buffer's memory."""
+        return pd.DatetimeIndex(self.columns(n)["timestamp"], copy=False, name="timestamp")
+
+    def prices(
+        self,
+        name: str,
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.Series:
+        """Close prices as a Series wrapping the buffer (no copy)."""
+        return columns_to_prices(self.columns(n, start, end), name)
+
+    def dataframe(
+        self,
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """OHLCV columns as a DataFrame wrapping the buffer (no copy)."""
+        return columns_to_dataframe(self.columns(n, start, end))
+
+    def to_bars(
+        self,
+        symbol: str,
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[OHLCVBar]:
+        """Materialize bars as OHLCVBar objects."""
+        return columns_to_bars(self.columns(n, start, end), symbol)
+
+    def __len__(self) -> int:
+        _, start, end = self._state
+        return end - start
+
+    @property
+    def capacity(self) -> int:
+        """Maximum bars retained."""
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently allocated for the columns."""
+        return sum(column.nbytes for column in self._state[0].values())
@@ -0,0 +1,68 @@
+"""
+Lock wrapper that counts contention for the storage layer
+"""
+import time
+from threading import Lock
+from typing import Dict, Iterable
+
+
+class InstrumentedLock:
+    """
+    Drop-in replacement for threading.Lock that records how often callers
+    had to wait and for how long.
+
+    Counters are only updated while the lock is held, so they need no
+    extra synchronization.
+    """
+
+    __slots__ = ("_lock", "acquisitions", "contentions", "wait_seconds")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.acquisitions = 0
+        self.contentions = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        if not self._lock.acquire(True, timeout):
+            return False
+        self.acquisitions += 1
+        self.contentions += 1
+        self.wait_seconds += time.perf_counter() - start
+        return True
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self) -> "InstrumentedLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def stats(self) -> Dict[str, float]:
+        """Get counters (wait time in milliseconds)."""
+        return {
+            "acquisitions": self.acquisitions,
+            "contentions": self.contentions,
+            "wait_ms": self.wait_seconds * 1000,
+        }
+
+
+def merge_lock_stats(locks: Iterable[InstrumentedLock]) -> Dict[str, float]:
+    """Sum the counters of several locks."""
+    total = {"acquisitions": 0, "contentions": 0, "wait_ms": 0.0}
+    for lock in locks:
+        for key, value in lock.stats().items():
+            total[key] += value
+    return total
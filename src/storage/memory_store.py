@@ -1,45 +1,210 @@
 """
 In-memory data store with thread-safe operations
 """
-from collections import deque
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from threading import Lock
-from typing import Dict, List, Optional, Deque, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 
+import numpy as np
 import pandas as pd
 
-from ..ingestion.data_normalizer import Tick
+from ..ingestion.data_normalizer import IST, Tick, ist_to_epoch_ms
+from ..ingestion.ndjson_loader import TickChunk
 from ..processing.ohlcv import OHLCVBar
+from ..processing.timeframe import parse_timeframe
+from .bar_buffer import (
+    BarBuffer,
+    BAR_ROW_BYTES,
+    columns_to_bars,
+    columns_to_dataframe,
+    columns_to_prices,
+    concat_bar_columns,
+    empty_bar_columns,
+)
+from .locks import InstrumentedLock, merge_lock_stats
+from .sqlite_store import SQLiteStore
+from .price_panel import PricePanel
+from .ring_buffer import TICK_ROW_BYTES, TickRingBuffer
+from .tick_compression import BLOCK_SIZE, CompressedTickHistory
+
+
+def _as_naive_ist(timestamp: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a query bound to the store's naive IST convention."""
+    if timestamp is None or timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(IST).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=None)
+def _is_time_key(timeframe: str) -> bool:
+    """True for clock timeframes ("1T", "4H"), False for keys like "tick_500"."""
+    try:
+        parse_timeframe(timeframe)
+    except ValueError:
+        return False
+    return True
+
+
+def _water_fill(budget: float, weights: List[float], floors: List[float], caps: List[float]) -> List[float]:
+    """
+    Split `budget` in proportion to `weights`, giving every entry at least
+    its floor and at most its cap. Budget freed by capped entries goes to
+    the rest.
+    """
+    alloc = [min(floor, cap) for floor, cap in zip(floors, caps)]
+    remaining = budget - sum(alloc)
+    active = [i for i in range(len(alloc)) if alloc[i] < caps[i]]
+    while remaining > 0 and active:
+        total = sum(weights[i] for i in active)
+        saturated = [i for i in active if alloc[i] + remaining * weights[i] / total >= caps[i]]
+        if not saturated:
+            for i in active:
+                alloc[i] += remaining * weights[i] / total
+            break
+        for i in saturated:
+            remaining -= caps[i] - alloc[i]
+            alloc[i] = caps[i]
+        active = [i for i in active if i not in saturated]
+    return alloc
 
 
 @dataclass
 class SymbolData:
-    """Container for all data related to a single symbol."""
+    """
+    Container for all data related to a single symbol.
+    
+    Tick writes serialize on ``tick_lock`` and each BarBuffer has its own
+    writer lock, so different symbols and timeframes never contend.
+    Reads go through lock-free snapshots.
+    
+    With ``history`` set, ticks leaving the ring are compressed into it in
+    whole blocks instead of being discarded.
+    """
     symbol: str
-    ticks: Deque[Tick] = field(default_factory=lambda: deque(maxlen=100000))
-    bars: Dict[str, Deque[OHLCVBar]] = field(default_factory=dict)  # timeframe -> bars
+    ticks: TickRingBuffer = field(default_factory=lambda: TickRingBuffer(100000))
+    bars: Dict[str, BarBuffer] = field(default_factory=dict)  # timeframe -> bars
+    tick_lock: InstrumentedLock = field(default_factory=InstrumentedLock)
+    tick_count: int = 0
+    max_bars: int = 10000
+    history: Optional[CompressedTickHistory] = None  # Older ticks, compressed
     
+    def _spill(self, overflow: int) -> None:
+        """Move at least `overflow` of the oldest ring ticks into history (caller holds tick_lock)."""
+        if self.history is None or overflow <= 0:
+            return
+        count = min(len(self.ticks), -(-overflow // BLOCK_SIZE) * BLOCK_SIZE)
+        for start in range(0, count, BLOCK_SIZE):
+            self.history.append(self.ticks.pop_oldest(min(BLOCK_SIZE, count - start)))
+            
     def add_tick(self, tick: Tick) -> None:
-        self.ticks.append(tick)
-        
+        with self.tick_lock:
+            self._spill(len(self.ticks) + 1 - self.ticks.capacity)
+            self.ticks.append_tick(tick)
+            self.tick_count += 1
+            
+    def add_ticks(self, ticks: List[Tick]) -> None:
+        with self.tick_lock:
+            self._spill(len(self.ticks) + len(ticks) - self.ticks.capacity)
+            for tick in ticks:
+                self.ticks.append_tick(tick)
+            self.tick_count += len(ticks)
+            
+    def extend_ticks(
+        self,
+        ts_ms: np.ndarray,
+        price: np.ndarray,
+        quantity: np.ndarray,
+        trade_id: Optional[np.ndarray] = None,
+        side: Optional[np.ndarray] = None,
+    ) -> None:
+        """Append tick columns (pieces no larger than the ring when spilling to history)."""
+        n = len(ts_ms)
+        with self.tick_lock:
+            step = self.ticks.capacity if self.history is not None else max(n, 1)
+            for start in range(0, n, step):
+                piece = slice(start, start + step)
+                count = len(ts_ms[piece])
+                self._spill(len(self.ticks) + count - self.ticks.capacity)
+                self.ticks.extend(
+                    ts_ms[piece], price[piece], quantity[piece],
+                    None if trade_id is None else trade_id[piece],
+                    None if side is None else side[piece],
+                )
+            self.tick_count += n
+            
+    def set_tick_capacity(self, capacity: int) -> None:
+        """Resize the tick ring; ticks that no longer fit move to history."""
+        with self.tick_lock:
+            self._spill(len(self.ticks) - capacity)
+            self.ticks.set_capacity(capacity)
+            
+    def set_history_capacity(self, capacity: int) -> None:
+        """Resize the compressed tier, dropping its oldest blocks beyond `capacity`."""
+        with self.tick_lock:
+            self.history.set_capacity(capacity)
+            
     def add_bar(self, timeframe: str, bar: OHLCVBar) -> None:
-        if timeframe not in self.bars:
-            self.bars[timeframe] = deque(maxlen=10000)
-        self.bars[timeframe].append(bar)
+        buffer = self.bars.get(timeframe)
+        if buffer is None:
+            buffer = self.bars.setdefault(timeframe, BarBuffer(self.max_bars))
+        buffer.append(bar)
+        
+    def revise_bar(self, timeframe: str, bar: OHLCVBar) -> bool:
+        buffer = self.bars.get(timeframe)
+        return buffer is not None and buffer.replace(bar)
+        
+    def get_tick_arrays(self, n: Optional[int] = None, copy: bool = False) -> Dict[str, np.ndarray]:
+        columns = self.ticks.snapshot(n, copy)
+        if columns is None:
+            # Persistent writer overlap: fall back to a short locked read
+            with self.tick_lock:
+                columns = self.ticks.last(n)
+                if copy:
+                    columns = {name: np.array(column) for name, column in columns.items()}
+        return columns
+        
+    def get_ticks_since(self, count: int) -> Tuple[Dict[str, np.ndarray], int]:
+        """Copy the ticks added after the first `count` (those still retained)."""
+        with self.tick_lock:
+            new = self.tick_count - count if count <= self.tick_count else self.tick_count
+            columns = {name: np.array(column) for name, column in self.ticks.last(new).items()}
+            return columns, self.tick_count
+        
+    def get_tick_range(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Copy ticks in [start_ms, end_ms] from compressed history and the ring."""
+        with self.tick_lock:
+            # Ring rows are copied and the block tuple pinned under the lock;
+            # blocks are decoded after releasing it
+            blocks = self.history.blocks if self.history is not None else ()
+            recent = self.ticks.last()
+            ts_ms = recent["ts_ms"]
+            mask = np.ones(len(ts_ms), dtype=bool)
+            if start_ms is not None:
+                mask &= ts_ms >= start_ms
+            if end_ms is not None:
+                mask &= ts_ms <= end_ms
+            recent = {name: column[mask] for name, column in recent.items()}
+        if not blocks:
+            return recent
+        older = self.history.range(start_ms, end_ms, blocks)
+        return {name: np.concatenate((older[name], recent[name])) for name in recent}
         
     def get_ticks(self, n: Optional[int] = None) -> List[Tick]:
-        if n is None:
-            return list(self.ticks)
-        return list(self.ticks)[-n:]
+        return self.ticks.to_ticks(self.symbol, columns=self.get_tick_arrays(n, copy=True))
     
-    def get_bars(self, timeframe: str, n: Optional[int] = None) -> List[OHLCVBar]:
-        if timeframe not in self.bars:
+    def get_bars(
+        self,
+        timeframe: str,
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[OHLCVBar]:
+        buffer = self.bars.get(timeframe)
+        if buffer is None:
             return []
-        bars = list(self.bars[timeframe])
-        if n is None:
-            return bars
-        return bars[-n:]
+        return buffer.to_bars(self.symbol, n, start, end)
 
 
 class MemoryStore:
@@ -47,16 +212,44 @@ class MemoryStore:
     Thread-safe in-memory storage for market data.
     
     Features:
-    - Automatic pruning via deque maxlen
-    - Thread-safe operations
+    - Columnar tick ring buffers and bar buffers with bounded history
+    - Zero-copy pandas reads of bar columns
+    - Incrementally aligned multi-symbol close panels per timeframe
+    - Per-symbol / per-timeframe write locks; lock-free snapshot reads
+    - Lock contention counters (lock_stats)
+    - Optional global memory budget with activity/timeframe-weighted eviction
+    - Optional compressed tier for older ticks with range queries
+    - Optional persistence backend with read-through for older ranges
     - Multi-symbol support
     - Multiple timeframes per symbol
     """
     
+    # Relative retention span per series under a memory budget: a series
+    # with weight 4 keeps about four times the history (in time) of one
+    # with weight 1 at the same activity
+    RETENTION_WEIGHTS: Dict[str, float] = {
+        "ticks": 1.0,
+        "1S": 1.0,
+        "1T": 2.0,
+        "5T": 4.0,
+        "15T": 8.0,
+        "1H": 16.0,
+        "ticks_compressed": 4.0,
+    }
+    MIN_TICKS = 1000        # Per-symbol floor under a budget
+    MIN_BARS = 500          # Per-series floor under a budget
+    REBALANCE_INTERVAL = 5.0
+    _RATE_SMOOTHING = 0.3   # EWMA weight of the latest activity sample
+    _RATE_FLOOR = 1e-3      # Rows/sec assumed for idle series
+    _COMPRESSED_ROW_BYTES = 3.0  # Bytes per compressed tick until measured
+    
     def __init__(
         self,
         max_ticks: int = 100000,
-        max_bars: int = 10000
+        max_bars: int = 10000,
+        backend: Optional[SQLiteStore] = None,
+        memory_budget: Optional[int] = None,
+        compressed_ticks: int = 0
     ):
         """
         Initialize memory store.
@@ -64,148 +257,653 @@ class MemoryStore:
         Args:
             max_ticks: Maximum ticks to retain per symbol
             max_bars: Maximum bars to retain per symbol/timeframe
+            backend: Persistence backend; writes are forwarded to it and
+                range reads older than the in-memory window fall through to it
+            memory_budget: Global limit in bytes for tick, compressed tick,
+                bar and price panel storage. Per-series limits are
+                rebalanced by activity and timeframe (never above
+                max_ticks / max_bars / compressed_ticks). None disables it.
+            compressed_ticks: Maximum older ticks per symbol kept in a
+                delta-compressed tier behind the ring (0 disables it)
         """
+        self._backend = backend
         self._max_ticks = max_ticks
         self._max_bars = max_bars
+        self._memory_budget = memory_budget
+        self._compressed_ticks = compressed_ticks
+        self._activity: Dict[tuple, tuple] = {}  # series -> (row counter, rows/sec)
+        self._last_rebalance = time.monotonic()
+        self._next_rebalance = self._last_rebalance + self.REBALANCE_INTERVAL
+        self._rebalance_lock = InstrumentedLock()
         self._data: Dict[str, SymbolData] = {}
-        self._lock = Lock()
-        self._tick_count = 0
-        self._last_update: Optional[datetime] = None
+        self._panels: Dict[str, PricePanel] = {}  # timeframe -> aligned closes
+        self._lock = InstrumentedLock()  # Guards symbol registration and clear
+        self._cleared_tick_count = 0  # Ticks of symbols removed by clear(symbol)
+        self._last_tick: Optional[Tick] = None
+        
+    def _symbol_data(self, symbol: str) -> SymbolData:
+        """Get or create the container for an upper-case symbol."""
+        data = self._data.get(symbol)
+        if data is None:
+            with self._lock:
+                data = self._data.get(symbol)
+                if data is None:
+                    data = SymbolData(
+                        symbol=symbol,
+                        ticks=TickRingBuffer(self._max_ticks),
+                        max_bars=self._max_bars,
+                        history=(
+                            CompressedTickHistory(self._compressed_ticks)
+                            if self._compressed_ticks > 0 else None
+                        ),
+                    )
+                    self._data[symbol] = data
+        return data
         
     def add_tick(self, tick: Tick) -> None:
         """Add a tick to the store."""
-        with self._lock:
-            symbol = tick.symbol.upper()
-            if symbol not in self._data:
-                self._data[symbol] = SymbolData(symbol=symbol)
-                self._data[symbol].ticks = deque(maxlen=self._max_ticks)
-            self._data[symbol].add_tick(tick)
-            self._tick_count += 1
-            self._last_update = tick.timestamp
+        self._symbol_data(tick.symbol.upper()).add_tick(tick)
+        self._last_tick = tick
+        if self._backend is not None:
+            self._backend.write_ticks([tick])
+        if self._memory_budget is not None and time.monotonic() >= self._next_rebalance:
+            self.rebalance()
             
+    def add_ticks(self, ticks: List[Tick]) -> None:
+        """Add a batch of ticks, taking each symbol's lock once."""
+        if not ticks:
+            return
+        groups: Dict[str, List[Tick]] = {}
+        for tick in ticks:
+            groups.setdefault(tick.symbol.upper(), []).append(tick)
+        for symbol, group in groups.items():
+            self._symbol_data(symbol).add_ticks(group)
+        self._last_tick = ticks[-1]
+        if self._backend is not None:
+            self._backend.write_ticks(ticks)
+        if self._memory_budget is not None and time.monotonic() >= self._next_rebalance:
+            self.rebalance()
+            
+    def add_tick_chunk(self, chunk: TickChunk) -> None:
+        """Add a columnar chunk of ticks with vectorized copies per symbol."""
+        if not len(chunk):
+            return
+        for code, symbol in enumerate(chunk.symbols):
+            mask = chunk.symbol_codes == code
+            data = self._symbol_data(symbol.upper())
+            data.extend_ticks(chunk.ts_ms[mask], chunk.price[mask], chunk.quantity[mask])
+        last = len(chunk) - 1
+        self._last_tick = Tick(
+            chunk.symbols[chunk.symbol_codes[last]], None,
+            float(chunk.price[last]), float(chunk.quantity[last]),
+            ts_ms=int(chunk.ts_ms[last]),
+        )
+        if self._backend is not None:
+            self._backend.write_tick_chunk(chunk)
+        if self._memory_budget is not None and time.monotonic() >= self._next_rebalance:
+            self.rebalance()
+            
+    def _build_panel(self, timeframe: str) -> PricePanel:
+        panel = PricePanel(self._max_bars)
+        for symbol, data in list(self._data.items()):
+            buffer = data.bars.get(timeframe)
+            if buffer is not None:
+                columns = buffer.columns()
+                panel.merge(symbol, columns["timestamp"], columns["close"])
+        return panel
+        
+    def _panel(self, timeframe: str) -> PricePanel:
+        """
+        Get the close panel of a timeframe, building it from bar buffers on first use.
+        
+        Only clock timeframes keep a maintained panel. Information bars
+        (e.g. "tick_500") never share timestamps across symbols, so their
+        panel is built per query instead.
+        """
+        if not _is_time_key(timeframe):
+            return self._build_panel(timeframe)
+        panel = self._panels.get(timeframe)
+        if panel is None:
+            with self._lock:
+                panel = self._panels.get(timeframe)
+                if panel is None:
+                    panel = self._panels[timeframe] = self._build_panel(timeframe)
+        return panel
+        
     def add_bar(self, bar: OHLCVBar, timeframe: str) -> None:
         """Add an OHLCV bar to the store."""
-        with self._lock:
-            symbol = bar.symbol.upper()
-            if symbol not in self._data:
-                self._data[symbol] = SymbolData(symbol=symbol)
-            if timeframe not in self._data[symbol].bars:
-                self._data[symbol].bars[timeframe] = deque(maxlen=self._max_bars)
-            self._data[symbol].add_bar(timeframe, bar)
+        symbol = bar.symbol.upper()
+        self._symbol_data(symbol).add_bar(timeframe, bar)
+        if _is_time_key(timeframe):
+            self._panel(timeframe).update(symbol, bar.timestamp, bar.close)
+        if self._backend is not None:
+            self._backend.write_bar(bar, timeframe)
+        if self._memory_budget is not None and time.monotonic() >= self._next_rebalance:
+            self.rebalance()
+            
+    def revise_bar(self, bar: OHLCVBar, timeframe: str) -> bool:
+        """
+        Replace a stored bar with an amended version (e.g. after a late tick).
+        
+        The bar with the same timestamp is replaced in the bar buffer and
+        the price panel, and the persistence backend upserts it.
+        
+        Returns:
+            False if the bar is no longer retained (nothing is changed)
+        """
+        symbol = bar.symbol.upper()
+        data = self._data.get(symbol)
+        if data is None or not data.revise_bar(timeframe, bar):
+            return False
+        if _is_time_key(timeframe):
+            self._panel(timeframe).update(symbol, bar.timestamp, bar.close)
+        if self._backend is not None:
+            self._backend.write_bar(bar, timeframe)
+        return True
+            
+    def add_bar_columns(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]) -> None:
+        """Add a batch of completed bars given as columns (BarBuffer layout)."""
+        if not len(columns["timestamp"]):
+            return
+        symbol = symbol.upper()
+        data = self._symbol_data(symbol)
+        buffer = data.bars.get(timeframe)
+        if buffer is None:
+            buffer = data.bars.setdefault(timeframe, BarBuffer(self._max_bars))
+        buffer.extend(columns)
+        if _is_time_key(timeframe):
+            self._panel(timeframe).merge(symbol, columns["timestamp"], columns["close"])
+        if self._backend is not None:
+            self._backend.write_bar_columns(symbol, timeframe, columns)
+        if self._memory_budget is not None and time.monotonic() >= self._next_rebalance:
+            self.rebalance()
             
+    def load_bars_from_backend(self) -> int:
+        """
+        Fill bar buffers with the most recent persisted bars (e.g. at startup).
+        
+        Returns:
+            Number of bars loaded
+        """
+        if self._backend is None:
+            return 0
+        loaded = 0
+        for symbol, timeframe in self._backend.bar_series_keys():
+            columns = self._backend.read_bars(symbol, timeframe, n=self._max_bars)
+            self.restore_bars(symbol, timeframe, columns)
+            loaded += len(columns["timestamp"])
+        return loaded
+            
+    def restore_ticks(self, symbol: str, columns: Dict[str, np.ndarray], tick_count: int) -> None:
+        """
+        Load tick columns into an empty symbol (warm start); not forwarded
+        to the backend.
+        
+        Args:
+            symbol: Symbol the ticks belong to
+            columns: Tick columns as returned by get_tick_arrays
+            tick_count: Total ticks seen for the symbol, including evicted ones
+        """
+        data = self._symbol_data(symbol.upper())
+        data.extend_ticks(
+            columns["ts_ms"], columns["price"], columns["quantity"],
+            columns.get("trade_id"), columns.get("side"),
+        )
+        with data.tick_lock:
+            data.tick_count = tick_count
+        if len(columns["ts_ms"]):
+            ts_ms = int(columns["ts_ms"][-1])
+            last = self._last_tick
+            if last is None or ts_ms > last.ts_ms:
+                self._last_tick = Tick(symbol.upper(), None, float(columns["price"][-1]), 0.0, ts_ms=ts_ms)
+                
+    def restore_bars(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]) -> None:
+        """Load bar columns into a series (warm start); not forwarded to the backend."""
+        data = self._symbol_data(symbol.upper())
+        buffer = data.bars.setdefault(timeframe, BarBuffer(self._max_bars))
+        buffer.extend(columns)
+        panel = self._panels.get(timeframe)
+        if panel is not None:
+            panel.merge(symbol.upper(), columns["timestamp"], columns["close"])
+        
     def get_ticks(self, symbol: str, n: Optional[int] = None) -> List[Tick]:
         """Get ticks for a symbol."""
-        with self._lock:
-            symbol = symbol.upper()
-            if symbol not in self._data:
-                return []
-            return self._data[symbol].get_ticks(n)
+        data = self._data.get(symbol.upper())
+        if data is None:
+            return []
+        return data.get_ticks(n)
+            
+    def get_tick_arrays(
+        self,
+        symbol: str,
+        n: Optional[int] = None,
+        copy: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get the most recent ticks as columns (ts_ms, price, quantity, trade_id, side).
+        
+        Without copy, arrays may be read-only views into the ring buffer
+        that later ingestion can overwrite once the buffer wraps.
+        """
+        data = self._data.get(symbol.upper())
+        if data is None:
+            return {}
+        return data.get_tick_arrays(n, copy)
             
     def get_bars(
         self,
         symbol: str,
         timeframe: str,
-        n: Optional[int] = None
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
     ) -> List[OHLCVBar]:
-        """Get OHLCV bars for a symbol and timeframe."""
-        with self._lock:
-            symbol = symbol.upper()
-            if symbol not in self._data:
-                return []
-            return self._data[symbol].get_bars(timeframe, n)
+        """
+        Get OHLCV bars for a symbol and timeframe.
+        
+        start/end are inclusive bounds on the bar timestamp; naive values
+        are IST like the stored bars, aware values are converted. The
+        range is located by binary search, so only the slice is copied.
+        """
+        columns = self._bar_columns(symbol.upper(), timeframe, n, start, end)
+        if columns is None:
+            return []
+        return columns_to_bars(columns, symbol.upper())
+        
+    def _bar_buffer(self, symbol: str, timeframe: str) -> Optional[BarBuffer]:
+        """Look up a non-empty bar buffer without locking."""
+        data = self._data.get(symbol)
+        if data is None:
+            return None
+        buffer = data.bars.get(timeframe)
+        if buffer is None or not len(buffer):
+            return None
+        return buffer
+    
+    def _bar_columns(
+        self,
+        symbol: str,
+        timeframe: str,
+        n: Optional[int],
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Resolve a bar query to columns, reading through to the backend when
+        the range starts before the oldest bar held in memory.
+        """
+        start, end = _as_naive_ist(start), _as_naive_ist(end)
+        buffer = self._bar_buffer(symbol, timeframe)
+        memory = buffer.columns(n, start, end) if buffer is not None else None
+        if self._backend is None or start is None:
+            return memory
+        
+        oldest = buffer.first_timestamp if buffer is not None else None
+        if oldest is not None and np.datetime64(start, "ns") >= oldest:
+            return memory
+        if n is not None and memory is not None and len(memory["timestamp"]) >= n:
+            return memory
+        
+        older = self._backend.read_bars(symbol, timeframe, start, end, before=oldest)
+        if not len(older["timestamp"]):
+            return memory
+        merged = concat_bar_columns(older, memory) if memory is not None else older
+        if n is not None:
+            merged = {name: column[-n:] if n > 0 else column[:0] for name, column in merged.items()}
+        return merged
             
+    def get_bar_arrays(
+        self,
+        symbol: str,
+        timeframe: str,
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Get in-memory bars as read-only column views (None if no series)."""
+        buffer = self._bar_buffer(symbol, timeframe)
+        if buffer is None:
+            return None
+        return buffer.columns(n, _as_naive_ist(start), _as_naive_ist(end))
+        
+    def get_tick_range(
+        self,
+        symbol: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get ticks in a time range as columns, decompressing older history
+        on demand.
+        
+        Args:
+            symbol: Symbol to query
+            start: Earliest tick time (inclusive, naive IST or tz-aware)
+            end: Latest tick time (inclusive)
+        """
+        data = self._data.get(symbol.upper())
+        if data is None:
+            return {}
+        start, end = _as_naive_ist(start), _as_naive_ist(end)
+        return data.get_tick_range(
+            ist_to_epoch_ms(start) if start is not None else None,
+            ist_to_epoch_ms(end) if end is not None else None,
+        )
+        
+    def get_ticks_since(self, symbol: str, count: int) -> Tuple[Dict[str, np.ndarray], int]:
+        """
+        Get ticks added after the first `count` ticks of a symbol.
+        
+        Returns:
+            (tick columns, current tick count); pass the count back on the
+            next call to receive only newer ticks
+        """
+        data = self._data.get(symbol.upper())
+        if data is None:
+            return {}, 0
+        return data.get_ticks_since(count)
+        
     def get_prices(
         self,
         symbol: str,
         timeframe: str,
-        n: Optional[int] = None
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
     ) -> pd.Series:
-        """Get close prices as a pandas Series."""
-        bars = self.get_bars(symbol, timeframe, n)
-        if not bars:
+        """Get close prices as a pandas Series (wraps stored arrays, no copy)."""
+        columns = self._bar_columns(symbol.upper(), timeframe, n, start, end)
+        if columns is None:
             return pd.Series(dtype=float)
-        return pd.Series(
-            [bar.close for bar in bars],
-            index=[bar.timestamp for bar in bars],
-            name=symbol
-        )
+        return columns_to_prices(columns, symbol)
         
     def get_dataframe(
         self,
         symbol: str,
         timeframe: str,
-        n: Optional[int] = None
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
     ) -> pd.DataFrame:
-        """Get OHLCV data as a pandas DataFrame."""
-        bars = self.get_bars(symbol, timeframe, n)
-        if not bars:
-            return pd.DataFrame(columns=[
-                "open", "high", "low", "close", "volume", "vwap", "trade_count"
-            ])
-        data = [bar.to_dict() for bar in bars]
-        df = pd.DataFrame(data)
-        df.set_index("timestamp", inplace=True)
+        """Get OHLCV data as a pandas DataFrame (wraps stored arrays, no copy)."""
+        symbol = symbol.upper()
+        columns = self._bar_columns(symbol, timeframe, n, start, end)
+        if columns is None:
+            columns = empty_bar_columns()  # Same schema as a non-empty result
+        df = columns_to_dataframe(columns)
+        df.insert(0, "symbol", symbol)
         return df
         
+    def get_aligned_prices(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        dropna: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get closes of several symbols on their shared time grid.
+        
+        Args:
+            symbols: Symbols in the desired column order
+            timeframe: Timeframe key
+            n: Number of most recent rows
+            start: Earliest bar timestamp (inclusive)
+            end: Latest bar timestamp (inclusive)
+            dropna: Keep only rows where every symbol has a price
+            
+        Returns:
+            (timestamps, values) with values shaped (rows, len(symbols))
+        """
+        return self._panel(timeframe).aligned(
+            [symbol.upper() for symbol in symbols], n,
+            _as_naive_ist(start), _as_naive_ist(end), dropna,
+        )
+        
     def get_multi_symbol_prices(
         self,
         symbols: List[str],
         timeframe: str,
-        n: Optional[int] = None
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        dropna: bool = False
     ) -> pd.DataFrame:
-        """Get close prices for multiple symbols as aligned DataFrame."""
-        data = {}
-        for symbol in symbols:
-            prices = self.get_prices(symbol, timeframe, n)
-            if not prices.empty:
-                data[symbol] = prices
-                
-        if not data:
-            return pd.DataFrame()
+        """
+        Get close prices for multiple symbols as aligned DataFrame.
+        
+        Served from the incrementally maintained close panel. Ranges older
+        than the in-memory window fall back to joining per-symbol series
+        read through the backend.
+        
+        Args:
+            dropna: Keep only timestamps where every symbol has a close
+        """
+        start, end = _as_naive_ist(start), _as_naive_ist(end)
+        panel = self._panel(timeframe)
+        oldest = panel.first_timestamp
+        if self._backend is not None and start is not None and (
+            oldest is None or np.datetime64(start, "ns") < oldest
+        ):
+            data = {}
+            for symbol in symbols:
+                prices = self.get_prices(symbol, timeframe, None, start, end)
+                if not prices.empty:
+                    data[symbol] = prices
+            if not data:
+                return pd.DataFrame()
+            df = pd.DataFrame(data)
+            df = df.dropna() if dropna else df
+            return df.iloc[-n:] if n is not None else df
             
-        return pd.DataFrame(data)
+        present = [symbol for symbol in symbols if symbol.upper() in panel.symbols]
+        if not present:
+            return pd.DataFrame()
+        df = panel.dataframe([symbol.upper() for symbol in present], n, start, end, dropna)
+        df.columns = present
+        return df
         
     @property
     def symbols(self) -> List[str]:
         """Get list of symbols in store."""
-        with self._lock:
-            return list(self._data.keys())
+        return list(self._data.keys())
+            
+    def bar_series_keys(self) -> List[Tuple[str, str]]:
+        """List in-memory (symbol, timeframe) pairs."""
+        return [
+            (symbol, timeframe)
+            for symbol, data in list(self._data.items())
+            for timeframe in list(data.bars)
+        ]
             
     @property
     def tick_count(self) -> int:
         """Get total tick count."""
-        return self._tick_count
+        return self._cleared_tick_count + sum(
+            data.tick_count for data in list(self._data.values())
+        )
     
     @property
     def last_update(self) -> Optional[datetime]:
         """Get timestamp of last update."""
-        return self._last_update
+        tick = self._last_tick
+        return tick.timestamp if tick is not None else None
         
     def bar_count(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> Dict:
         """Get bar counts."""
-        with self._lock:
-            if symbol:
-                symbol = symbol.upper()
-                if symbol in self._data:
-                    if timeframe:
-                        return {timeframe: len(self._data[symbol].bars.get(timeframe, []))}
-                    return {tf: len(bars) for tf, bars in self._data[symbol].bars.items()}
+        if symbol:
+            data = self._data.get(symbol.upper())
+            if data is None:
                 return {}
-            return {
-                s: {tf: len(bars) for tf, bars in data.bars.items()}
-                for s, data in self._data.items()
+            if timeframe:
+                return {timeframe: len(data.bars.get(timeframe, []))}
+            return {tf: len(bars) for tf, bars in list(data.bars.items())}
+        return {
+            s: {tf: len(bars) for tf, bars in list(data.bars.items())}
+            for s, data in list(self._data.items())
+        }
+        
+    def _series(self) -> List[tuple]:
+        """(symbol, series name, SymbolData, buffer) for ticks, compressed ticks and every bar series."""
+        series = []
+        for symbol, data in list(self._data.items()):
+            series.append((symbol, "ticks", data, data.ticks))
+            if data.history is not None:
+                series.append((symbol, "ticks_compressed", data, data.history))
+            for timeframe, buffer in list(data.bars.items()):
+                series.append((symbol, timeframe, data, buffer))
+        return series
+        
+    def _row_bytes(self, name: str, buffer: Any) -> float:
+        """Bytes per row of a series as budgeted by rebalance."""
+        if name == "ticks":
+            return TICK_ROW_BYTES
+        if name == "ticks_compressed":
+            rows = len(buffer)
+            return buffer.nbytes / rows if rows else self._COMPRESSED_ROW_BYTES
+        # Bar buffers may allocate up to twice their capacity
+        return 2 * BAR_ROW_BYTES
+        
+    def rebalance(self) -> None:
+        """
+        Re-split the memory budget across tick and bar series.
+        
+        Each series gets bytes in proportion to its recent append rate
+        times its retention weight, so every series keeps roughly the same
+        time span (scaled by weight): a busy symbol gets more rows than a
+        quiet one. The compressed tick tier is budgeted like a series fed
+        at the tick rate, and price panels are paid for first. Floors
+        (MIN_TICKS / MIN_BARS) keep short analytics windows usable;
+        max_ticks / max_bars / compressed_ticks cap each series.
+        Shrinking a series evicts its oldest rows and frees the memory.
+        Called automatically every REBALANCE_INTERVAL seconds from the
+        write path.
+        """
+        if self._memory_budget is None or not self._rebalance_lock.acquire(False):
+            return
+        try:
+            now = time.monotonic()
+            elapsed = max(now - self._last_rebalance, 1e-3)
+            self._last_rebalance = now
+            self._next_rebalance = now + self.REBALANCE_INTERVAL
+            
+            series = self._series()
+            weights, floors, caps, row_sizes = [], [], [], []
+            for symbol, name, data, buffer in series:
+                row_bytes = self._row_bytes(name, buffer)
+                if name == "ticks":
+                    counter, floor, cap = data.tick_count, self.MIN_TICKS, self._max_ticks
+                elif name == "ticks_compressed":
+                    # Fed by ticks leaving the ring, so at the tick rate
+                    counter, floor, cap = data.tick_count, 0, self._compressed_ticks
+                else:
+                    counter, floor, cap = buffer.version, self.MIN_BARS, self._max_bars
+                previous = self._activity.get((symbol, name))
+                if previous is None:
+                    rate = counter / elapsed
+                else:
+                    last_counter, last_rate = previous
+                    sample = max(counter - last_counter, 0) / elapsed
+                    rate = self._RATE_SMOOTHING * sample + (1 - self._RATE_SMOOTHING) * last_rate
+                self._activity[(symbol, name)] = (counter, rate)
+                
+                retention = self.RETENTION_WEIGHTS.get(name, 1.0)
+                weights.append(max(rate, self._RATE_FLOOR) * retention * row_bytes)
+                floors.append(floor * row_bytes)
+                caps.append(cap * row_bytes)
+                row_sizes.append(row_bytes)
+                
+            # Price panels are sized by max_bars, not rebalanced; pay for them first
+            panel_bytes = sum(panel.nbytes for panel in list(self._panels.values()))
+            budget = max(self._memory_budget - panel_bytes, 0)
+            alloc = _water_fill(budget, weights, floors, caps)
+            over_budget = sum(buffer.nbytes for _, _, _, buffer in series) > budget
+            for (symbol, name, data, buffer), share, cap, row_bytes in zip(series, alloc, caps, row_sizes):
+                capacity = int(share // row_bytes)
+                if name != "ticks_compressed":
+                    capacity = max(1, capacity)
+                # Hysteresis: within budget, skip small adjustments that would only churn memory
+                small = abs(capacity - buffer.capacity) <= buffer.capacity // 10
+                if small and not over_budget and share < cap:
+                    continue
+                if name == "ticks":
+                    data.set_tick_capacity(capacity)
+                elif name == "ticks_compressed":
+                    data.set_history_capacity(capacity)
+                else:
+                    buffer.set_capacity(capacity)
+        finally:
+            self._rebalance_lock.release()
+            
+    def memory_usage(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Get memory accounting per symbol and series.
+        
+        Returns:
+            symbol -> series ("ticks", "ticks_compressed" or timeframe) ->
+            {"rows", "capacity", "bytes" (allocated), "rate" (rows/sec at
+            the last rebalance)}
+        """
+        usage: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for symbol, name, _, buffer in self._series():
+            _, rate = self._activity.get((symbol, name), (0, 0.0))
+            usage.setdefault(symbol, {})[name] = {
+                "rows": len(buffer),
+                "capacity": buffer.capacity,
+                "bytes": buffer.nbytes,
+                "rate": rate,
             }
+        return usage
+        
+    @property
+    def memory_bytes(self) -> int:
+        """Total bytes allocated for ticks, bars, compressed ticks and price panels."""
+        return (
+            sum(buffer.nbytes for _, _, _, buffer in self._series())
+            + sum(panel.nbytes for panel in list(self._panels.values()))
+        )
+        
+    @property
+    def memory_budget(self) -> Optional[int]:
+        """Global memory budget in bytes (None if unlimited)."""
+        return self._memory_budget
+        
+    def lock_stats(self) -> Dict[str, Any]:
+        """
+        Get lock contention counters.
+        
+        Returns:
+            Dict with "registry", "ticks", "bars" and "panels" lock counters
+            (acquisitions, contentions, wait_ms) summed across symbols and
+            timeframes, plus lock-free tick "snapshot_retries"
+        """
+        symbol_data = list(self._data.values())
+        return {
+            "registry": self._lock.stats(),
+            "ticks": merge_lock_stats(data.tick_lock for data in symbol_data),
+            "bars": merge_lock_stats(
+                buffer.lock for data in symbol_data for buffer in list(data.bars.values())
+            ),
+            "panels": merge_lock_stats(panel.lock for panel in list(self._panels.values())),
+            "snapshot_retries": sum(data.ticks.snapshot_retries for data in symbol_data),
+        }
             
     def clear(self, symbol: Optional[str] = None) -> None:
         """Clear data from the store."""
         with self._lock:
             if symbol:
-                symbol = symbol.upper()
-                if symbol in self._data:
-                    del self._data[symbol]
+                data = self._data.pop(symbol.upper(), None)
+                if data is not None:
+                    self._cleared_tick_count += data.tick_count
+                self._panels = {}  # Rebuilt from the remaining symbols on next use
             else:
-                self._data.clear()
-                self._tick_count = 0
+                # Swap in a fresh dict so lock-free readers never see it mutate mid-iteration
+                self._data = {}
+                self._cleared_tick_count = 0
+                self._activity = {}
+                self._panels = {}
                 
     def export_to_csv(
         self,
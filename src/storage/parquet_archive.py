@@ -0,0 +1,425 @@
+"""
+Partitioned Parquet archive for long bar and tick histories
+"""
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+
+from ..ingestion.data_normalizer import IST, ist_to_epoch_ms
+from .bar_buffer import BAR_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+# Offset added to UTC epoch ms to get naive IST epoch ms (partition dates are IST)
+_IST_OFFSET_MS = int(IST.utcoffset(None) / timedelta(milliseconds=1))
+_MS_PER_DAY = 86_400_000
+
+# Tick columns written to the archive (from MemoryStore tick arrays)
+ARCHIVE_TICK_COLUMNS = ["ts_ms", "price", "quantity", "trade_id", "side"]
+
+
+def _as_naive_ist(timestamp: Optional[datetime]) -> Optional[datetime]:
+    if timestamp is None or timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(IST).replace(tzinfo=None)
+
+
+def _split_by_day(days: np.ndarray) -> Iterator[Tuple[date, slice]]:
+    """Yield (day, row slice) runs of a sorted datetime64[D] array."""
+    if not len(days):
+        return
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    ends = np.r_[starts[1:], len(days)]
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        yield days[start].astype(date), slice(start, end)
+
+
+class ParquetArchive:
+    """
+    Parquet archive of completed bars and ticks, partitioned Hive-style:
+
+        <root>/bars/symbol=BTCUSDT/timeframe=1T/date=2025-12-15/part-*.parquet
+        <root>/ticks/symbol=BTCUSDT/date=2025-12-15/part-*.parquet
+
+    Dates are IST calendar days, matching the store's naive IST timestamps.
+    Each flush adds new part files, written to a temporary name and
+    renamed so readers never see partial files. Once a series has data
+    for a later day, the part files of the earlier days are compacted
+    into one file each (see compact_partition). Readers skip date
+    partitions outside the requested range, read only the requested
+    columns, and push the time filter down to Parquet row-group statistics.
+
+    Usage:
+        archive = ParquetArchive("archive")
+        archive.start(store, interval=60)   # or archive.archive_store(store)
+        df = archive.read_bars("BTCUSDT", "1T", start, end)
+    """
+
+    def __init__(self, root: str, compression: str = "zstd"):
+        """
+        Initialize archive.
+
+        Args:
+            root: Archive root directory
+            compression: Parquet compression codec
+        """
+        if pa is None:
+            raise ImportError("pyarrow package is required. Install with: pip install pyarrow")
+        self._root = root
+        self._compression = compression
+        self._part_seq = 0
+
+        # Archive progress per series, so each flush writes only new rows
+        self._bar_marks: Dict[Tuple[str, str], np.datetime64] = {}
+        self._tick_counts: Dict[str, int] = {}
+
+        # Series dir -> date partitions written since they were last compacted
+        # (a series seen for the first time has every partition checked)
+        self._unmerged: Dict[str, Set[str]] = {}
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._write_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _series_dir(self, kind: str, symbol: str, timeframe: Optional[str] = None) -> str:
+        parts = [self._root, kind, f"symbol={symbol.upper()}"]
+        if timeframe is not None:
+            parts.append(f"timeframe={timeframe}")
+        return os.path.join(*parts)
+
+    def _date_dirs(
+        self,
+        series_dir: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[str]:
+        """Date partitions of a series within [start, end], oldest first."""
+        if not os.path.isdir(series_dir):
+            return []
+        dirs = []
+        for name in sorted(os.listdir(series_dir)):
+            if not name.startswith("date="):
+                continue
+            day = date.fromisoformat(name[5:])
+            if (start is None or day >= start) and (end is None or day <= end):
+                dirs.append(os.path.join(series_dir, name))
+        return dirs
+
+    @staticmethod
+    def _part_files(date_dir: str) -> List[str]:
+        return [
+            os.path.join(date_dir, name)
+            for name in sorted(os.listdir(date_dir))
+            if name.endswith(".parquet")
+        ]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _write_part(self, date_dir: str, columns: Dict[str, np.ndarray]) -> None:
+        self._write_table(date_dir, pa.table({name: pa.array(column) for name, column in columns.items()}))
+
+    def _write_table(self, date_dir: str, table: "pa.Table") -> None:
+        os.makedirs(date_dir, exist_ok=True)
+        self._part_seq += 1
+        filename = f"part-{time.time_ns()}-{self._part_seq:06d}.parquet"
+        path = os.path.join(date_dir, filename)
+        tmp_path = path + ".tmp"
+        pq.write_table(table, tmp_path, compression=self._compression)
+        os.replace(tmp_path, path)
+        series_dir = os.path.dirname(date_dir)
+        if series_dir in self._unmerged:
+            self._unmerged[series_dir].add(date_dir)
+
+    def write_bars(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Append bar columns (BarBuffer layout, sorted by timestamp).
+
+        Returns:
+            Number of bars written
+        """
+        timestamps = columns["timestamp"]
+        series_dir = self._series_dir("bars", symbol, timeframe)
+        with self._write_lock:
+            for day, rows in _split_by_day(timestamps.astype("datetime64[D]")):
+                self._write_part(
+                    os.path.join(series_dir, f"date={day.isoformat()}"),
+                    {name: columns[name][rows] for name in BAR_COLUMNS},
+                )
+        return len(timestamps)
+
+    def write_ticks(self, symbol: str, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Append tick columns (ts_ms, price, quantity[, trade_id, side]).
+
+        Returns:
+            Number of ticks written
+        """
+        ts_ms = columns["ts_ms"]
+        names = [name for name in ARCHIVE_TICK_COLUMNS if name in columns]
+        days = ((ts_ms + _IST_OFFSET_MS) // _MS_PER_DAY).astype("datetime64[D]")
+        series_dir = self._series_dir("ticks", symbol)
+        with self._write_lock:
+            for day, rows in _split_by_day(days):
+                self._write_part(
+                    os.path.join(series_dir, f"date={day.isoformat()}"),
+                    {name: columns[name][rows] for name in names},
+                )
+        return len(ts_ms)
+
+    def _last_archived(self, kind: str, symbol: str, timeframe: Optional[str], column: str):
+        """Largest value of `column` in the newest date partition (None if empty)."""
+        dirs = self._date_dirs(self._series_dir(kind, symbol, timeframe))
+        if not dirs:
+            return None
+        files = self._part_files(dirs[-1])
+        if not files:
+            return None
+        table = pq.read_table(files, columns=[column])
+        return pc.max(table.column(column)).as_py() if table.num_rows else None
+
+    def compact_partition(self, date_dir: str, key: str, dedupe: bool = False) -> None:
+        """
+        Rewrite the part files of one date partition as a single file sorted by `key`.
+
+        Args:
+            date_dir: Date partition directory
+            key: Sort column ("timestamp" for bars, "ts_ms" for ticks)
+            dedupe: Keep only the last written row per key (bars re-written
+                by a later flush)
+        """
+        with self._write_lock:
+            files = self._part_files(date_dir)
+            if len(files) < 2:
+                return
+            # Parts are read in write order and the sort is stable
+            table = pq.read_table(files)
+            table = table.take(pc.sort_indices(table, sort_keys=[(key, "ascending")]))
+            if dedupe and table.num_rows:
+                keys = table.column(key).to_numpy()
+                table = table.filter(pa.array(np.r_[keys[1:] != keys[:-1], True]))
+            self._write_table(date_dir, table)
+            for path in files:
+                os.remove(path)
+
+    def _compact_series(self, series_dir: str, key: str, dedupe: bool) -> None:
+        """Compact the written partitions of a series, except its newest (still open) day."""
+        pending = self._unmerged.get(series_dir)
+        if pending is None:
+            pending = self._unmerged[series_dir] = set(self._date_dirs(series_dir))
+        if not pending:
+            return
+        newest = self._date_dirs(series_dir)[-1]
+        for date_dir in sorted(pending):
+            if date_dir != newest:
+                self.compact_partition(date_dir, key, dedupe)
+        pending.intersection_update([newest])
+
+    def archive_store(self, store) -> int:
+        """
+        Write bars and ticks added to a MemoryStore since the last call.
+
+        Args:
+            store: MemoryStore to archive
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        for symbol, timeframe in store.bar_series_keys():
+            key = (symbol, timeframe)
+            mark = self._bar_marks.get(key)
+            if mark is None:
+                last = self._last_archived("bars", symbol, timeframe, "timestamp")
+                mark = np.datetime64(last, "ns") if last is not None else None
+            columns = store.get_bar_arrays(symbol, timeframe)
+            if columns is None or not len(columns["timestamp"]):
+                continue
+            if mark is not None:
+                first = int(np.searchsorted(columns["timestamp"], mark, side="right"))
+                columns = {name: column[first:] for name, column in columns.items()}
+            if len(columns["timestamp"]):
+                written += self.write_bars(symbol, timeframe, columns)
+                self._bar_marks[key] = columns["timestamp"][-1]
+            self._compact_series(self._series_dir("bars", symbol, timeframe), "timestamp", dedupe=True)
+
+        for symbol in store.symbols:
+            columns, count = store.get_ticks_since(symbol, self._tick_counts.get(symbol, 0))
+            first_flush = symbol not in self._tick_counts
+            self._tick_counts[symbol] = count
+            if not columns or not len(columns["ts_ms"]):
+                continue
+            if first_flush:
+                # After a restart, skip ticks that are already archived
+                mark = self._last_archived("ticks", symbol, None, "ts_ms")
+                if mark is not None:
+                    keep = columns["ts_ms"] > mark
+                    columns = {name: column[keep] for name, column in columns.items()}
+            if len(columns["ts_ms"]):
+                written += self.write_ticks(symbol, columns)
+            self._compact_series(self._series_dir("ticks", symbol), "ts_ms", dedupe=False)
+        return written
+
+    def start(self, store, interval: float = 60.0) -> None:
+        """Archive `store` every `interval` seconds in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                try:
+                    self.archive_store(store)
+                except Exception as e:
+                    logger.error(f"Archive flush error: {e}")
+            self.archive_store(store)  # Final flush
+
+        self._thread = threading.Thread(target=run, daemon=True, name="Parquet-Archive")
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Run a final flush and stop the background thread."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _read(
+        self,
+        dirs: List[str],
+        columns: List[str],
+        key: str,
+        lo,
+        hi,
+    ) -> Optional["pa.Table"]:
+        filters = []
+        if lo is not None:
+            filters.append((key, ">=", lo))
+        if hi is not None:
+            filters.append((key, "<=", hi))
+        files = [path for date_dir in dirs for path in self._part_files(date_dir)]
+        if not files:
+            return None
+        try:
+            table = pq.read_table(files, columns=columns, filters=filters or None)
+        except FileNotFoundError:
+            # A compaction replaced some parts after they were listed
+            files = [path for date_dir in dirs for path in self._part_files(date_dir)]
+            table = pq.read_table(files, columns=columns, filters=filters or None)
+        return table if table.num_rows else None
+
+    def read_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read archived bars as a DataFrame indexed by timestamp.
+
+        Args:
+            symbol: Symbol to read
+            timeframe: Timeframe key
+            start: Earliest bar timestamp (inclusive)
+            end: Latest bar timestamp (inclusive)
+            columns: Value columns to load (None for all OHLCV columns)
+        """
+        start, end = _as_naive_ist(start), _as_naive_ist(end)
+        dirs = self._date_dirs(
+            self._series_dir("bars", symbol, timeframe),
+            start.date() if start is not None else None,
+            end.date() if end is not None else None,
+        )
+        names = ["timestamp"] + [name for name in (columns or BAR_COLUMNS) if name != "timestamp"]
+        table = self._read(dirs, names, "timestamp", start, end)
+        if table is None:
+            return pd.DataFrame(columns=names[1:], index=pd.DatetimeIndex([], name="timestamp"))
+        df = table.to_pandas().set_index("timestamp").sort_index(kind="stable")
+        # A bar re-written by a later flush replaces the earlier copy
+        return df[~df.index.duplicated(keep="last")]
+
+    def read_prices(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Read archived close prices of several symbols as an aligned DataFrame."""
+        data = {}
+        for symbol in symbols:
+            close = self.read_bars(symbol, timeframe, start, end, columns=["close"])["close"]
+            if not close.empty:
+                data[symbol] = close
+        return pd.DataFrame(data) if data else pd.DataFrame()
+
+    def read_ticks(
+        self,
+        symbol: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read archived ticks as a DataFrame indexed by naive IST timestamp.
+
+        Args:
+            symbol: Symbol to read
+            start: Earliest tick time (inclusive)
+            end: Latest tick time (inclusive)
+            columns: Columns to load besides ts_ms (None for all)
+        """
+        start, end = _as_naive_ist(start), _as_naive_ist(end)
+        dirs = self._date_dirs(
+            self._series_dir("ticks", symbol),
+            start.date() if start is not None else None,
+            end.date() if end is not None else None,
+        )
+        names = ["ts_ms"] + [name for name in (columns or ARCHIVE_TICK_COLUMNS) if name != "ts_ms"]
+        table = self._read(
+            dirs, names, "ts_ms",
+            ist_to_epoch_ms(start) if start is not None else None,
+            ist_to_epoch_ms(end) if end is not None else None,
+        )
+        if table is None:
+            return pd.DataFrame(columns=names, index=pd.DatetimeIndex([], name="timestamp"))
+        df = table.to_pandas()
+        df.index = pd.DatetimeIndex(
+            (df["ts_ms"].to_numpy() + _IST_OFFSET_MS).astype("datetime64[ms]"), name="timestamp"
+        )
+        return df.sort_index(kind="stable")
+
+    def symbols(self, kind: str = "bars") -> List[str]:
+        """Symbols with archived data of the given kind ("bars" or "ticks")."""
+        kind_dir = os.path.join(self._root, kind)
+        if not os.path.isdir(kind_dir):
+            return []
+        return sorted(name[7:] for name in os.listdir(kind_dir) if name.startswith("symbol="))
@@ -0,0 +1,198 @@
+"""
+Time-aligned multi-symbol close price panel
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .locks import InstrumentedLock
+
+
+class PricePanel:
+    """
+    Close prices of every symbol for one timeframe on a shared time grid.
+
+    Rows are bar timestamps (sorted), columns are symbols, and missing
+    prices are NaN. Each new bar fills its cell: a timestamp newer than
+    the last row appends a row, an existing timestamp is overwritten in
+    place, and a late timestamp is inserted. Readers therefore get an
+    already-aligned 2-D array instead of re-joining per-symbol series on
+    every refresh.
+
+    Storage mirrors BarBuffer: rows are appended into arrays with room for
+    twice the capacity and compacted when full. Writers serialize on
+    ``lock``; each write publishes a new ``(timestamps, values, start,
+    end)`` snapshot, and readers copy from whichever snapshot is current.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize price panel.
+
+        Args:
+            capacity: Maximum grid rows (timestamps) retained
+        """
+        self._capacity = max(1, capacity)
+        self.lock = InstrumentedLock()
+        self.version = 0
+        self._symbols: Dict[str, int] = {}
+        size = min(2 * self._capacity, 1024)
+        self._state: Tuple[np.ndarray, np.ndarray, int, int] = (
+            np.empty(size, dtype="datetime64[ns]"), np.full((size, 0), np.nan), 0, 0
+        )
+
+    def _column(self, symbol: str) -> int:
+        """Column of a symbol, widening the arrays for a new one (caller holds the lock)."""
+        col = self._symbols.get(symbol)
+        if col is not None:
+            return col
+        timestamps, values, start, end = self._state
+        widened = np.full((len(timestamps), values.shape[1] + 1), np.nan)
+        widened[start:end, :-1] = values[start:end]
+        self._state = (timestamps, widened, start, end)
+        col = self._symbols[symbol] = values.shape[1]
+        return col
+
+    def _reserve(self) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """Return a state with room for one more row at `end` (caller holds the lock)."""
+        timestamps, values, start, end = self._state
+        allocated = len(timestamps)
+        if end < allocated:
+            return timestamps, values, start, end
+        count = end - start
+        size = min(max(2 * allocated, 1024), 2 * self._capacity)
+        if count >= size:
+            size = 2 * self._capacity
+        fresh_ts = np.empty(size, dtype="datetime64[ns]")
+        fresh_values = np.full((size, values.shape[1]), np.nan)
+        fresh_ts[:count] = timestamps[start:end]
+        fresh_values[:count] = values[start:end]
+        return fresh_ts, fresh_values, 0, count
+
+    def update(self, symbol: str, timestamp: datetime, close: float) -> None:
+        """Set the close of `symbol` at bar `timestamp`."""
+        ts = np.datetime64(timestamp, "ns")
+        with self.lock:
+            col = self._column(symbol)
+            timestamps, values, start, end = self._state
+            if end > start and ts <= timestamps[end - 1]:
+                i = start + int(np.searchsorted(timestamps[start:end], ts))
+                if timestamps[i] == ts:
+                    values[i, col] = close
+                    self.version += 1
+                    return
+                if i == start and end - start >= self._capacity:
+                    return  # Older than the retained window
+                # Late bar: insert a row into fresh arrays
+                row = np.full(values.shape[1], np.nan)
+                row[col] = close
+                timestamps = np.insert(timestamps[start:end], i - start, ts)
+                values = np.insert(values[start:end], i - start, row, axis=0)
+                start, end = 0, len(timestamps)
+            else:
+                timestamps, values, start, end = self._reserve()
+                timestamps[end] = ts
+                values[end] = np.nan
+                values[end, col] = close
+                end += 1
+            if end - start > self._capacity:
+                start = end - self._capacity
+            self._state = (timestamps, values, start, end)
+            self.version += 1
+
+    def merge(self, symbol: str, timestamps: np.ndarray, closes: np.ndarray) -> None:
+        """Merge a sorted close series in bulk (e.g. restored history)."""
+        if not len(timestamps):
+            return
+        with self.lock:
+            col = self._column(symbol)
+            grid, values, start, end = self._state
+            merged_ts = np.union1d(grid[start:end], timestamps.astype("datetime64[ns]"))[-self._capacity:]
+            merged = np.full((len(merged_ts), values.shape[1]), np.nan)
+            old = np.searchsorted(merged_ts, grid[start:end])
+            keep = (old < len(merged_ts)) & (merged_ts[np.minimum(old, len(merged_ts) - 1)] == grid[start:end])
+            merged[old[keep]] = values[start:end][keep]
+            new = np.searchsorted(merged_ts, timestamps)
+            keep = (new < len(merged_ts)) & (merged_ts[np.minimum(new, len(merged_ts) - 1)] == timestamps)
+            merged[new[keep], col] = closes[keep]
+            self._state = (merged_ts, merged, 0, len(merged_ts))
+            self.version += 1
+
+    def aligned(
+        self,
+        symbols: List[str],
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        dropna: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get aligned closes for several symbols.
+
+        Args:
+            symbols: Symbols in the desired column order
+            n: Number of most recent rows (after dropping incomplete ones)
+            start: Earliest bar timestamp (inclusive, naive IST)
+            end: Latest bar timestamp (inclusive, naive IST)
+            dropna: Keep only rows where every symbol has a price; otherwise
+                keep rows where at least one does
+
+        Returns:
+            (timestamps, values) with values shaped (rows, len(symbols))
+        """
+        timestamps, values, lo, hi = self._state
+        if start is not None or end is not None:
+            grid = timestamps[lo:hi]
+            if end is not None:
+                hi = lo + int(np.searchsorted(grid, np.datetime64(end, "ns"), side="right"))
+            if start is not None:
+                lo = lo + int(np.searchsorted(grid, np.datetime64(start, "ns"), side="left"))
+            hi = max(lo, hi)
+
+        block = np.full((hi - lo, len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            col = self._symbols.get(symbol)
+            if col is not None and col < values.shape[1]:
+                block[:, j] = values[lo:hi, col]
+        missing = np.isnan(block)
+        mask = ~missing.any(axis=1) if dropna else ~missing.all(axis=1)
+        grid, block = timestamps[lo:hi][mask], block[mask]
+        if n is not None:
+            first = len(grid) - min(max(n, 0), len(grid))
+            grid, block = grid[first:], block[first:]
+        return grid, block
+
+    def dataframe(
+        self,
+        symbols: List[str],
+        n: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        dropna: bool = True,
+    ) -> pd.DataFrame:
+        """Aligned closes as a DataFrame with one column per symbol."""
+        grid, block = self.aligned(symbols, n, start, end, dropna)
+        index = pd.DatetimeIndex(grid, copy=False, name="timestamp")
+        return pd.DataFrame(block, index=index, columns=list(symbols), copy=False)
+
+    @property
+    def first_timestamp(self) -> Optional[np.datetime64]:
+        """Oldest grid timestamp."""
+        timestamps, _, start, end = self._state
+        return timestamps[start] if end > start else None
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def __len__(self) -> int:
+        _, _, start, end = self._state
+        return end - start
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently allocated."""
+        timestamps, values, _, _ = self._state
+        return timestamps.nbytes + values.nbytes
@@ -0,0 +1,293 @@
+"""
+Columnar NumPy ring buffer for tick storage
+"""
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..ingestion.data_normalizer import Tick
+
+
+# Column name -> dtype. side: 1 buyer is maker, 0 seller is maker, -1 unknown
+TICK_COLUMNS: Dict[str, np.dtype] = {
+    "ts_ms": np.dtype(np.int64),
+    "price": np.dtype(np.float64),
+    "quantity": np.dtype(np.float64),
+    "trade_id": np.dtype(np.int64),
+    "side": np.dtype(np.int8),
+}
+
+# Bytes per stored tick across all columns
+TICK_ROW_BYTES = sum(dtype.itemsize for dtype in TICK_COLUMNS.values())
+
+
+class TickRingBuffer:
+    """
+    Struct-of-arrays ring buffer holding the most recent ticks of one symbol.
+
+    Columns are preallocated NumPy arrays (~29 bytes per tick versus 500+
+    for a Tick object). Storage grows by doubling until ``capacity`` is
+    reached and then overwrites the oldest ticks, so appends are amortized
+    O(1) and quiet symbols do not pay for the full capacity up front.
+
+    Writers must be serialized externally. Each write bumps a sequence
+    counter to an odd value before it starts and back to even when it
+    ends. ``snapshot`` uses the counter to read without a lock (seqlock).
+    """
+
+    INITIAL_SIZE = 4096
+
+    def __init__(self, capacity: int = 100000):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Maximum ticks retained
+        """
+        self._capacity = max(1, capacity)
+        size = min(self._capacity, self.INITIAL_SIZE)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(size, dtype=dtype) for name, dtype in TICK_COLUMNS.items()
+        }
+        self._size = 0   # Number of valid ticks
+        self._head = 0   # Next write position
+        self._seq = 0    # Odd while a write is in progress
+        self.snapshot_retries = 0
+
+    def _grow(self, needed: int) -> None:
+        """Enlarge storage (before the first wrap) to fit `needed` ticks."""
+        current = len(self._columns["ts_ms"])
+        new_size = current
+        while new_size < needed and new_size < self._capacity:
+            new_size = min(new_size * 2, self._capacity)
+        if new_size == current:
+            return
+        # Before the first wrap all ticks lie below the head
+        for name, column in self._columns.items():
+            grown = np.empty(new_size, dtype=column.dtype)
+            grown[:self._head] = column[:self._head]
+            self._columns[name] = grown
+
+    def append(
+        self,
+        ts_ms: int,
+        price: float,
+        quantity: float,
+        trade_id: Optional[int] = None,
+        is_buyer_maker: Optional[bool] = None,
+    ) -> None:
+        """Append a single tick."""
+        self._seq += 1
+        if self._size < self._capacity and self._head >= len(self._columns["ts_ms"]):
+            self._grow(self._head + 1)
+
+        i = self._head
+        columns = self._columns
+        columns["ts_ms"][i] = ts_ms
+        columns["price"][i] = price
+        columns["quantity"][i] = quantity
+        columns["trade_id"][i] = -1 if trade_id is None else trade_id
+        columns["side"][i] = -1 if is_buyer_maker is None else int(is_buyer_maker)
+
+        self._head = (i + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+        self._seq += 1
+
+    def append_tick(self, tick: Tick) -> None:
+        """Append a Tick object."""
+        self.append(tick.ts_ms, tick.price, tick.quantity, tick.trade_id, tick.is_buyer_maker)
+
+    def extend(
+        self,
+        ts_ms: np.ndarray,
+        price: np.ndarray,
+        quantity: np.ndarray,
+        trade_id: Optional[np.ndarray] = None,
+        side: Optional[np.ndarray] = None,
+    ) -> None:
+        """Append columns of ticks with vectorized copies."""
+        n = len(ts_ms)
+        if n == 0:
+            return
+        values = {
+            "ts_ms": ts_ms,
+            "price": price,
+            "quantity": quantity,
+            "trade_id": np.full(n, -1, dtype=np.int64) if trade_id is None else trade_id,
+            "side": np.full(n, -1, dtype=np.int8) if side is None else side,
+        }
+
+        self._seq += 1
+
+        # Only the newest `capacity` ticks can survive
+        if n > self._capacity:
+            values = {name: column[-self._capacity:] for name, column in values.items()}
+            n = self._capacity
+
+        if self._size < self._capacity:
+            self._grow(min(self._head + n, self._capacity))
+
+        allocated = len(self._columns["ts_ms"])
+        first = min(n, allocated - self._head)
+        for name, column in self._columns.items():
+            column[self._head:self._head + first] = values[name][:first]
+            if first < n:
+                column[:n - first] = values[name][first:]
+
+        self._head = (self._head + n) % self._capacity
+        self._size = min(self._size + n, self._capacity)
+        self._seq += 1
+
+    def pop_oldest(self, n: int) -> Dict[str, np.ndarray]:
+        """Remove the `n` oldest ticks and return copies of them in time order."""
+        n = max(0, min(n, self._size))
+        start = (self._head - self._size) % self._capacity
+        result = {}
+        for name, column in self._columns.items():
+            if start + n <= len(column):
+                result[name] = column[start:start + n].copy()
+            else:
+                result[name] = np.concatenate((column[start:], column[:start + n - len(column)]))
+        self._seq += 1
+        self._size -= n
+        self._seq += 1
+        return result
+
+    def last(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Get the most recent ticks as columns in time order.
+
+        Returns read-only views into the buffer when the requested range is
+        contiguous, otherwise a single contiguous copy per column. Views are
+        only valid until the buffer overwrites those slots; copy them if
+        they must outlive subsequent appends.
+
+        Args:
+            n: Number of most recent ticks (None for all)
+        """
+        count = self._size if n is None else max(0, min(n, self._size))
+        end = self._head if self._head > 0 or self._size == 0 else self._capacity
+        start = end - count
+
+        result = {}
+        for name, column in self._columns.items():
+            if start >= 0:
+                view = column[start:end]
+                view.flags.writeable = False
+                result[name] = view
+            else:
+                result[name] = np.concatenate((column[start:], column[:end]))
+        return result
+
+    def snapshot(
+        self,
+        n: Optional[int] = None,
+        copy: bool = True,
+        max_retries: int = 8,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Read the most recent ticks without locking (seqlock).
+
+        Retries while a write overlaps the read.
+
+        Args:
+            n: Number of most recent ticks (None for all)
+            copy: Return owned copies. Without it, views are only checked
+                for consistency at the moment they are taken.
+            max_retries: Give up after this many conflicting reads
+
+        Returns:
+            Columns as in ``last``, or None if every attempt conflicted
+            with a writer (the caller should fall back to its lock)
+        """
+        for _ in range(max_retries):
+            seq = self._seq
+            if seq & 1:
+                self.snapshot_retries += 1
+                time.sleep(0)  # Let the writer finish
+                continue
+            try:
+                columns = self.last(n)
+                if copy:
+                    columns = {name: np.array(column) for name, column in columns.items()}
+            except (ValueError, IndexError):
+                columns = None  # Torn read of the indices; retry
+            if columns is not None and self._seq == seq:
+                return columns
+            self.snapshot_retries += 1
+        return None
+
+    def to_ticks(
+        self,
+        symbol: str,
+        n: Optional[int] = None,
+        columns: Optional[Dict[str, np.ndarray]] = None,
+    ) -> List[Tick]:
+        """Materialize the most recent ticks (or the given columns) as Tick objects."""
+        if columns is None:
+            columns = self.last(n)
+        ticks = []
+        for ts_ms, price, quantity, trade_id, side in zip(
+            columns["ts_ms"].tolist(),
+            columns["price"].tolist(),
+            columns["quantity"].tolist(),
+            columns["trade_id"].tolist(),
+            columns["side"].tolist(),
+        ):
+            ticks.append(Tick(
+                symbol,
+                None,
+                price,
+                quantity,
+                None if trade_id < 0 else trade_id,
+                None if side < 0 else bool(side),
+                ts_ms,
+            ))
+        return ticks
+
+    def set_capacity(self, capacity: int) -> None:
+        """
+        Change the retention limit, keeping the newest ticks.
+
+        Storage is reallocated to fit the retained ticks, so shrinking
+        releases memory. Writers must be serialized externally.
+        """
+        capacity = max(1, capacity)
+        if capacity == self._capacity:
+            return
+        self._seq += 1
+        count = min(self._size, capacity)
+        retained = self.last(count)
+        size = min(capacity, max(count, self.INITIAL_SIZE))
+        columns = {}
+        for name, column in retained.items():
+            fresh = np.empty(size, dtype=column.dtype)
+            fresh[:count] = column
+            columns[name] = fresh
+        self._columns = columns
+        self._capacity = capacity
+        self._size = count
+        self._head = count % capacity
+        self._seq += 1
+
+    def clear(self) -> None:
+        """Drop all ticks (allocated storage is kept)."""
+        self._seq += 1
+        self._size = 0
+        self._head = 0
+        self._seq += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Maximum ticks retained."""
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently allocated for the columns."""
+        return sum(column.nbytes for column in self._columns.values())
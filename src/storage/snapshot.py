@@ -0,0 +1,159 @@
+"""
+Binary warm-start snapshots of store, resampler and alert state
+"""
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..alerts.rule_engine import AlertEngine
+from ..processing.cascade import CascadingResampler
+from ..processing.resampler import TimeSeriesResampler
+from .bar_buffer import BAR_COLUMNS
+from .memory_store import MemoryStore
+from .ring_buffer import TICK_COLUMNS
+
+SNAPSHOT_VERSION = 2
+
+# Array keys are "<kind>:<symbol>[:<timeframe>]:<column>"; metadata is JSON bytes
+_META_KEY = "meta"
+
+
+def _encode(value: Any) -> Any:
+    """JSON encoder hook for datetimes."""
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if "__dt__" in obj:
+        return datetime.fromisoformat(obj["__dt__"])
+    return obj
+
+
+def capture_snapshot(
+    store: MemoryStore,
+    resamplers: Optional[Dict[str, TimeSeriesResampler]] = None,
+    alert_engine: Optional[AlertEngine] = None,
+    extra: Optional[Dict[str, Any]] = None,
+    cascade: Optional[CascadingResampler] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Copy the current state into arrays ready for write_snapshot.
+
+    Call it while ingestion is paused (e.g. under the state lock) so
+    ticks, bars and partial bars agree; writing can happen afterwards.
+
+    Args:
+        store: MemoryStore whose ticks and bars are captured
+        resamplers: Timeframe -> resampler whose partial bars are captured
+        alert_engine: Engine whose cooldowns are captured
+        extra: Additional JSON-serializable values (datetimes allowed)
+        cascade: Cascading resampler whose partial bars are captured
+
+    Returns:
+        Array name -> array
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    tick_counts = {}
+    for symbol in store.symbols:
+        columns, count = store.get_ticks_since(symbol, 0)
+        if not columns:
+            continue
+        tick_counts[symbol] = count
+        for name in TICK_COLUMNS:
+            arrays[f"ticks:{symbol}:{name}"] = columns[name]
+
+    bar_series = []
+    for symbol, timeframe in store.bar_series_keys():
+        columns = store.get_bar_arrays(symbol, timeframe)
+        if columns is None:
+            continue
+        bar_series.append([symbol, timeframe])
+        for name in BAR_COLUMNS:
+            arrays[f"bars:{symbol}:{timeframe}:{name}"] = columns[name]
+
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "tick_counts": tick_counts,
+        "bar_series": bar_series,
+        "resamplers": {
+            timeframe: resampler.get_state()
+            for timeframe, resampler in (resamplers or {}).items()
+        },
+        "cascade": cascade.get_state() if cascade is not None else {},
+        "cooldowns": alert_engine.get_cooldowns() if alert_engine is not None else {},
+        "extra": extra or {},
+    }
+    arrays[_META_KEY] = np.frombuffer(json.dumps(meta, default=_encode).encode(), dtype=np.uint8)
+    return arrays
+
+
+def write_snapshot(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """Write captured arrays to an uncompressed .npz file atomically."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def restore_snapshot(
+    path: str,
+    store: MemoryStore,
+    resamplers: Optional[Dict[str, TimeSeriesResampler]] = None,
+    alert_engine: Optional[AlertEngine] = None,
+    cascade: Optional[CascadingResampler] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Load a snapshot into an empty store, resamplers and alert engine.
+
+    Ticks and bars are restored with bulk column copies. Resamplers are
+    created for any snapshotted time-bar timeframe missing from
+    `resamplers`; other missing keys (e.g. information bars no longer
+    configured) are skipped.
+
+    Args:
+        path: Snapshot file written by write_snapshot
+        store: MemoryStore to fill
+        resamplers: Timeframe -> resampler dict, updated in place
+        alert_engine: Engine to restore cooldowns into
+        cascade: Cascading resampler to restore partial bars into
+
+    Returns:
+        The ``extra`` values saved with the snapshot, or None if the file
+        is missing or from an incompatible version
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as npz:
+        meta = json.loads(npz[_META_KEY].tobytes(), object_hook=_decode)
+        if meta.get("version") != SNAPSHOT_VERSION:
+            return None
+
+        for symbol, count in meta["tick_counts"].items():
+            columns = {name: npz[f"ticks:{symbol}:{name}"] for name in TICK_COLUMNS}
+            store.restore_ticks(symbol, columns, count)
+
+        for symbol, timeframe in meta["bar_series"]:
+            columns = {name: npz[f"bars:{symbol}:{timeframe}:{name}"] for name in BAR_COLUMNS}
+            store.restore_bars(symbol, timeframe, columns)
+
+    if resamplers is not None:
+        for timeframe, state in meta["resamplers"].items():
+            if timeframe not in resamplers:
+                try:
+                    resamplers[timeframe] = TimeSeriesResampler(timeframe)
+                except ValueError:
+                    continue
+            resamplers[timeframe].set_state(state)
+            
+    if cascade is not None:
+        cascade.set_state(meta.get("cascade", {}))
+
+    if alert_engine is not None:
+        alert_engine.restore_cooldowns(meta["cooldowns"])
+
+    return meta["extra"]
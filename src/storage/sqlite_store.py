@@ -0,0 +1,354 @@
+"""
+Durable SQLite persistence for ticks and completed bars
+"""
+import logging
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..ingestion.data_normalizer import Tick
+from ..ingestion.ndjson_loader import TickChunk
+from ..processing.ohlcv import OHLCVBar
+from .bar_buffer import BAR_COLUMNS, empty_bar_columns
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticks (
+    symbol TEXT NOT NULL,
+    ts_ms INTEGER NOT NULL,
+    price REAL NOT NULL,
+    quantity REAL NOT NULL,
+    trade_id INTEGER,
+    side INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_ticks_symbol_ts ON ticks (symbol, ts_ms);
+
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    ts INTEGER NOT NULL,  -- bar open time, naive IST as datetime64[ns] integer
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL,
+    vwap REAL NOT NULL,
+    trade_count INTEGER NOT NULL,
+    buy_volume REAL NOT NULL DEFAULT 0,
+    sell_volume REAL NOT NULL DEFAULT 0,
+    signed_trade_count INTEGER NOT NULL DEFAULT 0,
+    order_flow_imbalance REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, timeframe, ts)
+) WITHOUT ROWID;
+"""
+
+_INSERT_TICK = "INSERT INTO ticks VALUES (?, ?, ?, ?, ?, ?)"
+_UPSERT_BAR = "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_BAR_FIELDS = (
+    "ts, open, high, low, close, volume, vwap, trade_count, "
+    "buy_volume, sell_volume, signed_trade_count, order_flow_imbalance"
+)
+
+# Bar columns added after the first schema (name -> column definition)
+_ADDED_BAR_COLUMNS = {
+    "buy_volume": "REAL NOT NULL DEFAULT 0",
+    "sell_volume": "REAL NOT NULL DEFAULT 0",
+    "signed_trade_count": "INTEGER NOT NULL DEFAULT 0",
+    "order_flow_imbalance": "REAL NOT NULL DEFAULT 0",
+}
+
+
+def _ns(timestamp: Any) -> int:
+    """Convert a naive datetime / datetime64 to integer nanoseconds."""
+    return int(np.datetime64(timestamp, "ns").astype(np.int64))
+
+
+def _side(is_buyer_maker: Optional[bool]) -> Optional[int]:
+    return None if is_buyer_maker is None else int(is_buyer_maker)
+
+
+class SQLiteStore:
+    """
+    SQLite backend that persists ticks and completed bars.
+
+    Producers only enqueue. A background writer thread batches rows into
+    a single transaction per flush, so enabling persistence adds no disk
+    I/O to the ingest path. The database runs in WAL mode so reads from
+    other threads never block the writer.
+
+    Usage:
+        backend = SQLiteStore("gemscap_data.db")
+        backend.start()
+        store = MemoryStore(backend=backend)
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        db_path: str,
+        max_queue: int = 100000,
+        max_batch: int = 5000,
+        flush_interval: float = 0.5,
+    ):
+        """
+        Initialize SQLite backend.
+
+        Args:
+            db_path: Database file path
+            max_queue: Maximum pending write items before new ones are dropped
+            max_batch: Maximum items written per transaction
+            flush_interval: Seconds the writer waits for more items
+        """
+        self._db_path = db_path
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._thread: Optional[threading.Thread] = None
+        self._local = threading.local()
+
+        # Stats
+        self._rows_written = 0
+        self._transactions = 0
+        self._dropped = 0
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(bars)")}
+            for name, definition in _ADDED_BAR_COLUMNS.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE bars ADD COLUMN {name} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes (enqueue only)
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, item: Tuple[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._dropped += 1
+
+    def write_ticks(self, ticks: List[Tick]) -> None:
+        """Queue ticks for persistence."""
+        if ticks:
+            self._enqueue(("ticks", ticks))
+
+    def write_tick_chunk(self, chunk: TickChunk) -> None:
+        """Queue a columnar tick chunk for persistence."""
+        if len(chunk):
+            self._enqueue(("chunk", chunk))
+
+    def write_bar(self, bar: OHLCVBar, timeframe: str) -> None:
+        """Queue a completed bar for persistence (re-writes replace)."""
+        self._enqueue(("bar", (bar, timeframe)))
+
+    def write_bar_columns(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]) -> None:
+        """Queue a batch of completed bars given as columns (BarBuffer layout)."""
+        if len(columns["timestamp"]):
+            self._enqueue(("bar_columns", (symbol, timeframe, columns)))
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background writer."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name="SQLite-Writer")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush pending writes and stop the writer."""
+        if self._thread is None:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+            items = [item]
+            while len(items) < self._max_batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if any(entry is self._STOP for entry in items):
+                stopping = True
+                items = [entry for entry in items if entry is not self._STOP]
+            try:
+                self._write(conn, items)
+            except sqlite3.Error as e:
+                logger.error(f"SQLite write error: {e}")
+        conn.close()
+
+    def _write(self, conn: sqlite3.Connection, items: List[Tuple[str, Any]]) -> None:
+        tick_rows: List[tuple] = []
+        bar_rows: List[tuple] = []
+        for kind, payload in items:
+            if kind == "ticks":
+                tick_rows.extend(
+                    (t.symbol.upper(), t.ts_ms, t.price, t.quantity, t.trade_id, _side(t.is_buyer_maker))
+                    for t in payload
+                )
+            elif kind == "chunk":
+                symbols = [symbol.upper() for symbol in payload.symbols]
+                tick_rows.extend(
+                    (symbols[code], ts_ms, price, quantity, None, None)
+                    for code, ts_ms, price, quantity in zip(
+                        payload.symbol_codes.tolist(),
+                        payload.ts_ms.tolist(),
+                        payload.price.tolist(),
+                        payload.quantity.tolist(),
+                    )
+                )
+            elif kind == "bar":
+                bar, timeframe = payload
+                bar_rows.append((
+                    bar.symbol.upper(), timeframe, _ns(bar.timestamp),
+                    bar.open, bar.high, bar.low, bar.close,
+                    bar.volume, bar.vwap, bar.trade_count,
+                    bar.buy_volume, bar.sell_volume, bar.signed_trade_count,
+                    bar.order_flow_imbalance,
+                ))
+            elif kind == "bar_columns":
+                symbol, timeframe, columns = payload
+                bar_rows.extend(
+                    (symbol.upper(), timeframe, *row)
+                    for row in zip(
+                        columns["timestamp"].astype("datetime64[ns]").astype(np.int64).tolist(),
+                        *(columns[name].tolist() for name in list(BAR_COLUMNS)[1:]),
+                    )
+                )
+        if not tick_rows and not bar_rows:
+            return
+        with conn:  # One transaction per flush
+            if tick_rows:
+                conn.executemany(_INSERT_TICK, tick_rows)
+            if bar_rows:
+                conn.executemany(_UPSERT_BAR, bar_rows)
+        self._rows_written += len(tick_rows) + len(bar_rows)
+        self._transactions += 1
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        before: Optional[np.datetime64] = None,
+        n: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read bars as columns (same layout as BarBuffer.columns).
+
+        Args:
+            symbol: Symbol to read
+            timeframe: Timeframe key
+            start: Earliest bar timestamp (inclusive, naive IST)
+            end: Latest bar timestamp (inclusive, naive IST)
+            before: Only bars strictly older than this timestamp
+            n: Only the most recent n matching bars
+        """
+        clauses = ["symbol = ?", "timeframe = ?"]
+        params: List[Any] = [symbol.upper(), timeframe]
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_ns(start))
+        if end is not None:
+            clauses.append("ts <= ?")
+            params.append(_ns(end))
+        if before is not None:
+            clauses.append("ts < ?")
+            params.append(_ns(before))
+        query = f"SELECT {_BAR_FIELDS} FROM bars WHERE {' AND '.join(clauses)}"
+        if n is not None:
+            query = f"SELECT * FROM ({query} ORDER BY ts DESC LIMIT ?) ORDER BY ts"
+            params.append(int(n))
+        else:
+            query += " ORDER BY ts"
+
+        rows = self._reader().execute(query, params).fetchall()
+        if not rows:
+            return empty_bar_columns()
+        fields = list(zip(*rows))
+        columns = {}
+        for (name, dtype), values in zip(BAR_COLUMNS.items(), fields):
+            if name == "timestamp":
+                columns[name] = np.array(values, dtype=np.int64).view("datetime64[ns]")
+            else:
+                columns[name] = np.array(values, dtype=dtype)
+        return columns
+
+    def read_ticks(
+        self,
+        symbol: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read ticks as columns (ts_ms, price, quantity) for an epoch-ms range."""
+        clauses = ["symbol = ?"]
+        params: List[Any] = [symbol.upper()]
+        if start_ms is not None:
+            clauses.append("ts_ms >= ?")
+            params.append(int(start_ms))
+        if end_ms is not None:
+            clauses.append("ts_ms <= ?")
+            params.append(int(end_ms))
+        rows = self._reader().execute(
+            f"SELECT ts_ms, price, quantity FROM ticks WHERE {' AND '.join(clauses)} ORDER BY ts_ms",
+            params,
+        ).fetchall()
+        ts_ms, price, quantity = zip(*rows) if rows else ((), (), ())
+        return {
+            "ts_ms": np.array(ts_ms, dtype=np.int64),
+            "price": np.array(price, dtype=np.float64),
+            "quantity": np.array(quantity, dtype=np.float64),
+        }
+
+    def bar_series_keys(self) -> List[Tuple[str, str]]:
+        """List stored (symbol, timeframe) pairs."""
+        return self._reader().execute(
+            "SELECT DISTINCT symbol, timeframe FROM bars"
+        ).fetchall()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get writer counters."""
+        return {
+            "pending": self._queue.qsize(),
+            "rows_written": self._rows_written,
+            "transactions": self._transactions,
+            "dropped": self._dropped,
+        }
@@ -0,0 +1,353 @@
+"""
+Delta-encoded compressed tick blocks for long in-memory tick history
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ring_buffer import TICK_COLUMNS
+
+# Ticks per compressed block
+BLOCK_SIZE = 4096
+
+# Largest number of decimals tried when scaling prices/quantities to integers
+MAX_DECIMALS = 8
+
+_VARINT_BYTES = 10  # Enough 7-bit groups for any 64-bit value
+
+# Integer column forms written by encode_ints
+_VARINT = 0
+_PACKED = 1
+
+
+def zigzag(values: np.ndarray) -> np.ndarray:
+    """Map signed int64 to unsigned so small magnitudes stay small."""
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def unzigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return ((values >> np.uint64(1)).astype(np.int64)) ^ -((values & np.uint64(1)).astype(np.int64))
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """LEB128-encode unsigned integers (vectorized)."""
+    values = np.asarray(values, dtype=np.uint64)
+    if not len(values):
+        return b""
+    shifts = np.arange(_VARINT_BYTES, dtype=np.uint64) * np.uint64(7)
+    groups = ((values[:, None] >> shifts) & np.uint64(0x7F)).astype(np.uint8)
+    # Number of 7-bit groups each value needs (at least one)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for i in range(1, _VARINT_BYTES):
+        lengths += (values >> (shifts[i])) > 0
+    used = np.arange(_VARINT_BYTES) < lengths[:, None]
+    more = np.arange(_VARINT_BYTES) < (lengths - 1)[:, None]
+    groups[more] |= 0x80
+    return groups[used].tobytes()
+
+
+def decode_varints(data: bytes, count: int) -> np.ndarray:
+    """Decode `count` LEB128 unsigned integers (vectorized)."""
+    if count == 0:
+        return np.empty(0, dtype=np.uint64)
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)[:count]
+    starts = np.r_[0, ends[:-1] + 1]
+    # Position of each byte within its value
+    group_start = np.repeat(starts, ends - starts + 1)
+    position = np.arange(ends[-1] + 1) - group_start
+    contributions = (raw[:ends[-1] + 1] & 0x7F).astype(np.uint64) << (position.astype(np.uint64) * np.uint64(7))
+    return np.add.reduceat(contributions, starts)
+
+
+def pack_bits(values: np.ndarray, width: int) -> bytes:
+    """Pack unsigned integers into `width` bits each (vectorized)."""
+    if width == 0:
+        return b""
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint64)
+    bits = ((np.asarray(values, dtype=np.uint64)[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    return np.packbits(bits.ravel()).tobytes()
+
+
+def unpack_bits(data: bytes, count: int, width: int) -> np.ndarray:
+    """Unpack `count` unsigned integers of `width` bits each."""
+    if width == 0:
+        return np.zeros(count, dtype=np.uint64)
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=count * width).reshape(count, width)
+    weights = np.uint64(1) << np.arange(width - 1, -1, -1, dtype=np.uint64)
+    return (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+def encode_ints(values: np.ndarray) -> bytes:
+    """
+    Encode signed integers as the smaller of two forms, tagged by the first byte:
+
+    - _VARINT: zigzag varints
+    - _PACKED: the minimum (zigzag varint), a bit width byte, then each
+      value's offset from the minimum in that many bits; a constant
+      column has width 0 and no payload
+    """
+    values = np.asarray(values, dtype=np.int64)
+    varints = encode_varints(zigzag(values))
+    if not len(values):
+        return bytes([_VARINT])
+    low = int(values.min())
+    offsets = values.astype(np.uint64) - np.uint64(low & 0xFFFFFFFFFFFFFFFF)
+    width = int(offsets.max()).bit_length()
+    header = encode_varints(zigzag(np.array([low]))) + bytes([width])
+    if len(header) + (len(values) * width + 7) // 8 < len(varints):
+        return bytes([_PACKED]) + header + pack_bits(offsets, width)
+    return bytes([_VARINT]) + varints
+
+
+def decode_ints(data: bytes, count: int) -> np.ndarray:
+    """Decode `count` integers written by encode_ints."""
+    if data[0] == _VARINT:
+        return unzigzag(decode_varints(data[1:], count))
+    raw = np.frombuffer(data, dtype=np.uint8)
+    width_at = int(np.flatnonzero(raw[1:] < 0x80)[0]) + 2  # After the minimum's varint
+    low = unzigzag(decode_varints(data[1:width_at], 1))[0]
+    return unpack_bits(data[width_at + 1:], count, data[width_at]).astype(np.int64) + low
+
+
+def _decimal_scale(values: np.ndarray) -> Optional[int]:
+    """Smallest decimal count that represents every value exactly, or None."""
+    for decimals in range(MAX_DECIMALS + 1):
+        scale = 10.0 ** decimals
+        ints = np.round(values * scale)
+        if np.array_equal(ints / scale, values):
+            return decimals
+    return None
+
+
+@dataclass
+class CompressedTickBlock:
+    """
+    A fixed-size block of ticks, encoded column by column with encode_ints
+    (varints or bit-packed offsets, whichever is smaller):
+
+    - ts_ms: first value, then deltas
+    - price: scaled to integer tick units (10^-decimals), first value, then deltas
+    - quantity: scaled to integer lot units
+    - trade_id: first value, then deltas (consecutive ids cost nothing)
+    - side: the codes themselves (1 bit when only buys and sells occur)
+
+    Prices and quantities that are not exact decimals (within
+    MAX_DECIMALS) fall back to raw float64 bytes, so decoding is always
+    lossless. A live-like BTCUSDT stream (0.1 price ticks, 3-decimal sizes,
+    bursts of same-millisecond trades) compresses about 10x against the
+    33-byte ring row; price and size entropy bound it on noisier data.
+    """
+    count: int
+    min_ts: int
+    max_ts: int
+    first_ts: int
+    ts_data: bytes
+    price_decimals: Optional[int]
+    first_price: int
+    price_data: bytes
+    quantity_decimals: Optional[int]
+    quantity_data: bytes
+    first_trade_id: int
+    trade_id_data: bytes
+    side_data: bytes
+
+    @classmethod
+    def encode(cls, columns: Dict[str, np.ndarray]) -> "CompressedTickBlock":
+        """Encode tick columns (TickRingBuffer layout)."""
+        ts_ms = columns["ts_ms"].astype(np.int64)
+        price = columns["price"].astype(np.float64)
+        quantity = columns["quantity"].astype(np.float64)
+        trade_id = columns["trade_id"].astype(np.int64)
+        side = columns["side"].astype(np.int8)
+        count = len(ts_ms)
+
+        ts_data = encode_ints(np.diff(ts_ms))
+
+        price_decimals = _decimal_scale(price)
+        if price_decimals is None:
+            first_price, price_data = 0, price.tobytes()
+        else:
+            ticks = np.round(price * 10.0 ** price_decimals).astype(np.int64)
+            first_price = int(ticks[0])
+            price_data = encode_ints(np.diff(ticks))
+
+        quantity_decimals = _decimal_scale(quantity)
+        if quantity_decimals is None or (quantity < 0).any():
+            quantity_decimals, quantity_data = None, quantity.tobytes()
+        else:
+            lots = np.round(quantity * 10.0 ** quantity_decimals).astype(np.int64)
+            quantity_data = encode_ints(lots)
+
+        return cls(
+            count=count,
+            min_ts=int(ts_ms.min()),
+            max_ts=int(ts_ms.max()),
+            first_ts=int(ts_ms[0]),
+            ts_data=ts_data,
+            price_decimals=price_decimals,
+            first_price=first_price,
+            price_data=price_data,
+            quantity_decimals=quantity_decimals,
+            quantity_data=quantity_data,
+            first_trade_id=int(trade_id[0]),
+            trade_id_data=encode_ints(np.diff(trade_id)),
+            side_data=encode_ints(side),
+        )
+
+    def decode(self) -> Dict[str, np.ndarray]:
+        """Decode to tick columns (TickRingBuffer layout)."""
+        n = self.count
+
+        ts_ms = np.empty(n, dtype=np.int64)
+        ts_ms[0] = self.first_ts
+        ts_ms[1:] = self.first_ts + np.cumsum(decode_ints(self.ts_data, n - 1))
+
+        if self.price_decimals is None:
+            price = np.frombuffer(self.price_data, dtype=np.float64).copy()
+        else:
+            ticks = np.empty(n, dtype=np.int64)
+            ticks[0] = self.first_price
+            ticks[1:] = self.first_price + np.cumsum(decode_ints(self.price_data, n - 1))
+            price = ticks / 10.0 ** self.price_decimals
+
+        if self.quantity_decimals is None:
+            quantity = np.frombuffer(self.quantity_data, dtype=np.float64).copy()
+        else:
+            quantity = decode_ints(self.quantity_data, n) / 10.0 ** self.quantity_decimals
+
+        trade_id = np.empty(n, dtype=np.int64)
+        trade_id[0] = self.first_trade_id
+        trade_id[1:] = self.first_trade_id + np.cumsum(decode_ints(self.trade_id_data, n - 1))
+        side = decode_ints(self.side_data, n).astype(np.int8)
+
+        return {
+            "ts_ms": ts_ms,
+            "price": price,
+            "quantity": quantity,
+            "trade_id": trade_id,
+            "side": side,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Encoded payload size in bytes."""
+        return (
+            len(self.ts_data) + len(self.price_data) + len(self.quantity_data)
+            + len(self.trade_id_data) + len(self.side_data)
+        )
+
+
+class CompressedTickHistory:
+    """
+    Older ticks of one symbol held as CompressedTickBlocks, oldest first.
+
+    Blocks are decoded only when a query touches their time range. The
+    oldest blocks are dropped once ``max_ticks`` is exceeded.
+
+    Writers must be serialized externally. Readers take a reference to
+    the block tuple, which is replaced (never mutated) on every write.
+    """
+
+    def __init__(self, max_ticks: int = 10_000_000):
+        """
+        Initialize compressed history.
+
+        Args:
+            max_ticks: Maximum ticks retained across all blocks
+        """
+        self._max_ticks = max_ticks
+        self._blocks: Tuple[CompressedTickBlock, ...] = ()
+        self._count = 0
+
+    def append(self, columns: Dict[str, np.ndarray]) -> None:
+        """Compress tick columns into a new block (newer than existing blocks)."""
+        if not len(columns["ts_ms"]):
+            return
+        blocks: Deque[CompressedTickBlock] = deque(self._blocks)
+        blocks.append(CompressedTickBlock.encode(columns))
+        self._trim(blocks, self._count + len(columns["ts_ms"]))
+
+    def _trim(self, blocks: Deque[CompressedTickBlock], count: int) -> None:
+        """Drop the oldest blocks beyond max_ticks (keeping the newest) and publish."""
+        while count > self._max_ticks and len(blocks) > 1:
+            count -= blocks.popleft().count
+        if count > self._max_ticks:
+            blocks.clear()
+            count = 0
+        self._count = count
+        self._blocks = tuple(blocks)
+
+    def set_capacity(self, max_ticks: int) -> None:
+        """Change the retention limit, dropping the oldest blocks beyond it."""
+        self._max_ticks = max_ticks
+        self._trim(deque(self._blocks), self._count)
+
+    @property
+    def blocks(self) -> Tuple[CompressedTickBlock, ...]:
+        """Current blocks, oldest first (an immutable snapshot)."""
+        return self._blocks
+
+    def range(
+        self,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        blocks: Optional[Tuple[CompressedTickBlock, ...]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Decode ticks with start_ms <= ts_ms <= end_ms (None for unbounded).
+
+        Only blocks whose time span overlaps the range are decoded.
+
+        Args:
+            start_ms: Earliest tick time (epoch ms)
+            end_ms: Latest tick time (epoch ms)
+            blocks: Block snapshot to read (default: the current blocks)
+        """
+        parts: List[Dict[str, np.ndarray]] = []
+        for block in self._blocks if blocks is None else blocks:
+            if (start_ms is not None and block.max_ts < start_ms) or (end_ms is not None and block.min_ts > end_ms):
+                continue
+            columns = block.decode()
+            if (start_ms is not None and block.min_ts < start_ms) or (end_ms is not None and block.max_ts > end_ms):
+                ts_ms = columns["ts_ms"]
+                mask = np.ones(len(ts_ms), dtype=bool)
+                if start_ms is not None:
+                    mask &= ts_ms >= start_ms
+                if end_ms is not None:
+                    mask &= ts_ms <= end_ms
+                columns = {name: column[mask] for name, column in columns.items()}
+            parts.append(columns)
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in TICK_COLUMNS.items()}
+        return {
+            name: np.concatenate([part[name] for part in parts]).astype(dtype, copy=False)
+            for name, dtype in TICK_COLUMNS.items()
+        }
+
+    def clear(self) -> None:
+        self._blocks = ()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Maximum ticks retained."""
+        return self._max_ticks
+
+    @property
+    def first_ts(self) -> Optional[int]:
+        """Earliest tick time held (epoch ms)."""
+        blocks = self._blocks
+        return min(block.min_ts for block in blocks) if blocks else None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by encoded blocks."""
+        return sum(block.nbytes for block in self._blocks)
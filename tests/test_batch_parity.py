@@ -0,0 +1,59 @@
+"""
+Chunked BatchResampler bars match the streaming TimeSeriesResampler bit for bit.
+"""
+import numpy as np
+import pytest
+
+from src.ingestion.data_normalizer import Tick
+from src.processing.batch_resampler import BatchResampler
+from src.processing.resampler import TimeSeriesResampler
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT"]
+CHUNK_SIZE = 777
+
+
+@pytest.fixture(scope="module")
+def ticks() -> list:
+    """In-order ticks over ~2.5 days with gaps, repeated timestamps and all three sides."""
+    rng = np.random.default_rng(0)
+    n = 5000
+    ts_ms = 1765790000000 + np.cumsum(rng.integers(0, 80000, n))
+    sides = [None, True, False]
+    return [
+        Tick(
+            SYMBOLS[int(rng.random() < 0.4)], None,
+            round(100 + rng.normal() * 5, 2), round(rng.random(), 3),
+            trade_id=i, is_buyer_maker=sides[int(rng.integers(0, 3))], ts_ms=int(ts_ms[i]),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("timeframe", ["1S", "30S", "1T", "7T", "4H", "1D"])
+def test_chunked_batch_matches_stream(ticks, timeframe):
+    stream = TimeSeriesResampler(timeframe)
+    for tick in ticks:
+        stream.add_tick(tick)
+
+    batch = BatchResampler(timeframe)
+    parts = {symbol: [] for symbol in SYMBOLS}
+    for start in range(0, len(ticks), CHUNK_SIZE):
+        chunk = ticks[start:start + CHUNK_SIZE]
+        for symbol in SYMBOLS:
+            rows = [tick for tick in chunk if tick.symbol == symbol]
+            parts[symbol].append(batch.add_arrays(
+                symbol,
+                np.array([tick.ts_ms for tick in rows], dtype=np.int64),
+                np.array([tick.price for tick in rows]),
+                np.array([tick.quantity for tick in rows]),
+                np.array([-1 if tick.is_buyer_maker is None else int(tick.is_buyer_maker) for tick in rows], dtype=np.int8),
+            ))
+
+    for symbol in SYMBOLS:
+        expected = stream.get_dataframe(symbol)
+        assert len(expected)
+        for name in ["timestamp"] + list(expected.columns.drop("symbol")):
+            got = np.concatenate([part[name] for part in parts[symbol]])
+            want = expected.index.values if name == "timestamp" else expected[name].values
+            np.testing.assert_array_equal(got, want.astype(got.dtype), err_msg=f"{symbol} {name}")
+        assert batch.get_current_bar(symbol) == stream.get_current_bar(symbol)
@@ -0,0 +1,80 @@
+"""
+Out-of-order ticks within the allowed lateness give the bars of the sorted ticks.
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.ingestion.data_normalizer import Tick
+from src.processing.cascade import CascadingResampler
+from src.processing.resampler import TimeSeriesResampler
+
+START_MS = 1765790000000  # 2025-12-15 09:13:20 UTC
+FLUSH = datetime(2030, 1, 1)
+
+
+def make_ticks(n: int = 6000, seed: int = 0) -> list:
+    """In-order ticks with repeated timestamps; prices and sizes are exact in binary."""
+    rng = np.random.default_rng(seed)
+    ts_ms = START_MS + np.cumsum(rng.integers(0, 150, n))
+    sides = [None, True, False]
+    return [
+        Tick(
+            "BTCUSDT", None,
+            100 + int(rng.integers(-40, 40)) * 0.25, int(rng.integers(1, 8)) * 0.25,
+            trade_id=i, is_buyer_maker=sides[int(rng.integers(0, 3))], ts_ms=int(ts_ms[i]),
+        )
+        for i in range(n)
+    ]
+
+
+def shuffle(ticks: list, jitter_ms: int, seed: int = 1) -> list:
+    """Arrival order: each tick delayed by up to `jitter_ms`."""
+    rng = np.random.default_rng(seed)
+    delays = rng.integers(0, jitter_ms, len(ticks))
+    order = sorted(range(len(ticks)), key=lambda i: ticks[i].ts_ms + delays[i])
+    return [ticks[i] for i in order]
+
+
+def stream_bars(ticks: list, timeframe: str, **kwargs) -> list:
+    resampler = TimeSeriesResampler(timeframe, **kwargs)
+    for tick in ticks:
+        resampler.add_tick(tick)
+    resampler.finalize(FLUSH)
+    return resampler.get_bars("BTCUSDT")
+
+
+def cascade_bars(ticks: list, timeframes: list, **kwargs) -> dict:
+    cascade = CascadingResampler(timeframes, **kwargs)
+    bars = {timeframe: [] for timeframe in timeframes}
+    cascade.on_bar(lambda bar, timeframe: bars[timeframe].append(bar))
+    cascade.add_ticks(ticks)
+    cascade.finalize(FLUSH)
+    return bars
+
+
+def test_late_tick_sets_close_by_trade_time():
+    ticks = [
+        Tick("BTCUSDT", None, 1.0, 1.0, ts_ms=START_MS + 100),
+        Tick("BTCUSDT", None, 2.0, 1.0, ts_ms=START_MS + 1100),
+        Tick("BTCUSDT", None, 9.0, 1.0, ts_ms=START_MS + 900),
+    ]
+    assert stream_bars(ticks, "1S", allowed_lateness=1.0)[0].close == 9.0
+    assert cascade_bars(ticks, ["1S", "1T"], allowed_lateness=1.0)["1S"][0].close == 9.0
+
+
+@pytest.mark.parametrize("timeframe", ["1S", "1T"])
+def test_shuffled_stream_matches_sorted(timeframe):
+    arrived = shuffle(make_ticks(), jitter_ms=800)
+    ordered = sorted(arrived, key=lambda tick: tick.ts_ms)
+    expected = stream_bars(ordered, timeframe)
+    assert stream_bars(arrived, timeframe, allowed_lateness=1.0) == expected
+    assert stream_bars(arrived, timeframe, revision_depth=len(expected)) == expected
+
+
+def test_shuffled_cascade_matches_sorted():
+    timeframes = ["1S", "1T", "5T"]
+    arrived = shuffle(make_ticks(), jitter_ms=800)
+    ordered = sorted(arrived, key=lambda tick: tick.ts_ms)
+    assert cascade_bars(arrived, timeframes, allowed_lateness=1.0) == cascade_bars(ordered, timeframes)